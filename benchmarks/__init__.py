@@ -0,0 +1,7 @@
+"""
+Benchmarks of geopar on synthetic triangulated figures.
+
+    python -m benchmarks [--figures fan grid] [--sizes 8 64] [--repeat 3] [-o results.json]
+
+generators builds the figures, suite times the benchmarks on them.
+"""
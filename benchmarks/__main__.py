@@ -0,0 +1,33 @@
+import argparse
+import json
+import sys
+
+from benchmarks.suite import FIGURES, BENCHMARKS, run_suite
+
+__author__ = 'satbek'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Time geopar on synthetic triangulated figures.')
+    parser.add_argument('--figures', nargs='+', choices=list(FIGURES), help='figures to use (default: all)')
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), help='benchmarks to run (default: all)')
+    parser.add_argument('--sizes', nargs='+', type=int, help='sizes of the figures (default: per figure)')
+    parser.add_argument('--unknown', type=float, default=0.3, help='fraction of angles hidden (default: 0.3)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random figures and masks')
+    parser.add_argument('--repeat', type=int, default=3, help='times every benchmark is run (default: 3)')
+    parser.add_argument('-o', '--output', help='file to write the JSON report to (default: standard output)')
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.figures, args.benchmarks, args.sizes, args.unknown, args.seed, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+from fractions import Fraction
+import random
+
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+
+__author__ = 'satbek'
+
+"""
+Generators of synthetic triangulated figures for the benchmarks.
+
+Every generator builds a valid figure (all its angles obey the 180, 360 and pairing rules),
+then hides a fraction unknown of its angles, chosen at random from seed.
+"""
+
+# GENERALIZED MORLEY of inputs/input.txt (dimension 4, all angles known);
+# its outer boundary is 1 -> 2 -> 9 -> 8 -> 6 -> 5 -> 1
+MORLEY = [
+    ((1, 2, 3), ('0 0 1 0', '-1/2 -1/2 -1/2 120', '1/2 1/2 -1/2 60')),
+    ((2, 9, 3), ('-1/2 -1/2 -1/2 120', '0 1 0 0', '1/2 -1/2 1/2 60')),
+    ((3, 9, 7), ('-1/2 -1/2 1/2 90', '0 1 0 0', '1/2 -1/2 -1/2 90')),
+    ((7, 9, 8), ('1/2 -1/2 1/2 60', '0 1 0 0', '-1/2 -1/2 -1/2 120')),
+    ((7, 8, 6), ('-1/2 1/2 1/2 60', '-1/2 -1/2 -1/2 120', '1 0 0 0')),
+    ((4, 7, 6), ('-1/2 -1/2 1/2 90', '-1/2 1/2 -1/2 90', '1 0 0 0')),
+    ((5, 4, 6), ('-1/2 -1/2 -1/2 120', '-1/2 1/2 1/2 60', '1 0 0 0')),
+    ((1, 4, 5), ('0 0 1 0', '1/2 1/2 -1/2 60', '-1/2 -1/2 -1/2 120')),
+    ((1, 3, 4), ('0 0 1 0', '-1/2 1/2 -1/2 90', '1/2 -1/2 -1/2 90')),
+    ((3, 7, 4), ('0 0 0 60', '0 0 0 60', '0 0 0 60')),
+]
+
+
+def _figure(rows, unknown, seed):
+    # Returns: the TriangulatedFigure of rows = [(points, angles)], with a fraction unknown of its angles hidden
+
+    rng = random.Random(seed)
+    triangles = []
+    for points, angles in rows:
+        angles = [Angle([]) if rng.random() < unknown else angle for angle in angles]
+        triangles.append(Triangle(list(points), angles))
+    return TriangulatedFigure(triangles)
+
+
+def fan(k, unknown=0.0, seed=0):
+    """
+    Returns: k triangles around the interior point 0, with boundary points 1, ..., k
+             and the angles of a regular polygon
+    PRE: k >= 3
+    """
+
+    centre = Angle([Fraction(360, k)])
+    base = Angle([(180 - Fraction(360, k)) / 2])
+    rows = [((i, i % k + 1, 0), (base, base, centre)) for i in range(1, k + 1)]
+    return _figure(rows, unknown, seed)
+
+
+def morley_net(m, unknown=0.0, seed=0):
+    """
+    Returns: a chain of m copies of the GENERALIZED MORLEY figure, where every copy is glued
+             to the previous one along a boundary edge (edge 1 -> 2 of the copy onto edge 6 -> 8 of the previous one)
+    PRE: m >= 1
+    """
+
+    template = [(points, tuple(Angle.from_str(s) for s in angles)) for points, angles in MORLEY]
+    rows, next_point, previous = [], 1, None
+    for _ in range(m):
+        labels = {}
+        if previous is not None:
+            labels[1], labels[2] = previous[6], previous[8]
+        for point in (3, 4, 5, 6, 7, 8, 9):
+            labels[point] = next_point
+            next_point += 1
+        if previous is None:
+            labels[1], labels[2] = next_point, next_point + 1
+            next_point += 2
+        rows.extend((tuple(labels[p] for p in points), angles) for points, angles in template)
+        previous = labels
+    return _figure(rows, unknown, seed)
+
+
+def grid(rows, columns, unknown=0.0, seed=0):
+    """
+    Returns: a triangulation of a rows x columns grid of squares, each cut along a random diagonal
+             (chosen from seed); its (rows + 1) * (columns + 1) points have exact angles of 45 and 90 degrees
+    PRE: rows, columns >= 1
+    """
+
+    rng = random.Random(seed)
+    right, half = Angle([90]), Angle([45])
+    triangles = []
+    for r in range(rows):
+        for c in range(columns):
+            # corners clockwise: a = top left, b = top right, d = bottom right, e = bottom left
+            a, b = r * (columns + 1) + c, r * (columns + 1) + c + 1
+            d, e = b + columns + 1, a + columns + 1
+            if rng.random() < 0.5:
+                triangles.append(((a, b, d), (half, right, half)))
+                triangles.append(((a, d, e), (half, half, right)))
+            else:
+                triangles.append(((a, b, e), (right, half, half)))
+                triangles.append(((b, d, e), (half, right, half)))
+    return _figure(triangles, unknown, seed + 1)
+
+
+def to_text(figures):
+    # Returns: figures in the format of inputs/input.txt
+
+    lines = []
+    for figure in figures:
+        triangles = figure.get_triangles()
+        dimension = max(a.get_dimension() for t in triangles for a in t.get_angles())
+        lines.append('{} {}'.format(len(triangles), dimension))
+        for triangle in triangles:
+            angles = [' '.join(map(str, a.get_coefficients())) if a.is_known() else 'x' for a in triangle.get_angles()]
+            lines.append('{}; {}'.format(', '.join(map(str, triangle.get_points())), ', '.join(angles)))
+        lines.append('')
+    return '\n'.join(lines)
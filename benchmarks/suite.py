@@ -0,0 +1,129 @@
+import os
+import platform
+import tempfile
+import time
+
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.tfparser import TFParser
+from geopar.tfpreprocessor import TFPreprocessor
+from geopar.tfvalidator import TFValidator
+from geopar.run import prove
+
+from benchmarks import generators
+
+__author__ = 'satbek'
+
+# name -> (generator, sizes): the figures every benchmark is timed on
+FIGURES = {
+    'fan': (lambda size, unknown, seed: generators.fan(size, unknown, seed), [8, 64, 512]),
+    'morley_net': (lambda size, unknown, seed: generators.morley_net(size, unknown, seed), [1, 10, 100]),
+    'grid': (lambda size, unknown, seed: generators.grid(size, size, unknown, seed), [4, 16, 48]),
+}
+
+
+def _parse(figure):
+    # Returns: (setup, timed function) of parsing figure from a file
+
+    def setup():
+        a_file = tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False)
+        with a_file:
+            a_file.write(generators.to_text([figure]))
+        return a_file.name
+
+    def parse(path):
+        try:
+            TFParser.parse_file(path)
+        finally:
+            os.remove(path)
+    return setup, parse
+
+
+def _on_copy(function):
+    # Returns: (setup, timed function) of function applied to a fresh copy of the figure
+
+    def benchmark(figure):
+        return (lambda: TriangulatedFigure.from_compact(figure.to_compact())), function
+    return benchmark
+
+
+def _on_solved(function):
+    # Returns: (setup, timed function) of function applied to the figure with all its angles proved
+
+    def benchmark(figure):
+        def setup():
+            copy = TriangulatedFigure.from_compact(figure.to_compact())
+            prove(copy, pairing=True)
+            return copy
+        return setup, function
+    return benchmark
+
+
+def _all_fans(a_tf):
+    for point in a_tf.get_points():
+        a_tf.triangles_with_point(point)
+
+
+# name -> function of the figure, returning (setup, timed function of the result of setup)
+BENCHMARKS = {
+    'parse': _parse,
+    'get_interior_points': _on_copy(lambda tf: tf.get_interior_points()),
+    'triangles_with_point': _on_copy(_all_fans),
+    'theorem_1': _on_copy(TFPreprocessor.theorem_1),
+    'theorem_2': _on_copy(TFPreprocessor.theorem_2),
+    'theorem_3': _on_copy(TFPreprocessor.theorem_3),
+    'rule_180': _on_solved(TFValidator.rule_180),
+    'rule_360': _on_solved(TFValidator.rule_360),
+    'rule_pairing': _on_solved(TFValidator.rule_pairing),
+    'prove': _on_copy(lambda tf: prove(tf, pairing=False)),
+    'prove_pairing': _on_copy(lambda tf: prove(tf, pairing=True)),
+}
+
+
+def time_benchmark(a_setup, a_function, repeat):
+    """
+    Returns: the list of the repeat times (in seconds) of a_function(a_setup());
+             the setup is not timed
+    """
+
+    times = []
+    for _ in range(repeat):
+        argument = a_setup()
+        start = time.perf_counter()
+        a_function(argument)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_suite(figures=None, benchmarks=None, sizes=None, unknown=0.3, seed=0, repeat=3):
+    """
+    Intent: Times every benchmark on every figure.
+    PRE: figures and benchmarks are None (all) or lists of keys of FIGURES and BENCHMARKS;
+         sizes, if given, replace the default sizes of FIGURES
+    Returns: the JSON-serializable report: {"python", "platform", "unknown", "seed", "repeat", "results"}
+             where results holds one record per (figure, size, benchmark); a benchmark that raises
+             is recorded with its "error" instead of its times
+    """
+
+    results = []
+    for figure_name in figures or list(FIGURES):
+        generator, default_sizes = FIGURES[figure_name]
+        for size in sizes or default_sizes:
+            figure = generator(size, unknown, seed)
+            for benchmark_name in benchmarks or list(BENCHMARKS):
+                record = {'figure': figure_name, 'size': size, 'triangles': len(figure.get_triangles()),
+                          'benchmark': benchmark_name}
+                try:
+                    times = time_benchmark(*BENCHMARKS[benchmark_name](figure), repeat=repeat)
+                    record.update(min=min(times), mean=sum(times) / len(times))
+                except Exception as e:
+                    record['error'] = '{}: {}'.format(type(e).__name__, e)
+                results.append(record)
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'unknown': unknown,
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
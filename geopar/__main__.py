@@ -0,0 +1,149 @@
+from contextlib import ExitStack
+from itertools import islice
+import argparse
+import cProfile
+import json
+import os
+import sys
+
+from geopar.tfparser import TFParser
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.array_figure_class import ArrayTriangulatedFigure
+from geopar.utilities import ParseError
+from geopar.run import prove, MESSAGES
+from geopar.parallel_prover import ParallelProver
+from geopar.proof_cache import CanonicalForm, ProofCache
+from geopar.instrumentation import Instrumentation
+from geopar.proof_trace import ProofTrace
+
+__author__ = 'satbek'
+
+"""
+Batch prover: python -m geopar [--pairing] [-j JOBS] [-o OUTPUT] [--cache DB] [--stats] [--profile PATH]
+                             [--trace PATH] [--reduce] [--fast] [--arrays] FILE [FILE ...]
+
+Proves every configuration of every FILE (in the format of input.txt) without asking questions,
+and writes one JSON record per configuration, one per line.
+A malformed configuration ends its file with a record {"file", "line", "error"}.
+With --cache, figures already proved (up to relabelling) are answered from the ProofCache DB.
+--stats prints the calls and times of the hot functions (see Instrumentation) to the standard error;
+--profile writes a cProfile dump, to be read with pstats.
+--trace writes the proof of every configuration (see ProofTrace), to be checked with ProofTrace.replay().
+"""
+
+
+def result_record(a_path, a_line_number, an_index, a_figure, an_outcome):
+    # Returns: the JSON-serializable result of proving the an_index-th configuration of a_path
+
+    return {
+        'file': a_path,
+        'line': a_line_number,
+        'index': an_index,
+        'triangles': len(a_figure.get_triangles()),
+        'outcome': an_outcome,
+        'message': MESSAGES[an_outcome],
+        'all_known': a_figure.all_angles_are_known(),
+    }
+
+
+def prove_files(paths, pairing, output, jobs=1, batch_size=1000, cache=None, trace=None, reduce=False,
+                fast=False, figure_class=TriangulatedFigure):
+    """
+    Intent: Proves every configuration in paths, writing one JSON line per result to output.
+            With jobs > 1, configurations are proved batch_size at a time on jobs processes.
+            cache, if given, is a ProofCache consulted before proving and updated after.
+            trace, if given, is a ProofTrace that receives every proof (PRE: jobs == 1 and cache is None)
+            With reduce, every figure is proved on the fewest variables (PRE: trace is None);
+            with fast, on scaled integers with an exact fallback (see run.prove())
+            Figures are read and proved, on the workers too, as instances of figure_class (e.g., ArrayTriangulatedFigure)
+    Returns: the number of configurations proved
+    """
+
+    count = 0
+    with ParallelProver(workers=jobs, pairing=pairing, reduce=reduce, fast=fast, figure_class=figure_class) as prover:
+        for path in paths:
+            configurations = enumerate(TFParser.iter_file(path, figure_class))
+            while True:
+                # (Batch read): a ParseError ends the file with an error record
+                batch, error = [], None
+                try:
+                    batch.extend(islice(configurations, batch_size))
+                except ParseError as e:
+                    error = e
+
+                figures = [figure for _, (_, figure) in batch]
+                # (Cache): the canonical forms are taken before proving, as they are the keys
+                if cache is not None:
+                    forms = [CanonicalForm(f) for f in figures]
+                    outcomes = [cache.lookup(f, pairing, form) for f, form in zip(figures, forms)]
+                else:
+                    forms, outcomes = [None] * len(figures), [None] * len(figures)
+                misses = [(f, form) for f, form, outcome in zip(figures, forms, outcomes) if outcome is None]
+                proved = [f for f, _ in misses]
+                if jobs > 1:
+                    proved = prover.prove_all(proved)
+                elif trace is not None:
+                    proved = [prove(f, pairing, trace, fast=fast) for f in proved]
+                else:
+                    proved = [prove(f, pairing, reduce=reduce, fast=fast) for f in proved]
+                if cache is not None:
+                    cache.store_many([(figure, outcome, form) for (figure, form), outcome in zip(misses, proved)],
+                                     pairing)
+                proved = iter(proved)
+                outcomes = [outcome if outcome is not None else next(proved) for outcome in outcomes]
+                for (index, (line_number, figure)), outcome in zip(batch, outcomes):
+                    output.write(json.dumps(result_record(path, line_number, index, figure, outcome)) + '\n')
+                count += len(batch)
+
+                if error is not None:
+                    output.write(json.dumps({'file': path, 'line': error.line_number, 'error': str(error)}) + '\n')
+                if error is not None or not batch:
+                    break
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geopar',
+                                     description='Prove every triangulated figure configuration in the given files.')
+    parser.add_argument('files', nargs='+', help='input files in the format of input.txt')
+    parser.add_argument('--pairing', action='store_true', help='apply the pairing rule when needed')
+    parser.add_argument('-o', '--output', help='file to write the JSON lines to (default: standard output)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes (default: 1; 0 means one per CPU)')
+    parser.add_argument('--cache', metavar='DB', help='SQLite file of proof results to reuse and extend')
+    parser.add_argument('--stats', action='store_true',
+                        help='print calls and times of the hot functions to the standard error (main process only)')
+    parser.add_argument('--profile', metavar='PATH', help='write a cProfile dump of the run to PATH (main process only)')
+    parser.add_argument('--trace', metavar='PATH', help='write the proof trace of every configuration to PATH')
+    parser.add_argument('--reduce', action='store_true',
+                        help='prove on the fewest variables the angles need (same outcomes)')
+    parser.add_argument('--arrays', action='store_true',
+                        help='store figures in flat arrays: much less memory, somewhat slower (same outcomes)')
+    parser.add_argument('--fast', action='store_true',
+                        help='deduce on scaled integers, falling back to exact fractions (same outcomes)')
+    args = parser.parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if args.trace and (jobs > 1 or args.cache or args.reduce):
+        parser.error('--trace works with one job and without --cache or --reduce only')
+
+    # the resources are released in reverse order, also when proving fails
+    with ExitStack() as stack:
+        cache = stack.enter_context(ProofCache(args.cache)) if args.cache else None
+        trace_file = stack.enter_context(open(args.trace, 'w')) if args.trace else None
+        output = stack.enter_context(open(args.output, 'w')) if args.output else sys.stdout
+        if args.stats:
+            stats = Instrumentation()
+            stack.callback(lambda: sys.stderr.write(stats.summary() + '\n'))
+            stack.enter_context(stats)
+        if args.profile:
+            profile = cProfile.Profile()
+            stack.callback(profile.dump_stats, args.profile)
+            stack.enter_context(profile)
+        prove_files(args.files, args.pairing, output, jobs, cache=cache,
+                    trace=ProofTrace(trace_file) if trace_file else None, reduce=args.reduce,
+                    fast=args.fast, figure_class=ArrayTriangulatedFigure if args.arrays else TriangulatedFigure)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,5 @@
 from decimal import Decimal
 from fractions import Fraction
-from operator import add, sub
-import copy
 
 from geopar.utilities import to_fraction, GREEK_LETTERS
 
@@ -12,13 +10,19 @@ class Angle:
     """
     A (geometric) angle as linear combination of GREEK_LETTERS with Fraction coefficients.
 
+    Angle is an immutable value type: its coefficients are a tuple that is never changed
+    after __init__, and its hash is computed once and cached.
+
     Class Invariants: (valid before all methods except __init__ and after all methods)
     1. self.coefficients contains n Fractions, where 0 <= n <= len(GREEK_LETTERS)
     2. n = 0 denotes nothing is known about self
     3. For n > 0, self denotes the following angle:
     self.coefficients[0]α + self.coefficients[1]β + ... + self.coefficients[n-1]
+    4. self.coefficients is never changed after __init__
     """
 
+    __slots__ = ('_coefficients', '_hash')
+
     def __init__(self, some_coefficients):
         """
         Preconditions:
@@ -30,12 +34,49 @@ class Angle:
         # (Converted): self.coefficients[i] is the Fraction equivalent of
         # some_coefficients[i] for all i in [0, len(some_coefficients))
 
-        self.coefficients = []
+        coefficients = []
         for coefficient in some_coefficients:
-            if isinstance(coefficient, (int, float)):
-                self.coefficients.append(to_fraction(coefficient))
-            elif isinstance(coefficient, Fraction):
-                self.coefficients.append(coefficient)
+            if isinstance(coefficient, Fraction):
+                coefficients.append(coefficient)
+            elif isinstance(coefficient, int):
+                coefficients.append(Fraction(coefficient))
+            elif isinstance(coefficient, float):
+                coefficients.append(to_fraction(coefficient))
+
+        self._coefficients = tuple(coefficients)
+        self._hash = None
+
+    @classmethod
+    def _from_fractions(cls, fraction_coefficients):
+        # PRE: fraction_coefficients is a tuple of Fractions
+        # Returns: the Angle with these coefficients, skipping the conversions of __init__
+
+        result = cls.__new__(cls)
+        result._coefficients = fraction_coefficients
+        result._hash = None
+        return result
+
+    @property
+    def coefficients(self):
+        return self._coefficients
+
+    def _given_coefficients(self, an_angle):
+        # PRE: an_angle is an Angle (or CompactAngle), int, float or Fraction
+        # Returns: the coefficients of an_angle, with a number n taken as [0, 0, ..., n]
+
+        if isinstance(an_angle, Angle):
+            return an_angle._coefficients
+        if isinstance(an_angle, (int, float, Fraction)):
+            value = to_fraction(an_angle) if isinstance(an_angle, float) else Fraction(an_angle)
+            return (Fraction(0),) * (len(self._coefficients) - 1) + (value,)
+        return tuple(an_angle.get_coefficients())
+
+    def __copy__(self):
+        # Angles are immutable, so a copy of self is self
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __add__(self, an_angle):
         """
@@ -64,18 +105,13 @@ class Angle:
         """
 
         # --(Coefficients Obtained)
-        given_coefficients = []
-        if isinstance(an_angle, Angle):
-            given_coefficients = an_angle.get_coefficients()
-        elif isinstance(an_angle, (int, float)):
-            given_coefficients = \
-                [Fraction(0)] * (self.get_dimension() - 1) + [to_fraction(an_angle)]
+        given_coefficients = self._given_coefficients(an_angle)
 
         # --(Coefficients added)
-        returned_coefficients = list(map(add, self.coefficients, given_coefficients))
+        returned_coefficients = tuple(a + b for a, b in zip(self._coefficients, given_coefficients))
 
         # --(Sum returned)
-        return Angle(returned_coefficients)
+        return Angle._from_fractions(returned_coefficients)
 
     def __radd__(self, an_angle):
         """
@@ -111,18 +147,13 @@ class Angle:
         """
 
         # --(Coefficients Obtained)
-        given_coefficients = []
-        if isinstance(an_angle, Angle):
-            given_coefficients = an_angle.get_coefficients()
-        elif isinstance(an_angle, (int, float)):
-            given_coefficients = \
-                [Fraction(0)] * (self.get_dimension() - 1) + [to_fraction(an_angle)]
+        given_coefficients = self._given_coefficients(an_angle)
 
-        # --(Coefficients added)
-        returned_coefficients = list(map(sub, self.coefficients, given_coefficients))
+        # --(Coefficients subtracted)
+        returned_coefficients = tuple(a - b for a, b in zip(self._coefficients, given_coefficients))
 
         # --(Sum returned)
-        return Angle(returned_coefficients)
+        return Angle._from_fractions(returned_coefficients)
 
     def __rsub__(self, an_angle):
         """
@@ -130,7 +161,7 @@ class Angle:
         int - Angle or float - Angle
         """
         # an_angle - self = an_angle + negated_self
-        negated_self = Angle(list(map(lambda x: -x, self.coefficients)))
+        negated_self = Angle._from_fractions(tuple(-x for x in self._coefficients))
         return negated_self + an_angle
 
     def __truediv__(self, a_number):
@@ -153,9 +184,9 @@ class Angle:
 
         2. (Quotient returned): Angle with coefficients returned_coefficients is returned
         """
-        returned_coefficients = \
-            list(map(lambda x: x / to_fraction(a_number), self.coefficients))
-        return Angle(returned_coefficients)
+        divisor = to_fraction(a_number) if isinstance(a_number, float) else Fraction(a_number)
+        returned_coefficients = tuple(x / divisor for x in self._coefficients)
+        return Angle._from_fractions(returned_coefficients)
 
     def __mul__(self, a_number):
         """
@@ -178,8 +209,9 @@ class Angle:
         2. (Product returned): Angle with coefficients returned_coefficients is returned
         """
 
-        result_coefs = list(map(lambda x: x * to_fraction(a_number), self.coefficients))
-        return Angle(result_coefs)
+        factor = to_fraction(a_number) if isinstance(a_number, float) else Fraction(a_number)
+        result_coefs = tuple(x * factor for x in self._coefficients)
+        return Angle._from_fractions(result_coefs)
 
     def __rmul__(self, a_number):
         """
@@ -201,23 +233,23 @@ class Angle:
 
         Returns: whether or not self has the same values as an_angle
         """
-        # --(Converted): as_angle is an Angle with the same value as an_angle
-
-        as_angle = copy.deepcopy(an_angle)  # to avoid changing the parameter
-        if isinstance(as_angle, (int, float)):
-            as_angle = Angle([to_fraction(0)] * (self.get_dimension() - 1)
-                    + [to_fraction(as_angle)])
-
-        # --(Compared):
-        # EITHER self.coefficients same as as_angle.coefficients AND True returned
-        # OR False returned
+        # --(Fast path): the same object
+        if self is an_angle:
+            return True
 
-        an_angle_coefficients = as_angle.get_coefficients()
-        for i in range(len(self.coefficients)):
-            if self.coefficients[i] != an_angle_coefficients[i]:
+        # --(Converted): an_angle_coefficients are the coefficients of an_angle
+        if isinstance(an_angle, Angle):
+            # cached hashes differ only if the values differ
+            if hash(self) != hash(an_angle):
                 return False
+            an_angle_coefficients = an_angle._coefficients
+        elif isinstance(an_angle, (int, float, Fraction)) or hasattr(an_angle, 'get_coefficients'):
+            an_angle_coefficients = self._given_coefficients(an_angle)
+        else:
+            return NotImplemented
 
-        return True
+        # --(Compared): True returned iff the coefficients are the same
+        return self._coefficients == tuple(an_angle_coefficients)
 
     def __ne__(self, other):
         """
@@ -225,7 +257,8 @@ class Angle:
         Usage: Angle != Angle; Angle != int; int != Angle; Angle != float; float != Angle
         Preconditions: as for self.__eq__()
         """
-        return not self.__eq__(other)
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
 
     def __str__(self):
         """
@@ -266,22 +299,21 @@ class Angle:
 
     def __hash__(self):
         """
-        Returns: hash of sum of self.coefficients
+        Returns: hash of the tuple self.coefficients, computed once
         """
-        result = ''
-        for c in self.coefficients:
-            result += str(c)
-        return hash(result)
+        if self._hash is None:
+            self._hash = hash(self._coefficients)
+        return self._hash
 
     def get_coefficients(self):
-        return self.coefficients
+        return self._coefficients
 
     def get_dimension(self):
         # Example if self is aα + aβ + c, 3 is returned
-        return len(self.coefficients)
+        return len(self._coefficients)
 
     def is_known(self):
-        return bool(self.get_coefficients())
+        return bool(self._coefficients)
 
     @classmethod
     def from_str(cls, a_string):
@@ -0,0 +1,415 @@
+from array import array
+from fractions import Fraction
+from math import gcd
+import weakref
+
+from geopar.angle_class import Angle
+from geopar.triangle_class import Triangle
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.edge_index import EdgeIndex
+
+__author__ = 'satbek'
+
+_INT64_BOUND = 1 << 63
+
+
+class TriangleView(Triangle):
+    """
+    Intent: The t-th triangle of an ArrayTriangulatedFigure, with the public methods of Triangle.
+
+    A view holds no points or angles of its own: it reads them from the arrays of its figure
+    and writes angles back into them, so it is valid for as long as the figure is.
+    The figure hands out at most one live view per triangle (see ArrayTriangulatedFigure._view()),
+    so views can be compared and kept in dicts by identity, like Triangles.
+    """
+
+    __slots__ = ('_figure', '_t', '__weakref__')
+
+    def __init__(self, a_figure, a_t):
+        # PRE: 0 <= a_t < number of triangles of a_figure
+
+        self._figure, self._t = a_figure, a_t
+
+    @property
+    def points(self):
+        return self._figure._points_of(self._t)
+
+    @property
+    def angles(self):
+        return [self._figure._angle(3 * self._t + i) for i in range(3)]
+
+    def add_observer(self, an_observer):
+        # Postcondition: an_observer(self, index, old_angle, new_angle) is called every time an angle of self is set
+
+        self._figure._observers.setdefault(self._t, []).append(an_observer)
+
+    def angle_of_point(self, a_point):
+        return self._figure._angle(3 * self._t + self.index_of_point(a_point))
+
+    def get_angles(self):
+        return self.angles
+
+    def get_angle_points_by_point(self, a_point):
+        return [self.point_preceding(a_point), a_point, self.point_following(a_point)]
+
+    def get_points(self):
+        return self.points
+
+    def has_point(self, a_point):
+        return a_point in self.points
+
+    def has_all_points(self, three_points):
+        return set(self.points) == set(three_points)
+
+    def has_unknown_angle(self):
+        return self._figure._known[self._t] != 7
+
+    def index_of_point(self, a_point):
+        points = self._figure._points
+        base = 3 * self._t
+        for i in range(3):
+            if points[base + i] == a_point:
+                return i
+        raise Exception('There is no such point for this Triangle.')
+
+    def number_of_known(self):
+        return Triangle._NUMBER_OF_KNOWN[self._figure._known[self._t]]
+
+    def point_following(self, a_point):
+        return self._figure._points[3 * self._t + (self.index_of_point(a_point) + 1) % 3]
+
+    def point_preceding(self, a_point):
+        return self._figure._points[3 * self._t + (self.index_of_point(a_point) + 2) % 3]
+
+    def set_angle_by_index(self, an_index, an_angle):
+        # Precondition: an_index is either 0, 1, or 2
+        # Postcondition: the angle of the figure at slot 3t + an_index is an_angle
+
+        if an_index not in [0, 1, 2]:
+            raise Exception('Bad index.')
+        if isinstance(an_angle, (int, float)):
+            an_angle = Angle([an_angle])
+        self._figure._set(3 * self._t + an_index, an_angle)
+
+
+class ArrayTriangulatedFigure(TriangulatedFigure):
+    """
+    Intent: A TriangulatedFigure stored as a struct of flat arrays instead of Triangle and Angle objects,
+    for figures with millions of triangles.
+
+    The arrays follow the record layout of FigureLibrary (see tfbinary.py). A triangle costs
+    24 bytes of points, 3 * (dim + 1) * 8 bytes of angles and 1 byte of known-mask, instead of
+    a Triangle with its lists, dicts and three Angles of Fractions.
+    get_triangles() and triangles_with_point() return TriangleViews, created on demand;
+    angles are read as Angle values (Angles are immutable, so a value is as good as a view).
+
+    add() copies the points and angles of a Triangle: changes to that Triangle afterwards
+    do not reach self, and the Triangles of self are its views.
+
+    Class Invariants:
+    1. self._points[3t:3t + 3] are the points of triangle t, clockwise (int64)
+    2. bit i of self._known[t] is set iff the angle at slot s = 3t + i is known
+    3. a known angle at slot s has the coefficients self._numerators[s * dim:(s + 1) * dim] / self._denominators[s],
+       with the least such denominator; or, if self._denominators[s] == 0 because they do not fit
+       in int64, the coefficients self._wide[s]
+    4. self._dim is the dimension of the known angles; None while no angle is known (self._numerators is then empty)
+    """
+
+    def __init__(self, triangles=None):
+        self._points = array('q')
+        self._numerators = array('q')
+        self._denominators = array('q')
+        self._known = bytearray()
+        self._wide = {}
+        self._dim = None
+
+        # point -> row r of the clockwise fans: self._fan_triangles[self._fan_offsets[r]:self._fan_offsets[r + 1]]
+        #   are the triangles containing the point; computed on request, reset by add()
+        self._fan_rows = None
+        self._fan_offsets = self._fan_triangles = None
+
+        # FigureTopology of self, computed on request; reset by add()
+        self._topology = None
+
+        # triangle index -> its live TriangleView
+        self._views = weakref.WeakValueDictionary()
+
+        # triangle index -> observers registered through TriangleView.add_observer()
+        self._observers = {}
+
+        # see TriangulatedFigure.get_id(); computed on the first request, then kept up to date by _set()
+        self._fingerprint = None
+
+        if triangles:
+            for triangle in triangles:
+                self.add(triangle)
+
+    def __len__(self):
+        return len(self._known)
+
+    # (Storage)
+
+    def _points_of(self, a_t):
+        return list(self._points[3 * a_t:3 * a_t + 3])
+
+    def _angle(self, a_slot):
+        # Returns: the Angle at a_slot
+
+        if not self._known[a_slot // 3] >> a_slot % 3 & 1:
+            return Angle([])
+        denominator = self._denominators[a_slot]
+        if denominator == 0:
+            return Angle._from_fractions(self._wide[a_slot])
+        start = a_slot * self._dim
+        return Angle._from_fractions(tuple(Fraction(n, denominator)
+                                           for n in self._numerators[start:start + self._dim]))
+
+    def _store(self, a_slot, coefficients):
+        """
+        PRE: coefficients is a tuple of Fractions, empty for an unknown angle
+        POST: the angle at a_slot has coefficients (invariants 2-4)
+        """
+
+        t, bit = a_slot // 3, 1 << a_slot % 3
+        self._wide.pop(a_slot, None)
+        if not coefficients:
+            self._known[t] &= ~bit
+            return
+
+        if self._dim is None:
+            self._dim = len(coefficients)
+            self._numerators = array('q', bytes(8 * self._dim * len(self._denominators)))
+        elif len(coefficients) != self._dim:
+            raise ValueError('Angles of different dimensions: {} and {}.'.format(self._dim, len(coefficients)))
+
+        denominator = 1
+        for c in coefficients:
+            denominator = denominator // gcd(denominator, c.denominator) * c.denominator
+        row = [c.numerator * (denominator // c.denominator) for c in coefficients]
+        if denominator >= _INT64_BOUND or any(abs(x) >= _INT64_BOUND for x in row):
+            self._wide[a_slot] = coefficients
+            denominator, row = 0, [0] * self._dim
+        start = a_slot * self._dim
+        self._numerators[start:start + self._dim] = array('q', row)
+        self._denominators[a_slot] = denominator
+        self._known[t] |= bit
+
+    def _slot_hash_at(self, a_slot, an_angle):
+        # Returns: TriangulatedFigure._slot_hash() of an_angle at a_slot
+
+        points = self._points_of(a_slot // 3)
+        return hash((tuple(sorted(points)), points[a_slot % 3], hash(an_angle)))
+
+    def _set(self, a_slot, an_angle):
+        # POST: the angle at a_slot has the value of an_angle; the fingerprint and observers are updated
+
+        old_angle = self._angle(a_slot) if self._fingerprint is not None or self._observers else None
+        self._store(a_slot, tuple(Fraction(c) for c in an_angle.get_coefficients()))
+        if self._fingerprint is not None:
+            self._fingerprint ^= self._slot_hash_at(a_slot, old_angle)
+            self._fingerprint ^= self._slot_hash_at(a_slot, self._angle(a_slot))
+        for observer in self._observers.get(a_slot // 3, ()):
+            observer(self._view(a_slot // 3), a_slot % 3, old_angle, self._angle(a_slot))
+
+    def _append(self, three_points, three_coefficients):
+        """
+        POST: EITHER a triangle with three_points and the angles of three_coefficients (see _store())
+              is the last of self
+              OR ValueError is raised (points beyond int64, angles of different dimensions) and self is unchanged
+        """
+
+        dimensions = {len(coefficients) for coefficients in three_coefficients if coefficients}
+        if self._dim is not None:
+            dimensions.add(self._dim)
+        if len(dimensions) > 1:
+            raise ValueError('Angles of different dimensions: {}.'.format(sorted(dimensions)))
+        try:
+            points = array('q', three_points)
+        except OverflowError:
+            raise ValueError('Points must be less than 2 ** 63 in magnitude: {}.'.format(list(three_points)))
+
+        slot = len(self._denominators)
+        self._points.extend(points)
+        self._known.append(0)
+        self._denominators.extend((1, 1, 1))
+        if self._dim is not None:
+            self._numerators.extend(array('q', bytes(24 * self._dim)))
+        for i, coefficients in enumerate(three_coefficients):
+            self._store(slot + i, coefficients)
+            if self._fingerprint is not None:
+                self._fingerprint ^= self._slot_hash_at(slot + i, self._angle(slot + i))
+
+        self._fan_rows = self._fan_offsets = self._fan_triangles = None
+        self._topology = None
+
+    def _view(self, a_t):
+        # Returns: the live TriangleView of triangle a_t, creating it if there is none
+
+        view = self._views.get(a_t)
+        if view is None:
+            view = TriangleView(self, a_t)
+            self._views[a_t] = view
+        return view
+
+    # (TriangulatedFigure)
+
+    def add(self, a_triangle):
+        # Precondition: as TriangulatedFigure.add()
+        # Postcondition: a copy of the points and angles of a_triangle is the last triangle of self
+
+        angles = []
+        for angle in a_triangle.get_angles():
+            if isinstance(angle, (int, float)):
+                angle = Angle([angle])
+            angles.append(tuple(Fraction(c) for c in angle.get_coefficients()))
+        self._append(a_triangle.get_points(), angles)
+
+    @classmethod
+    def from_compact(cls, compact):
+        """
+        Returns the ArrayTriangulatedFigure described by compact, the result of to_compact(),
+        without building Triangles.
+        """
+
+        figure = cls()
+        for t in compact:
+            figure._append(t[:3], [tuple(Fraction(n, a[0]) for n in a[1:]) for a in t[3:]])
+        return figure
+
+    def to_compact(self):
+        # Returns: as TriangulatedFigure.to_compact(), read from the arrays
+
+        def compact_angle(a_slot):
+            if not self._known[a_slot // 3] >> a_slot % 3 & 1:
+                return ()
+            denominator = self._denominators[a_slot]
+            if denominator == 0:
+                coefficients = self._wide[a_slot]
+                denominator = 1
+                for c in coefficients:
+                    denominator = denominator // gcd(denominator, c.denominator) * c.denominator
+                return (denominator,) + tuple(c.numerator * (denominator // c.denominator) for c in coefficients)
+            start = a_slot * self._dim
+            return (denominator,) + tuple(self._numerators[start:start + self._dim])
+
+        return tuple(tuple(self._points[3 * t:3 * t + 3]) + tuple(compact_angle(3 * t + i) for i in range(3))
+                     for t in range(len(self)))
+
+    def get_id(self, strong=False):
+        # Returns: as TriangulatedFigure.get_id(); the int fingerprint is computed on the first call
+
+        if not strong and self._fingerprint is None:
+            fingerprint = 0
+            for slot in range(len(self._denominators)):
+                fingerprint ^= self._slot_hash_at(slot, self._angle(slot))
+            self._fingerprint = fingerprint
+        return super().get_id(strong)
+
+    def get_slot_by_angle_points(self, p1, p2, p3):
+        """
+        Returns (the triangle of self with points p1, p2, p3, the index of p2 in it),
+        or None if self has no such triangle. Costs O(number of triangles at p2).
+        """
+
+        if len({p1, p2, p3}) != 3:
+            return None
+        fans = self._fans_index()
+        row = fans.get(p2)
+        if row is None:
+            return None
+        wanted = {p1, p2, p3}
+        for t in self._fan_triangles[self._fan_offsets[row]:self._fan_offsets[row + 1]]:
+            if set(self._points[3 * t:3 * t + 3]) == wanted:
+                view = self._view(t)
+                return view, view.index_of_point(p2)
+        return None
+
+    def get_edge_index(self):
+        # Returns: a new EdgeIndex of the views of the triangles of self (not kept, to keep self small); O(n)
+
+        return EdgeIndex(self.get_triangles())
+
+    def get_triangles(self):
+        # Returns: the list of the views of the triangles of self
+
+        return [self._view(t) for t in range(len(self))]
+
+    def get_points(self):
+        # Returns: the points of self, in order of first appearance
+
+        return list(self._fans_index())
+
+    def all_angles_are_known(self):
+        return self._known.count(7) == len(self._known)
+
+    def is_empty(self):
+        return not self._known
+
+    def triangles_with_point(self, a_point):
+        """
+        Returns the list of the triangles containing a_point in clockwise order, as TriangulatedFigure does.
+        PRE: At least one triangle of self contains a_point
+        """
+
+        row = self._fans_index()[a_point]
+        return [self._view(t) for t in self._fan_triangles[self._fan_offsets[row]:self._fan_offsets[row + 1]]]
+
+    def _fans_index(self):
+        # Returns: point -> row of its clockwise fan (see __init__), building the fans of all points once
+
+        if self._fan_rows is None:
+            at = {}
+            for slot, point in enumerate(self._points):
+                at.setdefault(point, []).append(slot // 3)
+
+            self._fan_rows, offsets, fans = {}, array('i', [0]), array('i')
+            for point, triangles in at.items():
+                self._fan_rows[point] = len(self._fan_rows)
+                fans.extend(self._order_fan_of(point, triangles))
+                offsets.append(len(fans))
+            self._fan_offsets, self._fan_triangles = offsets, fans
+        return self._fan_rows
+
+    def _order_fan_of(self, a_point, triangles):
+        """
+        Returns the triangle indices triangles (those containing a_point, in order of addition)
+        in clockwise order, exactly as TriangulatedFigure._order_fan() orders Triangles.
+        """
+
+        points = self._points
+
+        def following(t):
+            base = 3 * t
+            i = 0 if points[base] == a_point else 1 if points[base + 1] == a_point else 2
+            return points[base + (i + 1) % 3]
+
+        def preceding(t):
+            base = 3 * t
+            i = 0 if points[base] == a_point else 1 if points[base + 1] == a_point else 2
+            return points[base + (i + 2) % 3]
+
+        # the first triangle traversing each edge into or out of a_point, as in EdgeIndex
+        by_following, by_preceding = {}, {}
+        for t in triangles:
+            by_following.setdefault(following(t), t)
+            by_preceding.setdefault(preceding(t), t)
+
+        first = triangles[0]
+        in_order, seen = [first], {first}
+        t = by_following.get(preceding(first))
+        while t is not None and t not in seen:
+            in_order.append(t)
+            seen.add(t)
+            t = by_following.get(preceding(t))
+
+        backward = []
+        t = by_preceding.get(following(first))
+        while t is not None and t not in seen:
+            backward.append(t)
+            seen.add(t)
+            t = by_preceding.get(following(t))
+        backward.reverse()
+        in_order = backward + in_order
+
+        in_order.extend(t for t in triangles if t not in seen)
+        return in_order
@@ -0,0 +1,213 @@
+from collections import Counter
+from fractions import Fraction
+import sys
+
+from geopar.utilities import TraceError
+from geopar.tfparser import TFParser
+from geopar.proof_trace import ProofTrace
+from geopar.run import UNIQUE_CONSEQUENCE, CONSEQUENCE
+
+__author__ = 'satbek'
+
+
+class CertificateChecker(object):
+    """
+    Intent: Checks proof traces (see ProofTrace) independently of the prover, in time linear
+    in the size of the figure plus the size of the trace.
+
+    The checker shares no code with TriangulatedFigure, TFPreprocessor or DeductionEngine
+    (check_files() only uses them to read the input): it works on the compact form of a figure
+    (TriangulatedFigure.to_compact()), keeps angles as tuples of Fractions, and indexes them
+    once by angle points and by point. Each step is then checked in time proportional to its
+    own premises and results.
+
+    Class Invariants:
+    1. self.values[s] is the tuple of coefficients of the angle at slot s = 3 * triangle + index, or None if unknown
+    2. self.slots[(p1, p2, p3)] is the slot of the angle with clockwise angle points p1, p2, p3
+    3. self.fans[p] is the list of the slots of the angles at point p
+    4. self.dimension is the number of coefficients of the known angles
+    """
+
+    def __init__(self, a_compact_figure):
+        # PRE: a_compact_figure is the result of TriangulatedFigure.to_compact()
+
+        self.values, self.slots, self.fans, self.points = [], {}, {}, []
+        self.dimension = 1
+
+        # (Edges): (a, b) for every clockwise edge a -> b; a fan is closed if every edge into
+        #   its point is matched by the reverse edge out of it
+        self._edges = set()
+        for t, compact in enumerate(a_compact_figure):
+            points = compact[:3]
+            for i in range(3):
+                slot = 3 * t + i
+                angle = compact[3 + i]
+                if angle:
+                    self.dimension = len(angle) - 1
+                    self.values.append(tuple(Fraction(n, angle[0]) for n in angle[1:]))
+                else:
+                    self.values.append(None)
+                self.points.append(points[i])
+                self.slots[(points[i - 1], points[i], points[(i + 1) % 3])] = slot
+                self.fans.setdefault(points[i], []).append(slot)
+                self._edges.add((points[i], points[(i + 1) % 3]))
+
+        self._interior = {}
+
+    def is_interior(self, a_point):
+        # Returns: whether a_point has a closed fan of more than 2 triangles; computed once per point
+
+        interior = self._interior.get(a_point)
+        if interior is None:
+            fan = self.fans.get(a_point, [])
+            following = {self.points[self._following(s)] for s in fan}
+            interior = len(fan) > 2 and len(following) == len(fan) and \
+                all((q, a_point) in self._edges for q in following)
+            self._interior[a_point] = interior
+        return interior
+
+    @staticmethod
+    def _following(a_slot):
+        # Returns: the slot following a_slot clockwise in its triangle
+
+        return a_slot - a_slot % 3 + (a_slot + 1) % 3
+
+    @staticmethod
+    def _preceding(a_slot):
+        # Returns: the slot preceding a_slot clockwise in its triangle
+
+        return a_slot - a_slot % 3 + (a_slot + 2) % 3
+
+    def _constant(self, a_number):
+        return (Fraction(0),) * (self.dimension - 1) + (Fraction(a_number),)
+
+    def _sum(self, some_slots):
+        total = [Fraction(0)] * self.dimension
+        for slot in some_slots:
+            for i, c in enumerate(self.values[slot]):
+                total[i] += c
+        return tuple(total)
+
+    def _slot(self, angle_points, a_step):
+        slot = self.slots.get(tuple(angle_points))
+        if slot is None:
+            raise TraceError(a_step, 'no angle {} in the figure'.format(list(angle_points)))
+        return slot
+
+    def check_step(self, a_record, a_step):
+        """
+        Intent: Checks one step of a trace and applies it.
+        POST: EITHER the step follows from its premises by its rule and its results are set
+              OR TraceError is raised
+        """
+
+        rule, point = a_record['rule'], a_record['at']
+        results = [self._slot(p, a_step) for p in a_record['results']]
+        premises = [self._slot(p, a_step) for p in a_record['premises']]
+        if len(set(premises)) != len(premises) or set(premises) & set(results):
+            raise TraceError(a_step, 'repeated angles')
+        if any(self.values[s] is not None for s in results):
+            raise TraceError(a_step, 'a result is already known')
+        if any(self.values[s] is None for s in premises):
+            raise TraceError(a_step, 'a premise is unknown')
+
+        if rule == '180':
+            if len(results) != 1 or set(premises) != {self._following(results[0]), self._preceding(results[0])}:
+                raise TraceError(a_step, 'the 180 rule needs the 2 other angles of the triangle')
+            total = 180
+        elif rule == '360':
+            fan = self.fans.get(point, [])
+            if not self.is_interior(point) or len(results) != 1 or self.points[results[0]] != point or \
+                    len(premises) != len(fan) - 1 or any(self.points[s] != point for s in premises):
+                raise TraceError(a_step, 'the 360 rule needs the other angles at an interior point')
+            total = 360
+        elif rule == 'pairing':
+            fan = self.fans.get(point, [])
+            following = {self._following(s) for s in fan}
+            preceding = {self._preceding(s) for s in fan}
+            if not self.is_interior(point) or len(results) != 2 or \
+                    sorted(s in following for s in results) != [False, True] or \
+                    not set(results) <= following | preceding or \
+                    len(premises) != 2 * len(fan) - 2 or not set(premises) <= following | preceding:
+                raise TraceError(a_step, 'pairing sets one following and one preceding angle at an interior point')
+            if Counter(self.values[s] for s in premises if s in following) != \
+                    Counter(self.values[s] for s in premises if s in preceding):
+                raise TraceError(a_step, 'the angles following and preceding {} do not pair up'.format(point))
+            total = (len(fan) - 2) * 180
+        else:
+            raise TraceError(a_step, 'unknown rule {!r}'.format(rule))
+
+        expected = tuple(c - s for c, s in zip(self._constant(total), self._sum(premises)))
+        if rule == 'pairing':
+            expected = tuple(c / 2 for c in expected)
+        angle = tuple(Fraction(c) for c in a_record['angle'])
+        if angle != expected:
+            raise TraceError(a_step, 'the {} rule gives {}, not {}'.format(rule, list(map(str, expected)),
+                                                                           a_record['angle']))
+        for slot in results:
+            self.values[slot] = angle
+
+    def check(self, steps):
+        """
+        Returns: the number of steps, all checked and applied (see check_step())
+        """
+
+        for number, record in enumerate(steps, start=1):
+            self.check_step(record, number)
+        return len(steps)
+
+    def rules_hold(self):
+        """
+        Returns: whether all angles are known, every triangle sums to 180, and at every interior point
+                 the angles sum to 360 and the angles following it pair up with those preceding it
+        """
+
+        if any(value is None for value in self.values):
+            return False
+        for t in range(0, len(self.values), 3):
+            if self._sum([t, t + 1, t + 2]) != self._constant(180):
+                return False
+        for point, fan in self.fans.items():
+            if not self.is_interior(point):
+                continue
+            if self._sum(fan) != self._constant(360):
+                return False
+            if Counter(self.values[self._following(s)] for s in fan) != \
+                    Counter(self.values[self._preceding(s)] for s in fan):
+                return False
+        return True
+
+
+def check_files(an_input_path, a_trace_path):
+    """
+    Intent: Checks the proofs of a_trace_path (written by python -m geopar --trace) against the
+            configurations of an_input_path.
+    Returns: the list of (line number of the configuration, number of steps checked)
+    Raises: TraceError at the first proof that does not check
+    """
+
+    checked = []
+    with open(a_trace_path) as trace_file:
+        proofs = ProofTrace.iter_proofs(trace_file)
+        for line_number, figure in TFParser.iter_file(an_input_path):
+            header, steps, footer = next(proofs, (None, None, None))
+            if header is None or header['figure'] != figure.get_id(strong=True):
+                raise TraceError(0, 'no proof of the configuration at line {}'.format(line_number))
+            checker = CertificateChecker(figure.to_compact())
+            checker.check(steps)
+            if footer is None or footer['steps'] != len(steps):
+                raise TraceError(len(steps), 'the proof of line {} is incomplete'.format(line_number))
+            if footer['outcome'] in (UNIQUE_CONSEQUENCE, CONSEQUENCE) and not checker.rules_hold():
+                raise TraceError(len(steps), 'the proof of line {} does not reach a valid figure'.format(line_number))
+            checked.append((line_number, len(steps)))
+    return checked
+
+
+if __name__ == '__main__':
+    # python -m geopar.certificate_checker INPUT TRACE
+    try:
+        for line, number_of_steps in check_files(sys.argv[1], sys.argv[2]):
+            print('line {}: {} steps checked'.format(line, number_of_steps))
+    except TraceError as e:
+        print('FAILED: {}'.format(e))
+        sys.exit(1)
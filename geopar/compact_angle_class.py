@@ -0,0 +1,218 @@
+from fractions import Fraction
+from math import gcd
+
+from geopar.angle_class import Angle
+from geopar.utilities import to_fraction
+
+__author__ = 'satbek'
+
+
+def _lcm(a, b):
+    return a // gcd(a, b) * b
+
+
+class CompactAngle(object):
+    """
+    An alternative Angle backend: the same value as an Angle, stored as a tuple of integer
+    numerators over one shared positive denominator.
+
+    Arithmetic works on plain ints (one lcm and one gcd pass per operation) instead of building
+    a list of Fractions, each of which runs its own gcd. CompactAngle has the public API of Angle
+    and compares equal to the Angle of the same value, so the two can be mixed in a figure.
+
+    Class Invariants:
+    1. self._numerators contains n ints, where 0 <= n <= len(GREEK_LETTERS)
+    2. n = 0 denotes nothing is known about self; then self._denominator = 1
+    3. self._denominator > 0 and gcd(self._denominator, *self._numerators) = 1
+    4. For n > 0, self denotes the angle whose coefficients are self._numerators[i] / self._denominator
+    """
+
+    __slots__ = ('_numerators', '_denominator', '_hash')
+
+    def __init__(self, some_coefficients):
+        """
+        Preconditions: as for Angle.__init__()
+        """
+
+        fractions = []
+        for coefficient in some_coefficients:
+            if isinstance(coefficient, float):
+                fractions.append(to_fraction(coefficient))
+            elif isinstance(coefficient, (int, Fraction)):
+                fractions.append(Fraction(coefficient))
+
+        denominator = 1
+        for fraction in fractions:
+            denominator = _lcm(denominator, fraction.denominator)
+
+        self._set(tuple(f.numerator * (denominator // f.denominator) for f in fractions), denominator)
+
+    def _set(self, numerators, denominator):
+        # Postcondition: self denotes numerators / denominator, normalized as in invariant 3
+
+        divisor = denominator
+        for numerator in numerators:
+            if divisor == 1:
+                break
+            divisor = gcd(divisor, numerator)
+        if divisor != 1:
+            numerators = tuple(n // divisor for n in numerators)
+            denominator //= divisor
+
+        self._numerators, self._denominator, self._hash = numerators, denominator, None
+
+    @classmethod
+    def _from_ints(cls, numerators, denominator):
+        # Returns: the CompactAngle numerators / denominator, without going through Fractions
+
+        result = cls.__new__(cls)
+        result._set(numerators, denominator)
+        return result
+
+    @classmethod
+    def from_angle(cls, an_angle):
+        # Returns: the CompactAngle with the same value as an_angle
+
+        return cls(an_angle.get_coefficients())
+
+    def to_angle(self):
+        # Returns: the Angle with the same value as self
+
+        return Angle(self.get_coefficients())
+
+    def _as_ints(self, an_angle):
+        """
+        Returns: (numerators, denominator) of an_angle
+        PRE: an_angle is a CompactAngle, an Angle or a number
+        """
+
+        if isinstance(an_angle, CompactAngle):
+            return an_angle._numerators, an_angle._denominator
+        if isinstance(an_angle, Angle):
+            other = CompactAngle(an_angle.get_coefficients())
+            return other._numerators, other._denominator
+
+        value = to_fraction(an_angle) if isinstance(an_angle, float) else Fraction(an_angle)
+        return (0,) * (len(self._numerators) - 1) + (value.numerator,), value.denominator
+
+    def __add__(self, an_angle):
+        """
+        Usage: CompactAngle + CompactAngle|Angle|int|float|Fraction
+        Preconditions: as for Angle.__add__()
+        """
+
+        numerators, denominator = self._as_ints(an_angle)
+        if denominator == self._denominator:
+            return CompactAngle._from_ints(
+                tuple(a + b for a, b in zip(self._numerators, numerators)), denominator)
+
+        common = _lcm(self._denominator, denominator)
+        scale_self, scale_other = common // self._denominator, common // denominator
+        return CompactAngle._from_ints(
+            tuple(a * scale_self + b * scale_other for a, b in zip(self._numerators, numerators)), common)
+
+    def __radd__(self, an_angle):
+        return self + an_angle
+
+    def __neg__(self):
+        return CompactAngle._from_ints(tuple(-a for a in self._numerators), self._denominator)
+
+    def __sub__(self, an_angle):
+        """
+        Usage: CompactAngle - CompactAngle|Angle|int|float|Fraction
+        Preconditions: as for Angle.__sub__()
+        """
+
+        numerators, denominator = self._as_ints(an_angle)
+        common = _lcm(self._denominator, denominator)
+        scale_self, scale_other = common // self._denominator, common // denominator
+        return CompactAngle._from_ints(
+            tuple(a * scale_self - b * scale_other for a, b in zip(self._numerators, numerators)), common)
+
+    def __rsub__(self, an_angle):
+        return -self + an_angle
+
+    def __mul__(self, a_number):
+        """
+        Usage: CompactAngle * int|float|Fraction
+        """
+
+        factor = to_fraction(a_number) if isinstance(a_number, float) else Fraction(a_number)
+        return CompactAngle._from_ints(tuple(a * factor.numerator for a in self._numerators),
+                                       self._denominator * factor.denominator)
+
+    def __rmul__(self, a_number):
+        return self * a_number
+
+    def __truediv__(self, a_number):
+        """
+        Usage: CompactAngle / int|float|Fraction
+        PRE: a_number != 0
+        """
+
+        divisor = to_fraction(a_number) if isinstance(a_number, float) else Fraction(a_number)
+        sign = -1 if divisor < 0 else 1
+        return CompactAngle._from_ints(tuple(sign * a * divisor.denominator for a in self._numerators),
+                                       self._denominator * abs(divisor.numerator))
+
+    def __eq__(self, an_angle):
+        """
+        Usage: CompactAngle == CompactAngle|Angle|int|float
+        Returns: whether or not self has the same value as an_angle
+        """
+
+        if self is an_angle:
+            return True
+        if not isinstance(an_angle, (CompactAngle, Angle, int, float, Fraction)):
+            return NotImplemented
+        if isinstance(an_angle, Angle) and not an_angle.is_known():
+            return not self.is_known()
+
+        # both sides are normalized, so equal values have equal ints
+        return (self._numerators, self._denominator) == self._as_ints(an_angle)
+
+    def __ne__(self, an_angle):
+        result = self.__eq__(an_angle)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        """
+        Returns: hash of the tuple of coefficients of self, computed once
+        """
+
+        if self._hash is None:
+            self._hash = hash(tuple(self.get_coefficients()))
+        return self._hash
+
+    def __str__(self):
+        return str(self.to_angle())
+
+    def __repr__(self):
+        return self.__str__()
+
+    def get_coefficients(self):
+        return [Fraction(n, self._denominator) for n in self._numerators]
+
+    def get_dimension(self):
+        return len(self._numerators)
+
+    def is_known(self):
+        return bool(self._numerators)
+
+    @classmethod
+    def from_str(cls, a_string):
+        """
+        Intent: To instantiate a CompactAngle from a string
+        Precondition: as for Angle.from_str()
+        """
+
+        if a_string == 'x':
+            return cls([])
+
+        coefficients = []
+        for token in a_string.split():
+            try:
+                coefficients.append(int(token))
+            except ValueError:
+                coefficients.append(Fraction(token))
+        return cls(coefficients)
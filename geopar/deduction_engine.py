@@ -0,0 +1,137 @@
+from geopar.tfpreprocessor import TFPreprocessor
+from geopar.proof_trace import ProofTrace
+
+__author__ = 'satbek'
+
+
+class DeductionEngine(object):
+    """
+    Intent: Deduces unknown angles of a triangulated figure by the 180-degree, 360-degree
+    and (optionally) pairing rules until no new angle can be deduced.
+
+    Instead of sweeping the whole figure until its id stops changing, the engine keeps
+    a worklist: when an angle of triangle t at point p becomes known, only t (180 rule),
+    the fan of p (360 rule) and, with pairing, the fans of the other points of t are revisited.
+
+    Work is processed in rounds: a round handles everything queued by the previous one.
+    Given a ProofTrace, the engine records every deduction with its rule and premises.
+
+    Class Invariants:
+    1. self.figure is the TriangulatedFigure being completed
+    2. self.deduced_per_round[i] is the number of angles deduced in round i + 1
+    """
+
+    def __init__(self, a_tf, pairing=False, trace=None):
+        """
+        PRE: a_tf is a TriangulatedFigure; trace is None or a ProofTrace
+        POST: self is ready to run() on a_tf; the pairing rule is applied only if pairing
+        """
+
+        self.figure = a_tf
+        self.pairing = pairing
+        self.trace = trace
+        self.deduced_per_round = []
+
+    def get_rounds(self):
+        # Returns: the number of rounds run() has taken so far
+
+        return len(self.deduced_per_round)
+
+    def get_number_deduced(self):
+        # Returns: the number of angles deduced by run() so far
+
+        return sum(self.deduced_per_round)
+
+    def run(self):
+        """
+        Intent: Applies the rules until no new angle can be deduced.
+
+        POST1: no rule applies to self.figure any more
+        POST2: the number of angles deduced is returned
+        """
+
+        topology = self.figure.get_topology()
+
+        # pending_triangles|pending_points: the work queued for the next round, in queueing order
+        pending_triangles = {id(t): t for t in self.figure.get_triangles()}
+        pending_points = dict.fromkeys(topology.get_interior_points())
+
+        deduced_before = self.get_number_deduced()
+
+        while pending_triangles or pending_points:
+            triangles, points = list(pending_triangles.values()), list(pending_points)
+            pending_triangles, pending_points = {}, {}
+
+            # (Deduced): newly_known lists (triangle, point) for each angle found in this round
+            newly_known = []
+            if self.pairing:
+                for point in points:
+                    newly_known.extend(self._apply_pairing(point))
+            for triangle in triangles:
+                newly_known.extend(self._apply_180(triangle))
+            for point in points:
+                newly_known.extend(self._apply_360(point))
+
+            if not newly_known:
+                break
+            self.deduced_per_round.append(len(newly_known))
+
+            # (Queued): only the triangles and fans affected by newly_known
+            for triangle, point in newly_known:
+                pending_triangles[id(triangle)] = triangle
+                for point_ in triangle.get_points():
+                    if point_ == point or self.pairing:
+                        if topology.is_interior(point_):
+                            pending_points[point_] = None
+
+        return self.get_number_deduced() - deduced_before
+
+    def _apply_180(self, a_triangle):
+        # Returns: [(a_triangle, point)] if the angle at point was completed by the 180 rule, [] otherwise
+
+        if a_triangle.number_of_known() != 2:
+            return []
+
+        for point in a_triangle.get_points():
+            if not a_triangle.angle_of_point(point).is_known():
+                a_triangle.complete_unknown_angle()
+                if self.trace is not None:
+                    self.trace.record(ProofTrace.RULE_180, point,
+                                      [a_triangle.get_angle_points_by_point(p) for p in a_triangle.get_points()
+                                       if p != point],
+                                      [a_triangle.get_angle_points_by_point(point)], a_triangle.angle_of_point(point))
+                return [(a_triangle, point)]
+        return []
+
+    def _apply_360(self, a_point):
+        # Returns: [(triangle, a_point)] if an angle at a_point was completed by the 360 rule, [] otherwise
+
+        angle_points = self.figure.complete_unknown_angle_at(a_point)
+        if angle_points is None:
+            return []
+        triangle = self._triangle_of(angle_points)
+        if self.trace is not None:
+            self.trace.record(ProofTrace.RULE_360, a_point,
+                              [t.get_angle_points_by_point(a_point)
+                               for t in self.figure.triangles_with_point(a_point) if t is not triangle],
+                              [angle_points], triangle.angle_of_point(a_point))
+        return [(triangle, a_point)]
+
+    def _apply_pairing(self, a_point):
+        # Returns: (triangle, point) for every angle set by the pairing rule around a_point
+
+        results = TFPreprocessor.pair_angles_at(self.figure, a_point)
+        if results and self.trace is not None:
+            premises = []
+            for t in self.figure.triangles_with_point(a_point):
+                for point in (t.point_following(a_point), t.point_preceding(a_point)):
+                    if t.get_angle_points_by_point(point) not in results:
+                        premises.append(t.get_angle_points_by_point(point))
+            self.trace.record(ProofTrace.RULE_PAIRING, a_point, premises, results,
+                              self.figure.get_angle_by_angle_points(*results[0]))
+        return [(self._triangle_of(angle_points), angle_points[1]) for angle_points in results]
+
+    def _triangle_of(self, angle_points):
+        # Returns: the triangle of self.figure with the given angle points
+
+        return self.figure.get_slot_by_angle_points(*angle_points)[0]
@@ -0,0 +1,117 @@
+__author__ = 'satbek'
+
+
+class EdgeIndex:
+    """
+    Intent: The edges of a triangulated figure and the triangles on each side of them,
+    kept up to date one triangle at a time.
+
+    A triangle p0, p1, p2 (clockwise) traverses its edges in the directions p0 -> p1, p1 -> p2 and p2 -> p0.
+    In a consistently oriented triangulation, the two triangles sharing an edge traverse it in opposite
+    directions, so each direction a -> b belongs to at most one triangle: the one to the right of a -> b,
+    since a clockwise triangle lies to the right of its edges. The triangle to the left of a -> b is the one
+    traversing b -> a. Every query below is then one or two dict lookups, and every whole-figure pass
+    (dual graph, boundary, components, invariant check) is linear in the number of triangles.
+
+    Class Invariants:
+    1. self.triangles lists the triangles added, in order of addition; a triangle is referred to by its index there
+    2. self._right[(a, b)] is the index of the first triangle added that traverses a -> b
+    3. self._conflicts lists (index of that first triangle, index of a later one, (a, b)) for every later
+       triangle traversing an edge a -> b in the same direction, in order of addition
+    """
+
+    def __init__(self, triangles=()):
+        self.triangles = []
+        self._right = {}
+        self._conflicts = []
+        for triangle in triangles:
+            self.add(triangle)
+
+    def add(self, a_triangle):
+        # POST: a_triangle is the last of self.triangles and its 3 directed edges are indexed; O(1)
+
+        t = len(self.triangles)
+        self.triangles.append(a_triangle)
+        points = a_triangle.get_points()
+        for i in range(3):
+            edge = (points[i], points[(i + 1) % 3])
+            first = self._right.setdefault(edge, t)
+            if first != t:
+                self._conflicts.append((first, t, edge))
+
+    def triangle_traversing(self, a, b):
+        # Returns: the (first) triangle traversing the edge a -> b clockwise, None if there is none
+
+        t = self._right.get((a, b))
+        return None if t is None else self.triangles[t]
+
+    def get_sides(self, a, b):
+        # Returns: (the triangle to the left, the triangle to the right) of the edge a -> b; None for a missing side
+
+        return self.triangle_traversing(b, a), self.triangle_traversing(a, b)
+
+    def dual_graph(self):
+        """
+        Returns: the list of the neighbours of every triangle: the indices of the triangles across its
+                 edges, in the order of its edges (see class docstring)
+        """
+
+        neighbours = []
+        for triangle in self.triangles:
+            points = triangle.get_points()
+            across = (self._right.get((points[(i + 1) % 3], points[i])) for i in range(3))
+            neighbours.append([other for other in across if other is not None])
+        return neighbours
+
+    def boundary_edges(self):
+        # Returns: the directed edges a -> b of the triangles whose reverse b -> a belongs to no triangle
+
+        return [(a, b) for (a, b) in self._right if (b, a) not in self._right]
+
+    def components(self):
+        """
+        Returns: the connected components of the dual graph, as lists of triangle indices,
+                 each in breadth-first order from its first triangle
+        """
+
+        neighbours = self.dual_graph()
+        component_of = [None] * len(self.triangles)
+        result = []
+        for start in range(len(self.triangles)):
+            if component_of[start] is not None:
+                continue
+            component_of[start] = len(result)
+            component = [start]
+            for t in component:
+                for other in neighbours[t]:
+                    if component_of[other] is None:
+                        component_of[other] = len(result)
+                        component.append(other)
+            result.append(component)
+        return result
+
+    def get_conflicts(self):
+        """
+        Returns: the list of (t1, t2, (a, b)) for triangles (indices) t1 < t2 that both traverse the edge a -> b,
+                 i.e. are not both clockwise, or are duplicates; ordered by t2
+        """
+
+        return list(self._conflicts)
+
+    def get_isolated(self):
+        """
+        Returns: the indices of the triangles that share no edge with another triangle,
+                 in a figure of more than one triangle (they break invariant 2 of TriangulatedFigure)
+        """
+
+        if len(self.triangles) < 2:
+            return []
+        shared = {t for t, neighbours in enumerate(self.dual_graph()) if neighbours}
+        for first, later, _ in self._conflicts:
+            shared.update((first, later))
+        return [t for t in range(len(self.triangles)) if t not in shared]
+
+    def is_valid(self):
+        # Returns: whether every shared edge is traversed in opposite directions and no triangle is isolated
+
+        return not self._conflicts and not self.get_isolated()
@@ -0,0 +1,144 @@
+from collections import Counter, defaultdict
+from functools import wraps
+import time
+
+from geopar.angle_class import Angle
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.tfpreprocessor import TFPreprocessor
+from geopar.tfvalidator import TFValidator
+from geopar.deduction_engine import DeductionEngine
+
+__author__ = 'satbek'
+
+# (class, attribute) of every function counted and timed by Instrumentation
+TARGETS = [
+    (TFPreprocessor, 'theorem_1'),
+    (TFPreprocessor, 'theorem_2'),
+    (TFPreprocessor, 'theorem_3'),
+    (TFPreprocessor, 'pair_angles_at'),
+    (TFValidator, 'all_rules'),
+    (DeductionEngine, '_apply_180'),
+    (DeductionEngine, '_apply_360'),
+    (DeductionEngine, '_apply_pairing'),
+    (TriangulatedFigure, 'get_interior_points'),
+    (TriangulatedFigure, 'get_topology'),
+    (TriangulatedFigure, 'triangles_with_point'),
+    (TriangulatedFigure, 'complete_unknown_angle_at'),
+    (TriangulatedFigure, 'get_id'),
+    (Angle, '__add__'),
+    (Angle, '__radd__'),
+    (Angle, '__sub__'),
+    (Angle, '__rsub__'),
+    (Angle, '__mul__'),
+    (Angle, '__rmul__'),
+    (Angle, '__truediv__'),
+    (Angle, '__eq__'),
+]
+
+
+class Instrumentation(object):
+    """
+    Intent: Counts the calls of, and the time spent in, the hot functions of geopar (TARGETS),
+    and records the rounds of every DeductionEngine.run(), while self is entered.
+
+    The functions are replaced by counting wrappers on __enter__ and restored on __exit__,
+    so there is no cost at all outside the with block. Times are inclusive: a function
+    calling another target counts the time of that call too.
+    Only the current process is instrumented (not the workers of ParallelProver).
+    The wrappers are set on the classes themselves, so they count every caller in the process:
+    an Instrumentation is process-global, not thread-safe, and two of them must not be entered at once.
+
+    Usage:
+        with Instrumentation() as stats:
+            prove(figure)
+        print(stats.summary())
+
+    Class Invariants:
+    1. self.calls[name] and self.seconds[name] are the calls of, and the time spent in, 'Class.function' name
+    2. self.rounds[i] is the list of angles deduced per round by the i-th DeductionEngine.run()
+    """
+
+    def __init__(self, targets=None):
+        # PRE: targets is None (TARGETS) or a list of (class, attribute) of functions
+
+        self.targets = TARGETS if targets is None else targets
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.rounds = []
+
+        # (class, attribute, original value) of every function replaced by __enter__
+        self._replaced = []
+
+    def _wrap(self, a_name, a_function):
+        # Returns: a_function, counting its calls and time under a_name
+
+        calls, seconds, clock = self.calls, self.seconds, time.perf_counter
+
+        @wraps(a_function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return a_function(*args, **kwargs)
+            finally:
+                seconds[a_name] += clock() - start
+                calls[a_name] += 1
+        return wrapper
+
+    def _wrap_run(self, a_run):
+        # Returns: DeductionEngine.run a_run, recording the rounds of each call in self.rounds
+
+        rounds = self.rounds
+
+        @wraps(a_run)
+        def run(engine):
+            before = engine.get_rounds()
+            try:
+                return a_run(engine)
+            finally:
+                rounds.append(engine.deduced_per_round[before:])
+        return run
+
+    def _replace(self, a_class, an_attribute, a_value):
+        self._replaced.append((a_class, an_attribute, a_class.__dict__[an_attribute]))
+        setattr(a_class, an_attribute, a_value)
+
+    def __enter__(self):
+        for a_class, attribute in self.targets:
+            original = a_class.__dict__[attribute]
+            name = '{}.{}'.format(a_class.__name__, attribute)
+            if isinstance(original, staticmethod):
+                self._replace(a_class, attribute, staticmethod(self._wrap(name, original.__func__)))
+            else:
+                self._replace(a_class, attribute, self._wrap(name, original))
+        self._replace(DeductionEngine, 'run', self._wrap_run(DeductionEngine.__dict__['run']))
+        return self
+
+    def __exit__(self, *exc_info):
+        while self._replaced:
+            a_class, attribute, original = self._replaced.pop()
+            setattr(a_class, attribute, original)
+        return False
+
+    def to_dict(self):
+        # Returns: the JSON-serializable statistics of self
+
+        return {
+            'functions': {name: {'calls': self.calls[name], 'seconds': self.seconds[name]}
+                          for name in sorted(self.calls)},
+            'rounds': self.rounds,
+        }
+
+    def summary(self):
+        # Returns: a table of the functions called, the most time-consuming first, and the rounds
+
+        lines = ['{:<45} {:>12} {:>12}'.format('function', 'calls', 'seconds')]
+        for name in sorted(self.calls, key=lambda name: -self.seconds[name]):
+            lines.append('{:<45} {:>12} {:>12.6f}'.format(name, self.calls[name], self.seconds[name]))
+
+        deduced = [sum(rounds) for rounds in self.rounds]
+        lines.append('')
+        lines.append('deduction runs: {}, rounds: {}, angles deduced: {}'.format(
+            len(self.rounds), sum(map(len, self.rounds)), sum(deduced)))
+        if self.rounds:
+            lines.append('most rounds in one run: {}'.format(max(map(len, self.rounds))))
+        return '\n'.join(lines)
@@ -0,0 +1,157 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import util
+import os
+
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.tfbinary import FigureLibrary
+from geopar.run import prove
+
+__author__ = 'satbek'
+
+
+def prove_compact(a_compact_figure, pairing=False, reduce=False, fast=False, figure_class=TriangulatedFigure):
+    """
+    Intent: Worker task of ParallelProver; proves one figure given in compact form, built as a figure_class.
+    Returns: (outcome, compact form of the figure with its deduced angles)
+    """
+
+    figure = figure_class.from_compact(a_compact_figure)
+    outcome = prove(figure, pairing, reduce=reduce, fast=fast)
+    return outcome, figure.to_compact()
+
+
+# path -> FigureLibrary opened by this (worker) process; the mapped pages are shared between processes
+_libraries = {}
+
+
+def _close_libraries():
+    # POST: the FigureLibraries opened by this process are closed; run when the process exits
+
+    while _libraries:
+        _libraries.popitem()[1].close()
+
+
+def prove_in_library(a_task):
+    """
+    Intent: Worker task of ParallelProver.prove_library();
+            a_task is (path, index, pairing, reduce, fast, figure_class).
+    Returns: (outcome, compact form of the index-th figure of the library with its deduced angles)
+    """
+
+    path, index, pairing, reduce, fast, figure_class = a_task
+    library = _libraries.get(path)
+    if library is None:
+        if not _libraries:
+            # a worker process exits through multiprocessing, which runs its finalizers but not atexit
+            util.Finalize(None, _close_libraries, exitpriority=10)
+        library = _libraries[path] = FigureLibrary(path)
+    figure = library.figure(index, figure_class)
+    outcome = prove(figure, pairing, reduce=reduce, fast=fast)
+    return outcome, figure.to_compact()
+
+
+class ParallelProver(object):
+    """
+    Intent: Proves many independent triangulated figures on a pool of worker processes.
+
+    Figures travel to and from the workers in the compact form of TriangulatedFigure.to_compact()
+    (tuples of ints) rather than as pickled graphs of Triangle and Angle objects, and are handed
+    out in chunks to keep the per-task overhead low. Results come back in input order.
+    Used as a context manager, self keeps one pool open across calls.
+
+    Class Invariants:
+    1. self.workers >= 1 is the number of worker processes
+    2. self.pairing tells whether the pairing rule may be applied, self.reduce whether
+       figures are proved on the fewest variables, self.fast whether on scaled integers (see run.prove())
+    3. the workers build the figures they prove as instances of self.figure_class
+    """
+
+    def __init__(self, workers=None, pairing=False, chunksize=None, reduce=False, fast=False,
+                 figure_class=TriangulatedFigure):
+        """
+        PRE: workers is None (one per CPU) or a positive int;
+             chunksize is None (chosen from the number of figures) or a positive int
+        """
+
+        self.workers = workers or os.cpu_count() or 1
+        self.pairing = pairing
+        self.chunksize = chunksize
+        self.reduce = reduce
+        self.fast = fast
+        self.figure_class = figure_class
+
+        # the pool, kept open between calls while self is used as a context manager
+        self._executor = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        return False
+
+    def _chunksize(self, number_of_figures):
+        # Returns: the number of figures per task; about 4 tasks per worker balance the load
+
+        if self.chunksize:
+            return self.chunksize
+        return max(1, number_of_figures // (4 * self.workers))
+
+    def prove_compact_figures(self, compact_figures):
+        """
+        PRE: compact_figures is a list of results of TriangulatedFigure.to_compact()
+        Returns: the list of (outcome, compact figure with deduced angles), in the order of compact_figures
+        """
+
+        return self._map(partial(prove_compact, pairing=self.pairing, reduce=self.reduce, fast=self.fast,
+                                 figure_class=self.figure_class), compact_figures)
+
+    def _map(self, a_task, some_arguments):
+        # Returns: [a_task(a) for a in some_arguments], computed on the workers in chunks
+
+        if self.workers == 1:
+            return list(map(a_task, some_arguments))
+
+        chunksize = self._chunksize(len(some_arguments))
+        if self._executor is not None:
+            return list(self._executor.map(a_task, some_arguments, chunksize=chunksize))
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(a_task, some_arguments, chunksize=chunksize))
+
+    def prove_all(self, figures):
+        """
+        PRE: figures is an iterable of TriangulatedFigure
+        Returns: the list of outcomes (see run.MESSAGES), in the order of figures;
+                 the deduced angles are written back into figures
+        """
+
+        figures = list(figures)
+        results = self.prove_compact_figures([figure.to_compact() for figure in figures])
+
+        outcomes = []
+        for figure, (outcome, compact) in zip(figures, results):
+            for triangle, solved in zip(figure.get_triangles(), TriangulatedFigure.from_compact(compact).get_triangles()):
+                for index, angle in enumerate(solved.get_angles()):
+                    if angle != triangle.get_angles()[index]:
+                        triangle.set_angle_by_index(index, angle)
+            outcomes.append(outcome)
+        return outcomes
+
+    def prove_library(self, a_path, indices=None):
+        """
+        Intent: Proves figures of the FigureLibrary file a_path. Only (path, index) pairs are sent
+                to the workers, which map the file themselves.
+        PRE: indices is None (all figures) or an iterable of indices of figures in the library
+        Returns: the list of (outcome, compact figure with deduced angles), in the order of indices
+        """
+
+        if indices is None:
+            with FigureLibrary(a_path) as library:
+                indices = range(len(library))
+        return self._map(prove_in_library, [(a_path, index, self.pairing, self.reduce, self.fast, self.figure_class)
+                                            for index in indices])
@@ -0,0 +1,302 @@
+from fractions import Fraction
+from hashlib import sha256
+import json
+import sqlite3
+
+from geopar.angle_class import Angle
+from geopar.run import prove
+
+__author__ = 'satbek'
+
+
+class CanonicalForm(object):
+    """
+    Intent: A description of a triangulated figure that does not depend on the numbering of its
+    points or on the order and rotation of its triangles.
+
+    The points are relabelled 0, 1, 2, ... in the order a breadth-first walk over the triangles
+    meets them. The walk starts at a triangle and one of its points, crosses edges in clockwise order,
+    and enters each neighbour at the first point of the shared edge. Among the starts of the smallest
+    class of _refined_starts(), the one giving the smallest code is kept.
+    Each connected component is labelled this way, and the components are sorted by code.
+
+    Class Invariants:
+    1. self.code is a tuple, one (labels, angle keys) per triangle; equal for relabelled figures
+    2. self.labels maps every point of the figure to its canonical label
+    3. self.points[label] is the point of the figure with that label
+    """
+
+    def __init__(self, a_tf):
+        triangles = a_tf.get_triangles()
+
+        # (Edges): (a, b) -> (triangle, index of a) for every clockwise edge a -> b
+        edges = {}
+        for triangle in triangles:
+            points = triangle.get_points()
+            for i in range(3):
+                edges[(points[i], points[(i + 1) % 3])] = (triangle, i)
+
+        keys = {id(t): [CanonicalForm.angle_key(a) for a in t.get_angles()] for t in triangles}
+
+        # (Components): canonical code and point order of every component
+        seen, components = set(), []
+        for triangle in triangles:
+            if id(triangle) not in seen:
+                component = CanonicalForm._component(triangle, edges, seen)
+                components.append(CanonicalForm._canonical_walk(component, edges, keys))
+        components.sort(key=lambda component: component[0])
+
+        code, self.points = [], []
+        for component_code, component_points in components:
+            offset = len(self.points)
+            code.extend((tuple(label + offset for label in labels), angle_keys)
+                        for labels, angle_keys in component_code)
+            self.points.extend(component_points)
+        self.code = tuple(code)
+        self.labels = {point: label for label, point in enumerate(self.points)}
+
+    @staticmethod
+    def angle_key(an_angle):
+        # Returns: a tuple of ints that identifies the value of an_angle; () if unknown
+
+        return tuple((c.numerator, c.denominator) for c in an_angle.get_coefficients())
+
+    @staticmethod
+    def _component(a_triangle, edges, seen):
+        # Returns: the triangles connected to a_triangle through shared edges; they are added to seen
+
+        component, stack = [], [a_triangle]
+        seen.add(id(a_triangle))
+        while stack:
+            triangle = stack.pop()
+            component.append(triangle)
+            points = triangle.get_points()
+            for i in range(3):
+                neighbour = edges.get((points[(i + 1) % 3], points[i]))
+                if neighbour is not None and id(neighbour[0]) not in seen:
+                    seen.add(id(neighbour[0]))
+                    stack.append(neighbour[0])
+        return component
+
+    @staticmethod
+    def _walk(a_triangle, a_start, edges, keys, a_bound=None):
+        """
+        Returns: EITHER (code, points in label order) of the walk from a_triangle entered at its point a_start
+                 OR None as soon as the code is known to be greater than a_bound, the code of another walk
+        """
+
+        labels, points_in_order, code = {}, [], []
+        queue, visited, head = [(a_triangle, a_start)], {id(a_triangle)}, 0
+        while head < len(queue):
+            triangle, start = queue[head]
+            head += 1
+            points = triangle.get_points()
+            rotated = [points[(start + i) % 3] for i in range(3)]
+            for point in rotated:
+                if point not in labels:
+                    labels[point] = len(points_in_order)
+                    points_in_order.append(point)
+            angle_keys = keys[id(triangle)]
+            code.append((tuple(labels[p] for p in rotated),
+                         tuple(angle_keys[(start + i) % 3] for i in range(3))))
+
+            # a prefix smaller than a_bound makes the whole code smaller: stop comparing
+            if a_bound is not None and code[-1] != a_bound[len(code) - 1]:
+                if code[-1] > a_bound[len(code) - 1]:
+                    return None
+                a_bound = None
+
+            for i in range(3):
+                neighbour = edges.get((rotated[(i + 1) % 3], rotated[i]))
+                if neighbour is not None and id(neighbour[0]) not in visited:
+                    visited.add(id(neighbour[0]))
+                    queue.append(neighbour)
+        return tuple(code), points_in_order
+
+    @staticmethod
+    def _refined_starts(a_component, edges, keys):
+        """
+        Returns: the starts (triangle, index) of a_component in the smallest class of a partition that
+                 does not depend on the labels of the points
+
+        The starts are first classed by their angles, then repeatedly by their class and the classes of the
+        starts that a walk from them would enter next (Weisfeiler-Lehman refinement), until no class splits.
+        On a figure of uniform angles this keeps the starts at a few symmetric places instead of all of them.
+        """
+
+        starts = [(triangle, index) for triangle in a_component for index in range(3)]
+        following = {}
+        for triangle, index in starts:
+            points = triangle.get_points()
+            rotated = [points[(index + i) % 3] for i in range(3)]
+            following[(id(triangle), index)] = [edges.get((rotated[(i + 1) % 3], rotated[i])) for i in range(3)]
+
+        def ranked(signatures):
+            ranks = {signature: rank for rank, signature in enumerate(sorted(set(signatures.values())))}
+            return {start: ranks[signature] for start, signature in signatures.items()}, len(ranks)
+
+        classes, count = ranked({(id(triangle), index): tuple(keys[id(triangle)][(index + i) % 3] for i in range(3))
+                                 for triangle, index in starts})
+        while True:
+            signatures = {}
+            for start, neighbours in following.items():
+                signatures[start] = (classes[start],) + tuple(
+                    -1 if neighbour is None else classes[(id(neighbour[0]), neighbour[1])] for neighbour in neighbours)
+            refined, refined_count = ranked(signatures)
+            if refined_count == count:
+                break
+            classes, count = refined, refined_count
+
+        return [(triangle, index) for triangle, index in starts if classes[(id(triangle), index)] == 0]
+
+    @staticmethod
+    def _canonical_walk(a_component, edges, keys):
+        # Returns: the smallest (code, points in label order) over the candidate starts of a_component
+
+        best = None
+        for triangle, index in CanonicalForm._refined_starts(a_component, edges, keys):
+            walk = CanonicalForm._walk(triangle, index, edges, keys, best and best[0])
+            if walk is not None and (best is None or walk[0] < best[0]):
+                best = walk
+        return best
+
+    def digest(self, pairing=False):
+        # Returns: a hex key for the proof of self (with or without pairing)
+
+        return sha256(repr((self.code, bool(pairing))).encode('utf-8')).hexdigest()
+
+
+class ProofCache(object):
+    """
+    Intent: A persistent cache of proof outcomes, keyed by the canonical form of the figure, so that
+    figures equal up to relabelling and triangle order are proved once.
+
+    The cache is an SQLite database (':memory:' for a non-persistent one). Each entry stores the
+    outcome and the deduced angles in canonical labels. When there are more than max_entries entries,
+    the least recently used ones are evicted. Changes are committed by store_many() and close(),
+    once per batch rather than once per entry.
+    """
+
+    def __init__(self, a_path=':memory:', max_entries=100000):
+        self.max_entries = max_entries
+        self._connection = sqlite3.connect(a_path)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS proofs ('
+                                 'key TEXT PRIMARY KEY, outcome TEXT, angles TEXT, last_used INTEGER)')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS proofs_last_used ON proofs (last_used)')
+        self._clock = self._connection.execute('SELECT COALESCE(MAX(last_used), 0) FROM proofs').fetchone()[0]
+        # the number of entries, counted once here and then kept up to date by put()
+        self._count = self._connection.execute('SELECT COUNT(*) FROM proofs').fetchone()[0]
+        self.hits, self.misses = 0, 0
+
+    def close(self):
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self._count
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def get(self, a_key):
+        # Returns: (outcome, angles) stored under a_key, or None; the entry becomes the most recently used
+
+        row = self._connection.execute('SELECT outcome, angles FROM proofs WHERE key = ?', (a_key,)).fetchone()
+        if row is None:
+            return None
+        self._connection.execute('UPDATE proofs SET last_used = ? WHERE key = ?', (self._tick(), a_key))
+        return row[0], json.loads(row[1])
+
+    def put(self, a_key, an_outcome, some_angles):
+        # Postcondition: (an_outcome, some_angles) is stored under a_key, not yet committed;
+        #   least recently used entries beyond self.max_entries are evicted
+
+        if self._connection.execute('SELECT 1 FROM proofs WHERE key = ?', (a_key,)).fetchone() is None:
+            self._count += 1
+        self._connection.execute('INSERT OR REPLACE INTO proofs VALUES (?, ?, ?, ?)',
+                                 (a_key, an_outcome, json.dumps(some_angles), self._tick()))
+        excess = self._count - self.max_entries
+        if excess > 0:
+            self._count -= self._connection.execute('DELETE FROM proofs WHERE key IN '
+                                                    '(SELECT key FROM proofs ORDER BY last_used LIMIT ?)',
+                                                    (excess,)).rowcount
+
+    @staticmethod
+    def _angles_of(a_tf, a_form):
+        # Returns: the angles of a_tf in canonical labels: [[label, label, label, coefficients|None] ...]
+
+        angles = []
+        for triangle in a_tf.get_triangles():
+            for point in triangle.get_points():
+                angle = triangle.angle_of_point(point)
+                labels = [a_form.labels[p] for p in triangle.get_angle_points_by_point(point)]
+                coefficients = [str(c) for c in angle.get_coefficients()] if angle.is_known() else None
+                angles.append(labels + [coefficients])
+        return angles
+
+    @staticmethod
+    def _apply(a_tf, a_form, some_angles):
+        # Postcondition: the unknown angles of a_tf are set from some_angles (see _angles_of())
+
+        for l1, l2, l3, coefficients in some_angles:
+            if coefficients is None:
+                continue
+            angle_points = [a_form.points[l1], a_form.points[l2], a_form.points[l3]]
+            if not a_tf.get_angle_by_angle_points(*angle_points).is_known():
+                a_tf.set_angle_by_angle_points(*angle_points, Angle([Fraction(c) for c in coefficients]))
+
+    def lookup(self, a_tf, pairing=False, a_form=None):
+        """
+        PRE: a_form, if given, is the CanonicalForm of a_tf
+        Returns: EITHER the cached outcome of proving a_tf, whose deduced angles are then set in a_tf
+                 OR None if a_tf (up to relabelling) is not in the cache
+        """
+
+        form = a_form or CanonicalForm(a_tf)
+        entry = self.get(form.digest(pairing))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        ProofCache._apply(a_tf, form, entry[1])
+        return entry[0]
+
+    def store(self, a_tf, an_outcome, pairing=False, a_form=None):
+        """
+        PRE: a_tf has been proved with an_outcome; a_form, if given, is the CanonicalForm of a_tf
+             before it was proved (the key of the entry)
+        """
+
+        form = a_form or CanonicalForm(a_tf)
+        self.put(form.digest(pairing), an_outcome, ProofCache._angles_of(a_tf, form))
+
+    def store_many(self, some_proofs, pairing=False):
+        """
+        Intent: store() of every (tf, outcome, form) of some_proofs, committed at once.
+        PRE: as store(), for every item; form may be None
+        """
+
+        for tf, outcome, form in some_proofs:
+            self.store(tf, outcome, pairing, form)
+        self._connection.commit()
+
+    def prove(self, a_tf, pairing=False):
+        """
+        Intent: run.prove() through the cache.
+        Returns: the outcome of proving a_tf; a_tf holds the deduced angles
+        """
+
+        form = CanonicalForm(a_tf)
+        outcome = self.lookup(a_tf, pairing, form)
+        if outcome is None:
+            outcome = prove(a_tf, pairing)
+            self.store(a_tf, outcome, pairing, form)
+        return outcome
@@ -0,0 +1,181 @@
+from collections import Counter
+from fractions import Fraction
+import json
+
+from geopar.angle_class import Angle
+from geopar.utilities import TraceError
+
+__author__ = 'satbek'
+
+
+class ProofTrace(object):
+    """
+    Intent: An append-only record of why every angle of a proof was deduced.
+
+    The trace is written to a text file, one JSON object per line, as the deductions happen,
+    so nothing but the current line is held in memory. The proof of a figure is:
+        {"figure": strong id of the figure before the proof, ...}      the header
+        {"step": n, "rule": "180"|"360"|"pairing", "at": point,
+         "premises": [angle points, ...], "results": [angle points, ...],
+         "angle": [coefficients]}                                       one line per deduction
+        {"outcome": outcome, "steps": number of steps}                 the footer
+    where angle points are the clockwise triples [p1, p2, p3] of an angle at p2
+    (see TriangulatedFigure.set_angle_by_angle_points()).
+
+    replay() checks a proof independently of the prover: every step must follow from its premises by its rule.
+    A file may hold several proofs one after another; see iter_proofs().
+    """
+
+    RULE_180 = '180'
+    RULE_360 = '360'
+    RULE_PAIRING = 'pairing'
+
+    def __init__(self, a_file):
+        # PRE: a_file is a text file open for writing (or appending)
+
+        self._file = a_file
+        self.steps = 0
+
+    def _write(self, a_record):
+        self._file.write(json.dumps(a_record, separators=(',', ':')) + '\n')
+
+    def begin(self, a_tf, **fields):
+        # Postcondition: the header of the proof of a_tf is written, with the given extra fields
+
+        self.steps = 0
+        record = {'figure': a_tf.get_id(strong=True)}
+        record.update(fields)
+        self._write(record)
+
+    def record(self, a_rule, a_point, premises, results, an_angle):
+        """
+        Intent: Writes one deduction: the angles with angle points results were set to an_angle
+                by a_rule at a_point, from the known angles with angle points premises.
+        """
+
+        self.steps += 1
+        self._write({
+            'step': self.steps,
+            'rule': a_rule,
+            'at': a_point,
+            'premises': [list(p) for p in premises],
+            'results': [list(p) for p in results],
+            'angle': [str(c) for c in an_angle.get_coefficients()],
+        })
+
+    def end(self, an_outcome):
+        # Postcondition: the footer of the current proof is written
+
+        self._write({'outcome': an_outcome, 'steps': self.steps})
+        self._file.flush()
+
+    @staticmethod
+    def iter_proofs(a_file):
+        """
+        PRE: a_file is a text file (or any iterable of lines) written by ProofTrace
+        Yields: (header, list of steps, footer) for every proof in a_file; footer is None
+                if the proof is incomplete
+        """
+
+        header, steps = None, []
+        for line in a_file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'figure' in record:
+                if header is not None:
+                    yield header, steps, None
+                header, steps = record, []
+            elif 'step' in record:
+                steps.append(record)
+            else:
+                yield header, steps, record
+                header, steps = None, []
+        if header is not None:
+            yield header, steps, None
+
+    @staticmethod
+    def _slot(a_tf, angle_points, a_step):
+        # Returns: the triangle of a_tf with an angle of angle points angle_points, in clockwise order
+
+        slot = a_tf.get_slot_by_angle_points(*angle_points)
+        if slot is not None and slot[0].get_angle_points_by_point(angle_points[1]) == list(angle_points):
+            return slot[0]
+        raise TraceError(a_step, 'no angle {} in the figure'.format(list(angle_points)))
+
+    @staticmethod
+    def _expected(a_tf, a_record, a_step):
+        # Returns: the angle that the rule of a_record deduces from its premises on a_tf
+        # Raises: TraceError if the rule does not apply exactly as a_record says
+
+        rule, point = a_record['rule'], a_record['at']
+        results = [tuple(p) for p in a_record['results']]
+        premises = [tuple(p) for p in a_record['premises']]
+        triangles = [ProofTrace._slot(a_tf, p, a_step) for p in results]
+
+        for p in results:
+            if a_tf.get_angle_by_angle_points(*p).is_known():
+                raise TraceError(a_step, 'angle {} is already known'.format(list(p)))
+        premise_angles = []
+        for p in premises:
+            angle = ProofTrace._slot(a_tf, p, a_step).angle_of_point(p[1])
+            if not angle.is_known():
+                raise TraceError(a_step, 'premise {} is unknown'.format(list(p)))
+            premise_angles.append(angle)
+
+        if rule == ProofTrace.RULE_180:
+            triangle = triangles[0]
+            others = {tuple(triangle.get_angle_points_by_point(q)) for q in triangle.get_points()} - set(results)
+            if len(results) != 1 or set(premises) != others:
+                raise TraceError(a_step, 'the 180 rule needs the 2 other angles of the triangle')
+            return 180 - sum(premise_angles)
+
+        if not a_tf.get_topology().is_interior(point):
+            raise TraceError(a_step, 'point {} is not an interior point'.format(point))
+        fan = a_tf.triangles_with_point(point)
+
+        if rule == ProofTrace.RULE_360:
+            others = {tuple(t.get_angle_points_by_point(point)) for t in fan} - set(results)
+            if len(results) != 1 or results[0][1] != point or set(premises) != others:
+                raise TraceError(a_step, 'the 360 rule needs the other angles at point {}'.format(point))
+            return 360 - sum(premise_angles)
+
+        if rule == ProofTrace.RULE_PAIRING:
+            following = [tuple(t.get_angle_points_by_point(t.point_following(point))) for t in fan]
+            preceding = [tuple(t.get_angle_points_by_point(t.point_preceding(point))) for t in fan]
+            if len(results) != 2 or any(p not in following + preceding for p in results) or \
+                    sorted(p in following for p in results) != [False, True]:
+                raise TraceError(a_step, 'pairing sets one following and one preceding angle at {}'.format(point))
+            if set(premises) != set(following + preceding) - set(results):
+                raise TraceError(a_step, 'pairing needs the other angles following and preceding {}'.format(point))
+
+            def known_angles(some_angle_points):
+                return Counter(a_tf.get_angle_by_angle_points(*p) for p in some_angle_points if p not in results)
+            if known_angles(following) != known_angles(preceding):
+                raise TraceError(a_step, 'the angles following and preceding {} do not pair up'.format(point))
+            return ((len(fan) - 2) * 180 - sum(premise_angles)) / 2
+
+        raise TraceError(a_step, 'unknown rule {!r}'.format(rule))
+
+    @staticmethod
+    def replay(a_tf, steps, a_header=None):
+        """
+        Intent: Checks a proof, step by step, and applies it to a_tf.
+
+        PRE: a_tf is the figure before the proof; steps are the steps of its trace (see iter_proofs())
+        POST: EITHER every step follows from its premises by its rule, the deduced angles are set in a_tf,
+              and the number of steps is returned
+              OR TraceError is raised at the first step that does not check
+        """
+
+        if a_header is not None and a_header['figure'] != a_tf.get_id(strong=True):
+            raise TraceError(0, 'the trace is not of this figure')
+
+        for number, record in enumerate(steps, start=1):
+            angle = Angle([Fraction(c) for c in record['angle']])
+            expected = ProofTrace._expected(a_tf, record, number)
+            if expected != angle:
+                raise TraceError(number, 'the {} rule gives {}, not {}'.format(record['rule'], expected, angle))
+            for angle_points in record['results']:
+                a_tf.set_angle_by_angle_points(*angle_points, angle)
+        return len(steps)
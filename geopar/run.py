@@ -1,8 +1,9 @@
-from geopar.triangulated_figure_class import TriangulatedFigure
-from geopar.triangle_class import Triangle
-from geopar.angle_class import Angle
 from geopar.tfvalidator import TFValidator
-from geopar.tfpreprocessor import TFPreprocessor
+from geopar.tfparser import TFParser
+from geopar.deduction_engine import DeductionEngine
+from geopar.variable_basis import VariableBasis
+from geopar.scaled_angle_class import ScaledAngle
+from geopar.utilities import InexactError
 
 """
 ISSUES:
@@ -11,140 +12,159 @@ ISSUES:
 
 __author__ = 'satbek'
 
+# Outcomes of prove()
+UNIQUE_CONSEQUENCE = '1B'        # all angles deduced by 180 and 360 rules, and the figure is valid
+INCONCLUSIVE_1 = 'INCONCLUSIVE (1)'  # all angles deduced by 180 and 360 rules, but the figure is not valid
+INCONCLUSIVE_NO_PAIRING = '1A'   # some angles unknown after 180 and 360 rules; pairing not applied
+CONSEQUENCE = '2'                # all angles deduced with pairing, and the figure is valid
+INCONCLUSIVE_2 = 'INCONCLUSIVE (2)'  # some angles unknown or the figure not valid after pairing
+
+MESSAGES = {
+    UNIQUE_CONSEQUENCE: '1B. UNIQUE ALL-ANGLE CONSEQUENCE OF THE PREMISES.',
+    INCONCLUSIVE_1: 'INCONCLUSIVE (1)',
+    INCONCLUSIVE_NO_PAIRING: '1A. INCONCLUSIVE',
+    CONSEQUENCE: '2. A CONSEQUENCE OF THE PREMISES.',
+    INCONCLUSIVE_2: 'INCONCLUSIVE (2)',
+}
+
 
 def parse_a_file(filename):
-    # (Opened): a file is opened
-    # AND number_of_triangles, figure instantiated
-    a_file = open('../inputs/' + filename)
+    # Returns: the first configuration in '../inputs/' + filename
 
-    # first line contains the number_of_triangles to read and dimension of Angle
-    line = a_file.readline()
-    line = line.split()
-    number_of_triangles = int(line[0])
-    dim = int(line[1])
+    with open('../inputs/' + filename) as a_file:
+        for _, figure in TFParser.iter_configurations(a_file):
+            return figure
 
-    # all read triangles will be added to figure
-    figure = TriangulatedFigure()
 
-    # (Parsed): parsing the input.txt
+def run_engine(figure, pairing=False, trace=None, fast=False):
+    """
+    Intent: DeductionEngine(figure, pairing, trace).run(); with fast, on ScaledAngles first.
 
-    # 'point1, point2, point3; angle1, angle2, angle3'
-    for i in range(number_of_triangles):
-        # line = ['point1, point2, point3', 'angle1, angle2, angle3']
-        line = a_file.readline().split(';')
+    The fast run works on a copy of figure with ScaledAngle angles and writes the angles it
+    deduced back into figure as exact Angles. If a step cannot be done exactly on the scaled
+    integers (InexactError), the exact engine resumes from there, so the result is the same.
+    """
 
-        # _points = [point1, point2, point3]
-        _points = list(map(int, line[0].split(',')))
+    if fast:
+        scaled = ScaledAngle.scaled_figure(figure, ScaledAngle.scale_of(figure))
+        try:
+            DeductionEngine(scaled, pairing=pairing, trace=trace).run()
+            return
+        except InexactError:
+            pass
+        finally:
+            ScaledAngle.unscale_into(scaled, figure)
+    DeductionEngine(figure, pairing=pairing, trace=trace).run()
 
-        # angles_str = ['angle1', 'angle2', 'angle3']
-        angles_str = list(map(str.strip, line[1].split(',')))
 
-        a1 = Angle.from_str(angles_str[0])
-        a2 = Angle.from_str(angles_str[1])
-        a3 = Angle.from_str(angles_str[2])
+def deduce(figure, trace=None, fast=False):
+    # Applies 180 and 360 rules to figure until no new angles deduced, recording them in trace (a ProofTrace) if given
+    # Returns: True if all angles of figure are known afterwards, False otherwise
 
-        _angles = [a1, a2, a3]
-        figure.add(Triangle(_points, _angles))
+    run_engine(figure, trace=trace, fast=fast)
+    return figure.all_angles_are_known()
 
-    return figure
 
+def conclude(figure, pairing, trace=None, fast=False):
+    """
+    PRE: deduce(figure) has been applied
+    Returns: the outcome of the proof of figure (one of the keys of MESSAGES);
+             pairing tells whether the pairing rule may be applied
+             and trace (a ProofTrace), if given, records the deductions
+    With fast, the deductions run on ScaledAngles (see run_engine()); the rules are always checked exactly.
+    """
+
+    # All angles known? 180, 360, and pairing valid?
+    if figure.all_angles_are_known():
+        return UNIQUE_CONSEQUENCE if TFValidator.all_rules(figure) else INCONCLUSIVE_1
+
+    if not pairing:
+        return INCONCLUSIVE_NO_PAIRING
+
+    # Apply pairing, 180, and 360 rules until no new angles deduced
+    run_engine(figure, pairing=True, trace=trace, fast=fast)
+    if figure.all_angles_are_known() and TFValidator.all_rules(figure):
+        return CONSEQUENCE
+    return INCONCLUSIVE_2
+
+
+def prove(figure, pairing=False, trace=None, reduce=False, fast=False):
+    """
+    Intent: Non-interactive proof of figure.
+    Returns: the outcome (one of the keys of MESSAGES); figure holds the deduced angles
+    trace, if given, is a ProofTrace that receives the whole proof (see ProofTrace.replay())
+    With reduce, the proof runs on angles projected onto the fewest variables (see VariableBasis);
+    with fast, the deductions run on scaled integers (see run_engine()).
+    Neither changes the outcome. trace cannot be used with reduce.
+    """
+
+    if reduce:
+        if trace is not None:
+            raise ValueError('A proof on projected angles cannot be traced.')
+        basis = VariableBasis(figure)
+        if basis.is_reducing():
+            projected = basis.project_figure(figure)
+            outcome = prove(projected, pairing, fast=fast)
+            basis.expand_into(projected, figure)
+            return outcome
+
+    if trace is not None:
+        trace.begin(figure, pairing=pairing)
+    deduce(figure, trace, fast)
+    outcome = conclude(figure, pairing, trace, fast)
+    if trace is not None:
+        trace.end(outcome)
+    return outcome
 
-def run(figure):
 
-    validator = TFValidator()
-    preprocessor = TFPreprocessor()
+def run(figure):
 
     # Apply 180 and 360 rules until no new angles deduced
-    state_before = figure.get_id()
-    preprocessor.theorem_1(figure)
-    preprocessor.theorem_2(figure)
-    state_after = figure.get_id()
-
-    while state_before != state_after:
-        state_before = figure.get_id()
-        preprocessor.theorem_1(figure)
-        preprocessor.theorem_2(figure)
-        state_after = figure.get_id()
-
-    # All angles known?
-    if figure.all_angles_are_known():
-        # 180, 360, and pairing valid?
-        if validator.all_rules(figure):
-            print("Pre-process complete.")
+    if deduce(figure):
+        outcome = conclude(figure, pairing=False)
+        print("Pre-process complete.")
+        if outcome == UNIQUE_CONSEQUENCE:
             print("Here is your triangulated figure:")
             print(figure)
-            print("1B. UNIQUE ALL-ANGLE CONSEQUENCE OF THE PREMISES.")
-
-        else:
-            print("Pre-process complete.")
-            print('INCONCLUSIVE (1)')
-    else:
-        # pairing wanted?
+        print(MESSAGES[outcome])
+        return
+
+    # pairing wanted?
+    print('-------------------------')
+    print('Before pairing:')
+    print('-------------------------')
+    print(figure)
+    user_input = input('Do you want angle pairing to be applied? (y/n): ')
+    print()
+
+    if user_input not in ('y', 'n'):
         print('-------------------------')
-        print('Before pairing:')
+        print("Pre-process incomplete.")
         print('-------------------------')
-        print(figure)
-        user_input = input('Do you want angle pairing to be applied? (y/n): ')
-        print()
-
-        if user_input == 'y':
-
-            # Apply pairing, 180, and 360 rules until no new angles deduced
-            state_before = figure.get_id()
-            preprocessor.theorem_3(figure)
-            preprocessor.theorem_1(figure)
-            preprocessor.theorem_2(figure)
-            state_after = figure.get_id()
-            while state_before != state_after:
-                state_before = figure.get_id()
-                preprocessor.theorem_3(figure)
-                preprocessor.theorem_1(figure)
-                preprocessor.theorem_2(figure)
-                state_after = figure.get_id()
-
-            # All angles known; 180, 360, and pairing valid?
-            if figure.all_angles_are_known() and validator.all_rules(figure):
-                print('-------------------------')
-                print("Pre-process complete.")
-                print('-------------------------')
-                print("2. A CONSEQUENCE OF THE PREMISES.")
-                print("Here is your triangulated figure:")
-                print(figure)
-            else:
-                print('-------------------------')
-                print("Pre-process complete.")
-                print('-------------------------')
-                print("INCONCLUSIVE (2)")
-                print("Here is your triangulated figure:")
-                print(figure)
-
-        elif user_input == 'n':
-            print('-------------------------')
-            print("Pre-process complete.")
-            print('-------------------------')
-            print('1A. INCONCLUSIVE')
-            print("Here is your triangulated figure:")
-            print(figure)
-
-        else:
-            print('-------------------------')
-            print("Pre-process incomplete.")
-            print('-------------------------')
-            print('BAD INPUT. RUN THE PROGRAM AGAIN. TYPE y OR n.')
+        print('BAD INPUT. RUN THE PROGRAM AGAIN. TYPE y OR n.')
+        return
 
-# "Pre-processing" stage
-triangulated_figure = parse_a_file('input.txt')
+    outcome = conclude(figure, pairing=user_input == 'y')
+    print('-------------------------')
+    print("Pre-process complete.")
+    print('-------------------------')
+    print(MESSAGES[outcome])
+    print("Here is your triangulated figure:")
+    print(figure)
 
 
-print('-------------------------')
-print('Before pre-processing:')
-print('-------------------------')
-print("Here is your triangulated figure:")
-print(triangulated_figure)
+if __name__ == '__main__':
+    # "Pre-processing" stage
+    triangulated_figure = parse_a_file('input.txt')
 
+    print('-------------------------')
+    print('Before pre-processing:')
+    print('-------------------------')
+    print("Here is your triangulated figure:")
+    print(triangulated_figure)
 
-print('-------------------------')
-print('Pre-process is running...')
-print('-------------------------')
+    print('-------------------------')
+    print('Pre-process is running...')
+    print('-------------------------')
 
-run(triangulated_figure)
+    run(triangulated_figure)
@@ -0,0 +1,160 @@
+from fractions import Fraction
+from math import gcd
+
+from geopar.angle_class import Angle
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.utilities import InexactError
+
+__author__ = 'satbek'
+
+
+class ScaledAngle(object):
+    """
+    The numeric fast path of Angle: the coefficients of the angle times one fixed scale,
+    shared by every angle of a figure, as a tuple of plain ints.
+
+    With a common scale, addition, subtraction, equality and hashing are integer operations
+    on tuples with no gcd, lcm or Fraction at all, and they are exact. Division is the only
+    operation that can leave the integers. The pairing rule halves a sum of paired angles,
+    which is even, so in practice it does not; if it ever did, InexactError is raised rather
+    than rounding, and the caller redoes the work with exact Angles.
+
+    Class Invariants:
+    1. self._numerators contains n ints; n = 0 denotes nothing is known about self
+    2. for n > 0, self denotes the angle whose coefficients are self._numerators[i] / self._scale
+    """
+
+    __slots__ = ('_numerators', '_scale', '_hash')
+
+    def __init__(self, numerators, a_scale):
+        self._numerators = tuple(numerators)
+        self._scale = a_scale
+        self._hash = None
+
+    @classmethod
+    def _from_ints(cls, numerators, a_scale):
+        result = cls.__new__(cls)
+        result._numerators, result._scale, result._hash = numerators, a_scale, None
+        return result
+
+    @staticmethod
+    def scale_of(a_tf):
+        # Returns: the least scale at which every known angle of a_tf has integer numerators
+
+        scale = 1
+        for triangle in a_tf.get_triangles():
+            for angle in triangle.get_angles():
+                for c in angle.get_coefficients():
+                    scale = scale // gcd(scale, c.denominator) * c.denominator
+        return scale
+
+    @classmethod
+    def from_angle(cls, an_angle, a_scale):
+        # PRE: every coefficient of an_angle times a_scale is an int
+        # Returns: the ScaledAngle at a_scale with the same value as an_angle
+
+        return cls._from_ints(tuple(c.numerator * (a_scale // c.denominator) for c in an_angle.get_coefficients()),
+                              a_scale)
+
+    def to_angle(self):
+        # Returns: the Angle with the same value as self
+
+        return Angle._from_fractions(tuple(Fraction(n, self._scale) for n in self._numerators))
+
+    @staticmethod
+    def scaled_figure(a_tf, a_scale):
+        # Returns: a new TriangulatedFigure with the points of a_tf and its angles as ScaledAngles at a_scale
+
+        return TriangulatedFigure([Triangle(list(t.get_points()),
+                                            [ScaledAngle.from_angle(a, a_scale) for a in t.get_angles()])
+                                   for t in a_tf.get_triangles()])
+
+    @staticmethod
+    def unscale_into(a_scaled_tf, a_tf):
+        """
+        PRE: a_scaled_tf is ScaledAngle.scaled_figure(a_tf, scale), with more angles known
+        POST: the angles known in a_scaled_tf but not in a_tf are set, as exact Angles, in a_tf
+        """
+
+        for triangle, scaled in zip(a_tf.get_triangles(), a_scaled_tf.get_triangles()):
+            for index, angle in enumerate(scaled.get_angles()):
+                if angle.is_known() and not triangle.get_angles()[index].is_known():
+                    triangle.set_angle_by_index(index, angle.to_angle())
+
+    def _numerators_of(self, an_angle):
+        # Returns: the numerators of an_angle (a ScaledAngle at the scale of self, or a number) at the scale of self
+
+        if isinstance(an_angle, ScaledAngle):
+            return an_angle._numerators
+        value = Fraction(an_angle) * self._scale
+        if value.denominator != 1:
+            raise InexactError('{} is not a multiple of 1/{}'.format(an_angle, self._scale))
+        return (0,) * (len(self._numerators) - 1) + (value.numerator,)
+
+    def __add__(self, an_angle):
+        return ScaledAngle._from_ints(tuple(a + b for a, b in zip(self._numerators, self._numerators_of(an_angle))),
+                                      self._scale)
+
+    def __radd__(self, an_angle):
+        return self + an_angle
+
+    def __neg__(self):
+        return ScaledAngle._from_ints(tuple(-a for a in self._numerators), self._scale)
+
+    def __sub__(self, an_angle):
+        return ScaledAngle._from_ints(tuple(a - b for a, b in zip(self._numerators, self._numerators_of(an_angle))),
+                                      self._scale)
+
+    def __rsub__(self, an_angle):
+        return -self + an_angle
+
+    def __mul__(self, an_int):
+        # PRE: an_int is an int
+
+        return ScaledAngle._from_ints(tuple(a * an_int for a in self._numerators), self._scale)
+
+    def __rmul__(self, an_int):
+        return self * an_int
+
+    def __truediv__(self, an_int):
+        """
+        PRE: an_int is a nonzero int
+        Returns: self / an_int
+        Raises: InexactError if a numerator is not divisible by an_int
+        """
+
+        if any(a % an_int for a in self._numerators):
+            raise InexactError('{} / {} leaves the scale 1/{}'.format(self, an_int, self._scale))
+        return ScaledAngle._from_ints(tuple(a // an_int for a in self._numerators), self._scale)
+
+    def __eq__(self, an_angle):
+        # ScaledAngles only compare with ScaledAngles of the same scale (their hash is not the hash of Angle)
+
+        if isinstance(an_angle, ScaledAngle):
+            return self._numerators == an_angle._numerators
+        return NotImplemented
+
+    def __ne__(self, an_angle):
+        result = self.__eq__(an_angle)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self._numerators)
+        return self._hash
+
+    def __str__(self):
+        return str(self.to_angle())
+
+    def __repr__(self):
+        return self.__str__()
+
+    def get_coefficients(self):
+        return tuple(Fraction(n, self._scale) for n in self._numerators)
+
+    def get_dimension(self):
+        return len(self._numerators)
+
+    def is_known(self):
+        return bool(self._numerators)
@@ -0,0 +1,171 @@
+from fractions import Fraction
+from heapq import heapify, heappop, heappush
+from math import gcd
+
+__author__ = 'satbek'
+
+
+class SparseEliminator(object):
+    """
+    Sparse, fraction-free exact elimination for the angle constraints of a triangulated figure.
+
+    The constraints of a figure are local: the 180-degree rule ties the three angles of a triangle,
+    the 360-degree and pairing rules tie the angles of one fan. Eliminating the unknowns in a
+    minimum-degree order of this (planar) interaction graph keeps the fill small, and eliminating
+    over the integers with the content of every row divided out keeps the numbers small,
+    where dense rational elimination blows up in both.
+
+    Equations are given as (coefficients, rhs): coefficients maps a variable to a non-zero Fraction,
+    rhs is a list of Fractions (one per angle coefficient); the equation reads
+    sum(coefficients[v] * v) = rhs.
+    """
+
+    @staticmethod
+    def minimum_degree_order(equations, number_of_variables):
+        """
+        Returns: a list of the variables 0 .. number_of_variables - 1, in a minimum-degree order
+                 of the graph in which two variables are adjacent when they share an equation
+        """
+
+        # (Graph): neighbours[v] = the variables sharing an equation with v
+        neighbours = [set() for _ in range(number_of_variables)]
+        for coefficients, _ in equations:
+            variables = list(coefficients)
+            for v in variables:
+                neighbours[v].update(variables)
+        for v in range(number_of_variables):
+            neighbours[v].discard(v)
+
+        # (Ordered): repeatedly take a variable of least degree, then connect its neighbours (fill)
+        heap = [(len(neighbours[v]), v) for v in range(number_of_variables)]
+        heapify(heap)
+        eliminated = [False] * number_of_variables
+        order = []
+        while heap:
+            degree, v = heappop(heap)
+            if eliminated[v] or degree != len(neighbours[v]):
+                continue
+            eliminated[v] = True
+            order.append(v)
+
+            adjacent = neighbours[v]
+            for u in adjacent:
+                neighbours[u].discard(v)
+                neighbours[u].update(w for w in adjacent if w != u)
+                heappush(heap, (len(neighbours[u]), u))
+            neighbours[v] = set()
+
+        return order
+
+    @staticmethod
+    def _to_integers(coefficients, rhs):
+        # Returns: (int coefficients, int rhs), a primitive integer multiple of the equation
+
+        denominator = 1
+        for value in list(coefficients.values()) + list(rhs):
+            denominator = denominator // gcd(denominator, value.denominator) * value.denominator
+        row = {v: int(c * denominator) for v, c in coefficients.items()}
+        return SparseEliminator._primitive(row, [int(r * denominator) for r in rhs])
+
+    @staticmethod
+    def _primitive(row, rhs):
+        # Returns: (row, rhs) divided by the gcd of all their entries (their content)
+
+        content = 0
+        for value in row.values():
+            content = gcd(content, value)
+            if content == 1:
+                return row, rhs
+        for value in rhs:
+            content = gcd(content, value)
+            if content == 1:
+                return row, rhs
+        if content > 1:
+            row = {v: c // content for v, c in row.items()}
+            rhs = [r // content for r in rhs]
+        return row, rhs
+
+    @staticmethod
+    def _combine(row, rhs, pivot, pivot_row, pivot_rhs):
+        """
+        Returns: the primitive part of pivot_row[pivot] * (row, rhs) - row[pivot] * (pivot_row, pivot_rhs),
+                 in which pivot does not occur
+        """
+
+        a, b = pivot_row[pivot], row[pivot]
+        result = {v: a * c for v, c in row.items() if v != pivot}
+        for v, c in pivot_row.items():
+            if v == pivot:
+                continue
+            value = result.get(v, 0) - b * c
+            if value:
+                result[v] = value
+            else:
+                result.pop(v, None)
+        return SparseEliminator._primitive(result, [a * r - b * s for r, s in zip(rhs, pivot_rhs)])
+
+    @staticmethod
+    def eliminate(equations, number_of_variables, order=None):
+        """
+        Intent: Sparse fraction-free Gauss-Jordan elimination of equations.
+
+        PRE: order is None or a permutation of the variables; None means SparseEliminator.minimum_degree_order()
+
+        Returns: (pivot_rows, consistent) where pivot_rows maps each pivot variable v to its
+            reduced row (coefficients, rhs) over Fractions, with coefficients[v] = 1 and no other
+            pivot variable, and consistent is False iff some equation reduces to 0 = non-zero
+        """
+
+        if order is None:
+            order = SparseEliminator.minimum_degree_order(equations, number_of_variables)
+
+        # (Active rows): integer rows not yet used as pivots; rows_with[v] = ids of active rows containing v
+        rows, consistent = {}, True
+        rows_with = [set() for _ in range(number_of_variables)]
+        for row_id, (coefficients, rhs) in enumerate(equations):
+            row, row_rhs = SparseEliminator._to_integers(coefficients, rhs)
+            if not row:
+                consistent = consistent and not any(row_rhs)
+                continue
+            rows[row_id] = (row, row_rhs)
+            for v in row:
+                rows_with[v].add(row_id)
+
+        # (Forward): eliminate the variables in order from all other active rows
+        pivots = []
+        for v in order:
+            if not rows_with[v]:
+                continue  # v is free
+            pivot_id = min(rows_with[v], key=lambda row_id: len(rows[row_id][0]))
+            pivot_row, pivot_rhs = rows.pop(pivot_id)
+            for u in pivot_row:
+                rows_with[u].discard(pivot_id)
+
+            for row_id in list(rows_with[v]):
+                row, rhs = rows[row_id]
+                for u in row:
+                    rows_with[u].discard(row_id)
+                row, rhs = SparseEliminator._combine(row, rhs, v, pivot_row, pivot_rhs)
+                if not row:
+                    del rows[row_id]
+                    consistent = consistent and not any(rhs)
+                    continue
+                rows[row_id] = (row, rhs)
+                for u in row:
+                    rows_with[u].add(row_id)
+
+            pivots.append((v, pivot_row, pivot_rhs))
+
+        # (Backward): a pivot row contains only later pivots and free variables;
+        # substituting the later pivot rows, already reduced, leaves one pivot per row
+        reduced = {}
+        for v, row, rhs in reversed(pivots):
+            for u in [u for u in row if u != v and u in reduced]:
+                row, rhs = SparseEliminator._combine(row, rhs, u, *reduced[u])
+            reduced[v] = (row, rhs)
+
+        pivot_rows = {}
+        for v, (row, rhs) in reduced.items():
+            a = row[v]
+            pivot_rows[v] = ({u: Fraction(c, a) for u, c in row.items()}, [Fraction(r, a) for r in rhs])
+        return pivot_rows, consistent
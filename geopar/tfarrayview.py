@@ -0,0 +1,130 @@
+from math import gcd
+
+from geopar.utilities import EmptyException
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only TFArrayView needs it
+    np = None
+
+__author__ = 'satbek'
+
+
+class TFArrayView(object):
+    """
+    Intent: An array-backed snapshot of the angles of a TriangulatedFigure, so that the rules of
+    180 and 360 degrees are checked for the whole figure by a few batched NumPy reductions
+    instead of Angle additions triangle by triangle.
+
+    The coefficients of all angles are stored as exact int64 numerators over one common
+    denominator. The view does not follow later changes of the figure; build a new one instead.
+
+    Class Invariants:
+    1. self.numerators has shape (n, 3, dim), n = number of triangles, dim = dimension of the angles
+    2. self.numerators[t, i] / self.denominator are the coefficients of the angle at
+       triangles[t].points[i] if self.known[t, i], and 0 otherwise
+    3. self.fan_slots[self.fan_offsets[k]:self.fan_offsets[k + 1]] are the flat slot indices
+       (3 * t + i) of the angles around the k-th interior point
+    4. every sum computed by the rules fits in int64
+    """
+
+    def __init__(self, a_tf):
+        """
+        PRE1: numpy is installed
+        PRE2: a_tf is a non-empty TriangulatedFigure whose known angles all have the same dimension
+        """
+
+        if np is None:
+            raise ImportError('TFArrayView requires numpy.')
+        if a_tf.is_empty():
+            raise EmptyException('A triangulated figure is empty! See precondition in TFArrayView.')
+
+        triangles = a_tf.get_triangles()
+        index_of_triangle = {id(triangle): t for t, triangle in enumerate(triangles)}
+
+        # (Collected): coefficients of every slot, None if unknown; the common denominator
+        slots = []
+        self.dim, self.denominator = 0, 1
+        for triangle in triangles:
+            for angle in triangle.get_angles():
+                if not angle.is_known():
+                    slots.append(None)
+                    continue
+                coefficients = angle.get_coefficients()
+                if self.dim and len(coefficients) != self.dim:
+                    raise ValueError('Angles of different dimensions: {} and {}.'.format(self.dim, len(coefficients)))
+                self.dim = len(coefficients)
+                for c in coefficients:
+                    self.denominator = self.denominator // gcd(self.denominator, c.denominator) * c.denominator
+                slots.append(coefficients)
+        self.dim = self.dim or 1
+
+        # (Fans): flat slot indices around each interior point
+        fan_slots, fan_offsets = [], [0]
+        for point in a_tf.get_topology().get_interior_points():
+            for triangle in a_tf.triangles_with_point(point):
+                fan_slots.append(3 * index_of_triangle[id(triangle)] + triangle.index_of_point(point))
+            fan_offsets.append(len(fan_slots))
+
+        # (Scaled): exact numerators over self.denominator, checked against int64 overflow
+        largest_sum = max([3] + [fan_offsets[k + 1] - fan_offsets[k] for k in range(len(fan_offsets) - 1)])
+        numerators = []
+        bound = 0
+        for coefficients in slots:
+            if coefficients is None:
+                numerators.append([0] * self.dim)
+                continue
+            row = [c.numerator * (self.denominator // c.denominator) for c in coefficients]
+            bound = max(bound, max(abs(x) for x in row))
+            numerators.append(row)
+        if (bound + 360 * self.denominator) * largest_sum >= 2 ** 63:
+            raise OverflowError('Angle coefficients are too large for int64 numerators.')
+
+        n = len(triangles)
+        self.numerators = np.array(numerators, dtype=np.int64).reshape((n, 3, self.dim))
+        self.known = np.array([coefficients is not None for coefficients in slots], dtype=bool).reshape((n, 3))
+        self.fan_slots = np.array(fan_slots, dtype=np.intp)
+        self.fan_offsets = np.array(fan_offsets, dtype=np.intp)
+
+    def _constant(self, a_value):
+        # Returns: the numerator vector of the constant angle a_value
+
+        target = np.zeros(self.dim, dtype=np.int64)
+        target[-1] = a_value * self.denominator
+        return target
+
+    def triangle_sums(self):
+        # Returns: array of shape (n, dim), the numerators of the angle sum of every triangle
+
+        return self.numerators.sum(axis=1)
+
+    def fan_sums(self):
+        # Returns: array of shape (number of interior points, dim),
+        #   the numerators of the angle sum around every interior point
+
+        if len(self.fan_slots) == 0:
+            return np.zeros((0, self.dim), dtype=np.int64)
+        flat = self.numerators.reshape((-1, self.dim))
+        return np.add.reduceat(flat[self.fan_slots], self.fan_offsets[:-1], axis=0)
+
+    def rule_180(self):
+        """
+        Returns: True if all angles are known and the angles of every triangle sum up to 180,
+                 False otherwise (as TFValidator.rule_180())
+        """
+
+        if not self.known.all():
+            return False
+        return bool((self.triangle_sums() == self._constant(180)).all())
+
+    def rule_360(self):
+        """
+        Returns: True if the angles around every interior point are known and sum up to 360,
+                 False otherwise (as TFValidator.rule_360())
+        """
+
+        if len(self.fan_slots) == 0:
+            return True
+        if not self.known.reshape(-1)[self.fan_slots].all():
+            return False
+        return bool((self.fan_sums() == self._constant(360)).all())
@@ -0,0 +1,240 @@
+from array import array
+from fractions import Fraction
+from math import gcd
+import mmap
+import struct
+import sys
+
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+
+__author__ = 'satbek'
+
+"""
+Binary figure library format (little-endian):
+
+    header:  magic b'GEOPAR\\x00\\x01', number of figures (uint64), offset of the offset table (uint64)
+    records: one per figure, each 8-byte aligned:
+        n (uint32), dim (uint32), number of vertices v (uint32), reserved (uint32)
+        vertex table          v       int64   the point numbers
+        numerators            3n*dim  int64   coefficients of the angle at slot 3t+i are
+        denominators          3n      int64     numerators[(3t+i)*dim:(3t+i+1)*dim] / denominators[3t+i]
+        triangle triples      3n      uint32  indices into the vertex table, clockwise
+        known mask            3n      uint8   0 for an unknown angle
+    offset table: number of figures uint64 offsets of the records
+"""
+
+MAGIC = b'GEOPAR\x00\x01'
+_HEADER = struct.Struct('<8sQQ')
+_RECORD_HEADER = struct.Struct('<IIII')
+_INT64_BOUND = 1 << 63
+
+# whether the numbers of this machine must be byte-swapped to and from the little-endian file
+_SWAP = sys.byteorder != 'little'
+
+
+def _from_file(a_view, a_format):
+    """
+    Returns: the little-endian bytes of a_view as numbers of a_format: a zero-copy memoryview
+             on little-endian machines, a byte-swapped array copy otherwise
+    """
+
+    if not _SWAP or array(a_format).itemsize == 1:
+        return a_view.cast(a_format)
+    numbers = array(a_format, a_view.tobytes())
+    numbers.byteswap()
+    return numbers
+
+
+def _padding(a_length):
+    return b'\x00' * (-a_length % 8)
+
+
+class FigureRecord(object):
+    """
+    Intent: One figure of a FigureLibrary, as zero-copy memoryviews into the mapped file
+    (byte-swapped copies on big-endian machines). The TriangulatedFigure is only built by to_figure().
+    """
+
+    def __init__(self, a_buffer, an_offset):
+        n, self.dim, v, _ = _RECORD_HEADER.unpack_from(a_buffer, an_offset)
+        self.number_of_triangles = n
+        position = an_offset + _RECORD_HEADER.size
+
+        def take(a_format, a_count, an_item_size):
+            nonlocal position
+            view = _from_file(a_buffer[position:position + a_count * an_item_size], a_format)
+            position += a_count * an_item_size
+            return view
+
+        self.vertices = take('q', v, 8)
+        self.numerators = take('q', 3 * n * self.dim, 8)
+        self.denominators = take('q', 3 * n, 8)
+        self.triples = take('I', 3 * n, 4)
+        self.known = take('B', 3 * n, 1)
+
+    def angle(self, a_slot):
+        # Returns: the Angle at slot a_slot = 3 * triangle index + index of the point in the triangle
+
+        if not self.known[a_slot]:
+            return Angle([])
+        denominator = self.denominators[a_slot]
+        start = a_slot * self.dim
+        return Angle([Fraction(n, denominator) for n in self.numerators[start:start + self.dim]])
+
+    def to_figure(self, a_figure_class=TriangulatedFigure):
+        # Returns: the figure stored in self, as an instance of a_figure_class (e.g., ArrayTriangulatedFigure)
+
+        triangles = []
+        for t in range(self.number_of_triangles):
+            points = [self.vertices[self.triples[3 * t + i]] for i in range(3)]
+            triangles.append(Triangle(points, [self.angle(3 * t + i) for i in range(3)]))
+        return a_figure_class(triangles)
+
+
+class FigureLibrary(object):
+    """
+    Intent: A read-only library of triangulated figures stored in the binary format above.
+
+    Opening a library maps the file and reads its header only, so it takes constant time
+    whatever the size of the file. Figures are decoded one at a time, on request, and the
+    mapped pages are shared between all processes that open the same file.
+
+    Usage:
+        FigureLibrary.write(path, figures)
+        with FigureLibrary(path) as library:
+            figure = library.figure(i)
+    """
+
+    def __init__(self, a_path):
+        self._file = open(a_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._map)
+        self._offsets = memoryview(b'').cast('Q')
+
+        magic, count, table_offset = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError('{} is not a figure library.'.format(a_path))
+        self._offsets = _from_file(self._buffer[table_offset:table_offset + 8 * count], 'Q')
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, an_index):
+        # Returns: the FigureRecord of the an_index-th figure
+
+        return FigureRecord(self._buffer, self._offsets[an_index])
+
+    def figure(self, an_index, a_figure_class=TriangulatedFigure):
+        # Returns: the an_index-th figure of self, as an instance of a_figure_class
+
+        return self[an_index].to_figure(a_figure_class)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.figure(index)
+
+    def close(self):
+        # Postcondition: the file is closed; the mapping is closed too unless FigureRecords
+        #   of self are still alive, in which case it is closed when they are collected
+
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._offsets = memoryview(b'').cast('Q')
+        try:
+            self._buffer.release()
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    @staticmethod
+    def encode(a_tf):
+        """
+        Returns: the bytes of the record of a_tf
+        PRE: the known angles of a_tf have the same dimension; every number fits in int64
+        Raises: ValueError if the triangles of a_tf are not all clockwise (see TFParser), as the workers
+                proving a library trust its figures
+        """
+
+        conflicts = a_tf.get_edge_index().get_conflicts()
+        if conflicts:
+            t1, t2, edge = conflicts[0]
+            raise ValueError('Triangles not all in clockwise order: triangles {} and {} both traverse the edge {} -> {}.'
+                             .format(t1, t2, *edge))
+
+        triangles = a_tf.get_triangles()
+        dim = 1
+        for triangle in triangles:
+            for angle in triangle.get_angles():
+                if angle.is_known():
+                    dim = angle.get_dimension()
+
+        vertex_index = {}
+        triples = array('I')
+        numerators, denominators, known = array('q'), array('q'), array('B')
+        for triangle in triangles:
+            for point in triangle.get_points():
+                triples.append(vertex_index.setdefault(point, len(vertex_index)))
+            for angle in triangle.get_angles():
+                coefficients = angle.get_coefficients()
+                if not coefficients:
+                    numerators.extend([0] * dim)
+                    denominators.append(1)
+                    known.append(0)
+                    continue
+                if len(coefficients) != dim:
+                    raise ValueError('Angles of different dimensions: {} and {}.'.format(dim, len(coefficients)))
+                denominator = 1
+                for c in coefficients:
+                    denominator = denominator // gcd(denominator, c.denominator) * c.denominator
+                row = [c.numerator * (denominator // c.denominator) for c in coefficients]
+                if denominator >= _INT64_BOUND or any(abs(x) >= _INT64_BOUND for x in row):
+                    raise OverflowError('An angle coefficient does not fit in int64.')
+                numerators.extend(row)
+                denominators.append(denominator)
+                known.append(1)
+
+        vertices = array('q', list(vertex_index))
+        if _SWAP:
+            for an_array in (vertices, numerators, denominators, triples):
+                an_array.byteswap()
+
+        parts = [_RECORD_HEADER.pack(len(triangles), dim, len(vertices), 0),
+                 vertices.tobytes(), numerators.tobytes(), denominators.tobytes(), triples.tobytes(), known.tobytes()]
+        record = b''.join(parts)
+        return record + _padding(len(record))
+
+    @staticmethod
+    def write(a_path, figures):
+        """
+        Intent: Writes figures to a new library file a_path.
+        PRE: figures is an iterable of TriangulatedFigure (e.g., a stream from TFParser.iter_file())
+        Returns: the number of figures written
+        """
+
+        offsets = array('Q')
+        with open(a_path, 'wb') as a_file:
+            a_file.write(_HEADER.pack(MAGIC, 0, 0))
+            position = _HEADER.size
+            for figure in figures:
+                record = FigureLibrary.encode(figure)
+                offsets.append(position)
+                a_file.write(record)
+                position += len(record)
+
+            if _SWAP:
+                offsets.byteswap()
+            a_file.write(offsets.tobytes())
+            a_file.seek(0)
+            a_file.write(_HEADER.pack(MAGIC, len(offsets), position))
+        return len(offsets)
@@ -0,0 +1,183 @@
+from fractions import Fraction
+
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+from geopar.utilities import GREEK_LETTERS, ParseError
+
+__author__ = 'satbek'
+
+
+class TFParser(object):
+    """
+    TFParser (Triangulated Figure Parser) - reads triangulated figures in the format of input.txt.
+
+    A file holds any number of configurations. Each starts with a header line 'n m'
+    (number of triangles, dimension of angles) followed by n triangle lines
+    'p1, p2, p3; a1, a2, a3'. Any other line between configurations (titles, links) is skipped.
+
+    Configurations are yielded one at a time, so memory stays bounded by the largest
+    configuration, whatever the size of the file. Malformed lines raise ParseError with their line number.
+    Equal angle strings (e.g., '0 1 0' or '-1/3 -1/3 -1/3 120') are parsed once and share one Angle,
+    which is safe because Angles are immutable.
+    """
+
+    # size of the read buffer of parse_file() and iter_file()
+    BUFFER_SIZE = 1 << 20
+
+    # the cache of parsed angle strings is cleared when it grows past this size
+    MAX_INTERNED = 1 << 14
+
+    # at most this many pairs of mis-ordered triangles are listed in a ParseError
+    MAX_REPORTED = 5
+
+    @staticmethod
+    def is_header(a_line):
+        # Returns: whether or not a_line is a configuration header 'n m'
+
+        fields = a_line.split()
+        return len(fields) == 2 and all(field.isdigit() for field in fields)
+
+    @staticmethod
+    def parse_angle(a_string, a_dimension, a_line_number):
+        """
+        PRE: a_string is 'x' or a_dimension numbers ('3', '-0.5', '1/3', ...) separated by spaces
+        Returns: the corresponding Angle
+        """
+
+        tokens = a_string.split()
+        if tokens == ['x']:
+            return Angle([])
+        if len(tokens) != a_dimension:
+            raise ParseError(a_line_number, 'expected {} coefficients or x, got {!r}'.format(a_dimension, a_string))
+
+        coefficients = []
+        for token in tokens:
+            try:
+                coefficients.append(Fraction(int(token)))
+            except ValueError:
+                try:
+                    coefficients.append(Fraction(token))
+                except (ValueError, ZeroDivisionError):
+                    raise ParseError(a_line_number, 'bad coefficient {!r}'.format(token))
+        return Angle._from_fractions(tuple(coefficients))
+
+    @staticmethod
+    def parse_triangle(a_line, a_dimension=None, a_line_number=0, interned=None):
+        """
+        PRE: a_line is of the form 'p1, p2, p3; a1, a2, a3'
+        Returns: the corresponding Triangle
+        interned, if given, maps angle strings already parsed to their Angle
+        """
+
+        # line = ['point1, point2, point3', 'angle1, angle2, angle3']
+        line = a_line.split(';')
+        if len(line) != 2:
+            raise ParseError(a_line_number, "expected 'p1, p2, p3; a1, a2, a3', got {!r}".format(a_line.strip()))
+
+        # _points = [point1, point2, point3]
+        try:
+            _points = list(map(int, line[0].split(',')))
+        except ValueError:
+            raise ParseError(a_line_number, 'points must be integers: {!r}'.format(line[0].strip()))
+        if len(_points) != 3 or len(set(_points)) != 3 or min(_points) < 0:
+            raise ParseError(a_line_number, 'expected 3 distinct non-negative points, got {!r}'.format(line[0].strip()))
+
+        # angles_str = ['angle1', 'angle2', 'angle3']
+        angles_str = [' '.join(angle_str.split()) for angle_str in line[1].split(',')]
+        if len(angles_str) != 3:
+            raise ParseError(a_line_number, 'expected 3 angles, got {!r}'.format(line[1].strip()))
+
+        _angles = []
+        for angle_str in angles_str:
+            angle = interned.get(angle_str) if interned is not None else None
+            if angle is None:
+                if a_dimension is None:
+                    a_dimension = len(angle_str.split())
+                angle = TFParser.parse_angle(angle_str, a_dimension, a_line_number)
+                if interned is not None:
+                    if len(interned) >= TFParser.MAX_INTERNED:
+                        interned.clear()
+                    interned[angle_str] = angle
+            elif angle.is_known() and a_dimension is not None and angle.get_dimension() != a_dimension:
+                raise ParseError(a_line_number, 'expected {} coefficients or x, got {!r}'.format(a_dimension, angle_str))
+            _angles.append(angle)
+
+        return Triangle(_points, _angles)
+
+    @staticmethod
+    def iter_configurations(a_file, a_figure_class=TriangulatedFigure):
+        """
+        Intent: Streams the configurations of a_file one at a time.
+
+        PRE: a_file is an open text file (or any iterable of lines) in the format of input.txt
+        Yields: (line number of the header, TriangulatedFigure) for every configuration in a_file;
+                the figures are instances of a_figure_class (e.g., ArrayTriangulatedFigure)
+        Raises: ParseError at the first malformed line of a configuration, or at the first triangle
+                that traverses a shared edge in the same direction as an earlier one (not clockwise)
+        """
+
+        interned = {}
+        lines = enumerate(a_file, start=1)
+        for line_number, line in lines:
+            if not TFParser.is_header(line):
+                continue
+
+            number_of_triangles, dimension = map(int, line.split())
+            if number_of_triangles == 0:
+                raise ParseError(line_number, 'a configuration needs at least one triangle')
+            if not 1 <= dimension <= len(GREEK_LETTERS):
+                raise ParseError(line_number, 'dimension must be between 1 and {}'.format(len(GREEK_LETTERS)))
+
+            figure = a_figure_class()
+            point_sets = set()
+            line_numbers = []
+            triangle_line_number = line_number
+            for _ in range(number_of_triangles):
+                triangle_line_number, triangle_line = next(lines, (triangle_line_number + 1, None))
+                if triangle_line is None:
+                    raise ParseError(triangle_line_number, 'end of file: expected {} triangles after line {}'
+                                     .format(number_of_triangles, line_number))
+
+                triangle = TFParser.parse_triangle(triangle_line, dimension, triangle_line_number, interned)
+                point_set = frozenset(triangle.get_points())
+                if point_set in point_sets:
+                    raise ParseError(triangle_line_number, 'duplicate triangle {}'.format(sorted(point_set)))
+                point_sets.add(point_set)
+                try:
+                    figure.add(triangle)
+                except ValueError as e:
+                    # a figure_class with bounded storage (ArrayTriangulatedFigure) rejects what it cannot hold
+                    raise ParseError(triangle_line_number, str(e))
+                line_numbers.append(triangle_line_number)
+
+            # (Oriented): triangles sharing an edge traverse it in opposite directions, i.e. all are clockwise;
+            #   otherwise the fans of their points are wrong. One pass over the edge index: O(n)
+            conflicts = figure.get_edge_index().get_conflicts()
+            if conflicts:
+                reported = ['lines {} and {} both traverse the edge {} -> {}'.format(
+                    line_numbers[t1], line_numbers[t2], *edge) for t1, t2, edge in conflicts[:TFParser.MAX_REPORTED]]
+                if len(conflicts) > TFParser.MAX_REPORTED:
+                    reported.append('{} more'.format(len(conflicts) - TFParser.MAX_REPORTED))
+                raise ParseError(line_numbers[conflicts[0][1]],
+                                 'triangles not all in clockwise order: ' + '; '.join(reported))
+            yield line_number, figure
+
+    @staticmethod
+    def iter_file(a_path, a_figure_class=TriangulatedFigure):
+        """
+        Yields: (line number, a_figure_class instance) for every configuration in the file a_path,
+                reading it through a large buffer
+        """
+
+        with open(a_path, buffering=TFParser.BUFFER_SIZE) as a_file:
+            for configuration in TFParser.iter_configurations(a_file, a_figure_class):
+                yield configuration
+
+    @staticmethod
+    def parse_file(a_path):
+        """
+        Returns: the list of (line number, TriangulatedFigure) of all configurations in the file a_path
+        """
+
+        return list(TFParser.iter_file(a_path))
@@ -1,6 +1,7 @@
 from geopar.triangulated_figure_class import TriangulatedFigure
 from geopar.triangle_class import Triangle
 from geopar.angle_class import Angle
+from geopar.tfsolver import TFSolver
 from collections import Counter
 
 __author__ = 'satbek'
@@ -15,6 +16,9 @@ class TFPreprocessor(object):
     - Theorem 2: 360-degree rule;
     - Theorem 3: Pairing rule.
 
+    theorem_linear() applies the 180-degree, 360-degree and, optionally, pairing rules
+    all at once, as one exact linear system (see TFSolver).
+
     For more information on these theorems, please refer to the paper.
     """
 
@@ -32,7 +36,7 @@ class TFPreprocessor(object):
         """
 
         for triangle in a_tf.get_triangles():
-            if triangle.count_known() == 2:
+            if triangle.number_of_known() == 2:
                 triangle.complete_unknown_angle()
 
     @staticmethod
@@ -53,53 +57,91 @@ class TFPreprocessor(object):
         POST: !!!
         """
 
-        for point in a_tf.get_interior_points():
+        for point in a_tf.get_topology().get_interior_points():
             a_tf.complete_unknown_angle_at(point)
 
     @staticmethod
     def theorem_3(a_tf):
+        """
+        Implementation of pairing rule.
+
+        PRE: isinstance(a_tf, TriangulatedFigure) is True.
+        POST: pair_angles_at() has been applied at every interior point of a_tf.
+        """
+
         # traversing through interior points
-        for point in a_tf.get_interior_points():
-
-            # triangles around interior point
-            triangles = a_tf.triangles_with_point(point)
-
-            angle_following_list = []
-            angle_preceding_list = []
-
-            unknown_following_count = 0
-            unknown_preceding_count = 0
-            sum_angles = 0
-
-            points_of_unknown_angles = []
-
-            # traverse through triangles around interior point
-            for t in triangles:
-                point_following = t.point_following(point)
-                point_preceding = t.point_preceding(point)
-
-                angle_following = t.angle_of_point(point_following)
-                angle_preceding = t.angle_of_point(point_preceding)
-
-                if angle_following.is_known():
-                    angle_following_list.append(angle_following)
-                if angle_preceding.is_known():
-                    angle_preceding_list.append(angle_preceding)
-
-                if not angle_following.is_known():
-                    unknown_following_count += 1
-                    points_of_unknown_angles.append(t.get_angle_points_by_point(point_following))
-                else:
-                    sum_angles += angle_following
-
-                if not angle_preceding.is_known():
-                    unknown_preceding_count += 1
-                    points_of_unknown_angles.append(t.get_angle_points_by_point(point_preceding))
-                else:
-                    sum_angles += angle_preceding
-
-            if unknown_following_count == 1 and unknown_following_count == 1 and \
-                    Counter(angle_following_list) == Counter(angle_preceding_list):
-                angle_to_set = ((len(triangles) - 2) * 180 - sum_angles) / 2
-                a_tf.set_angle_by_angle_points(*points_of_unknown_angles[0], angle_to_set)
-                a_tf.set_angle_by_angle_points(*points_of_unknown_angles[1], angle_to_set)
+        for point in a_tf.get_topology().get_interior_points():
+            TFPreprocessor.pair_angles_at(a_tf, point)
+
+    @staticmethod
+    def pair_angles_at(a_tf, point):
+        """
+        Applies the pairing rule around the interior point point of a_tf.
+
+        PRE: point is an interior point of a_tf
+        POST: EITHER the known angles following and preceding point pair up, exactly one angle
+              of each kind is unknown, both are set to their common value,
+              and the list of their angle points is returned
+              OR nothing is done and [] is returned
+        """
+
+        # triangles around interior point
+        triangles = a_tf.triangles_with_point(point)
+
+        angle_following_list = []
+        angle_preceding_list = []
+
+        unknown_following_count = 0
+        unknown_preceding_count = 0
+        sum_angles = 0
+
+        points_of_unknown_angles = []
+
+        # traverse through triangles around interior point
+        for t in triangles:
+            point_following = t.point_following(point)
+            point_preceding = t.point_preceding(point)
+
+            angle_following = t.angle_of_point(point_following)
+            angle_preceding = t.angle_of_point(point_preceding)
+
+            if angle_following.is_known():
+                angle_following_list.append(angle_following)
+            if angle_preceding.is_known():
+                angle_preceding_list.append(angle_preceding)
+
+            if not angle_following.is_known():
+                unknown_following_count += 1
+                points_of_unknown_angles.append(t.get_angle_points_by_point(point_following))
+            else:
+                sum_angles += angle_following
+
+            if not angle_preceding.is_known():
+                unknown_preceding_count += 1
+                points_of_unknown_angles.append(t.get_angle_points_by_point(point_preceding))
+            else:
+                sum_angles += angle_preceding
+
+        if unknown_following_count == 1 and unknown_preceding_count == 1 and \
+                Counter(angle_following_list) == Counter(angle_preceding_list):
+            angle_to_set = ((len(triangles) - 2) * 180 - sum_angles) / 2
+            a_tf.set_angle_by_angle_points(*points_of_unknown_angles[0], angle_to_set)
+            a_tf.set_angle_by_angle_points(*points_of_unknown_angles[1], angle_to_set)
+            return points_of_unknown_angles
+
+        return []
+
+    @staticmethod
+    def theorem_linear(a_tf, pairing=False):
+        """
+        Completes every unknown angle of a_tf that the linear system of the rules determines.
+
+        PRE: isinstance(a_tf, TriangulatedFigure) is True.
+        POST: EITHER the rules are inconsistent on a_tf, nothing is done and -1 is returned
+              OR every determined unknown angle of a_tf is set and their number is returned
+        """
+
+        report = TFSolver.solve(a_tf, pairing)
+        if not report.is_consistent():
+            return -1
+        return report.apply()
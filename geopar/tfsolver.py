@@ -0,0 +1,169 @@
+from collections import Counter
+from fractions import Fraction
+
+from geopar.angle_class import Angle
+from geopar.sparse_elimination import SparseEliminator
+
+__author__ = 'satbek'
+
+
+class SolverReport(object):
+    """
+    Intent: The outcome of TFSolver.solve() on a triangulated figure.
+
+    Class Invariants:
+    1. self.statuses maps the angle points (a tuple, clockwise) of every unknown angle of
+       self.figure to one of TFSolver.DETERMINED, TFSolver.UNDERDETERMINED, TFSolver.INCONSISTENT
+    2. self.values maps the angle points of every DETERMINED angle to its value (an Angle)
+    3. self.status is INCONSISTENT if the constraints have no solution,
+       DETERMINED if every unknown angle is determined, and UNDERDETERMINED otherwise
+    """
+
+    def __init__(self, a_tf, statuses, values, status):
+        self.figure = a_tf
+        self.statuses = statuses
+        self.values = values
+        self.status = status
+
+    def is_consistent(self):
+        return self.status != TFSolver.INCONSISTENT
+
+    def apply(self):
+        """
+        Intent: Writes the determined angles into self.figure.
+        Returns: the number of angles set
+        """
+
+        for angle_points, value in self.values.items():
+            self.figure.set_angle_by_angle_points(*angle_points, value)
+        return len(self.values)
+
+
+class TFSolver(object):
+    """
+    TFSolver (Triangulated Figure Solver) - deduces all unknown angles of a figure at once.
+
+    The 180-degree rule of every triangle, the 360-degree rule of every interior point and,
+    optionally, the pairing rule are written as one linear system whose variables are the
+    unknown angle slots. The pairing rule applies where TFPreprocessor.pair_angles_at() would:
+    at an interior point whose known following and preceding angles pair up, with exactly one
+    unknown angle of each kind, it contributes the equation x_following = x_preceding.
+    As solving makes more angles known, more points may qualify, so with pairing the system is
+    solved again, with the angles determined so far as known, until no more are determined.
+
+    The right-hand sides are angles, i.e., vectors of coefficients, so the system is solved
+    exactly over the rationals for all coefficients at once, by SparseEliminator.
+    """
+
+    DETERMINED = 'determined'
+    UNDERDETERMINED = 'underdetermined'
+    INCONSISTENT = 'inconsistent'
+
+    @staticmethod
+    def solve(a_tf, pairing=False):
+        """
+        PRE: a_tf is a TriangulatedFigure whose known angles all have the same dimension
+        POST: a SolverReport on the unknown angles of a_tf is returned; a_tf is not changed
+        """
+
+        assumed = {}
+        while True:
+            variables, equations, dim = TFSolver.build_system(a_tf, pairing, assumed)
+            pivot_rows, consistent = SparseEliminator.eliminate(equations, len(variables))
+            determined = {angle_points: Angle(pivot_rows[var][1]) for var, angle_points in enumerate(variables)
+                          if consistent and var in pivot_rows and len(pivot_rows[var][0]) == 1}
+            # without pairing, the system does not change as angles become known
+            if not pairing or not determined or len(determined) == len(variables):
+                break
+            assumed.update(determined)
+
+        values = {**assumed, **determined} if consistent else {}
+        statuses = {}
+        for angle_points in list(assumed) + variables:
+            if not consistent:
+                statuses[angle_points] = TFSolver.INCONSISTENT
+            elif angle_points in values:
+                statuses[angle_points] = TFSolver.DETERMINED
+            else:
+                statuses[angle_points] = TFSolver.UNDERDETERMINED
+
+        if not consistent:
+            status = TFSolver.INCONSISTENT
+        elif len(values) == len(statuses):
+            status = TFSolver.DETERMINED
+        else:
+            status = TFSolver.UNDERDETERMINED
+        return SolverReport(a_tf, statuses, values, status)
+
+    @staticmethod
+    def build_system(a_tf, pairing=False, assumed=None):
+        """
+        PRE: assumed, if given, maps the angle points of unknown angles of a_tf to values taken as known
+        Returns: (variables, equations, dim) where
+            variables[v] is the tuple of angle points of the v-th unknown angle of a_tf not in assumed,
+            equations is a list of (coefficients, rhs): coefficients maps variable v to a
+            non-zero Fraction, rhs is a list of dim Fractions, and the equation reads
+            sum(coefficients[v] * variables[v]) = rhs
+        """
+
+        dim = 1
+        for triangle in a_tf.get_triangles():
+            for angle in triangle.get_angles():
+                if angle.is_known():
+                    dim = angle.get_dimension()
+
+        assumed = assumed or {}
+        variables, variable_of, value_of = [], {}, {}
+        for triangle in a_tf.get_triangles():
+            for point in triangle.get_points():
+                if not triangle.angle_of_point(point).is_known():
+                    angle_points = tuple(triangle.get_angle_points_by_point(point))
+                    if angle_points in assumed:
+                        value_of[(id(triangle), point)] = assumed[angle_points]
+                    else:
+                        variable_of[(id(triangle), point)] = len(variables)
+                        variables.append(angle_points)
+
+        def angle_of(triangle, point):
+            # Returns: the angle of triangle at point, with the assumed values; unknown if it is a variable
+            value = value_of.get((id(triangle), point))
+            return triangle.angle_of_point(point) if value is None else value
+
+        def equation(terms, constant):
+            # terms: (sign, triangle, point); Returns: the equation sum(sign * angle) = constant
+            coefficients = {}
+            rhs = [Fraction(0)] * (dim - 1) + [Fraction(constant)]
+            for sign, triangle, point in terms:
+                angle = angle_of(triangle, point)
+                if angle.is_known():
+                    rhs = [r - sign * c for r, c in zip(rhs, angle.get_coefficients())]
+                else:
+                    var = variable_of[(id(triangle), point)]
+                    coefficients[var] = coefficients.get(var, 0) + sign
+                    if coefficients[var] == 0:
+                        del coefficients[var]
+            return {var: Fraction(c) for var, c in coefficients.items()}, rhs
+
+        # 180-degree rule
+        equations = []
+        for triangle in a_tf.get_triangles():
+            equations.append(equation([(1, triangle, point) for point in triangle.get_points()], 180))
+
+        for point in a_tf.get_topology().get_interior_points():
+            fan = a_tf.triangles_with_point(point)
+
+            # 360-degree rule
+            equations.append(equation([(1, triangle, point) for triangle in fan], 360))
+
+            # pairing rule, where it applies (see TFPreprocessor.pair_angles_at()): x_following = x_preceding
+            if pairing:
+                following = [(triangle, triangle.point_following(point)) for triangle in fan]
+                preceding = [(triangle, triangle.point_preceding(point)) for triangle in fan]
+                unknown_following = [slot for slot in following if not angle_of(*slot).is_known()]
+                unknown_preceding = [slot for slot in preceding if not angle_of(*slot).is_known()]
+                if len(unknown_following) == 1 and len(unknown_preceding) == 1 and \
+                        Counter(angle_of(*slot) for slot in following if angle_of(*slot).is_known()) == \
+                        Counter(angle_of(*slot) for slot in preceding if angle_of(*slot).is_known()):
+                    equations.append(equation([(1,) + unknown_following[0], (-1,) + unknown_preceding[0]], 0))
+
+        return variables, equations, dim
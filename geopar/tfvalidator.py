@@ -1,5 +1,8 @@
 from collections import Counter
 
+from geopar.utilities import EmptyException
+from geopar.tfsolver import TFSolver
+
 __author__ = 'satbek'
 
 
@@ -89,7 +92,7 @@ class TFValidator(object):
         # === 3 (Sum checked): sum_angles != 360
         # === 4 (Complement): i == len(points)
 
-        points = a_tf.get_interior_points()
+        points = a_tf.get_topology().get_interior_points()
 
         # a_tf has no interior points
         if not points:
@@ -134,7 +137,7 @@ class TFValidator(object):
             ########################################################################
 
         following, preceding = [], []
-        for point in a_tf.get_interior_points():
+        for point in a_tf.get_topology().get_interior_points():
             for tri in a_tf.triangles_with_point(point):
                 following.append(tri.angle_of_point(tri.point_following(point)))
                 preceding.append(tri.angle_of_point(tri.point_preceding(point)))
@@ -144,6 +147,24 @@ class TFValidator(object):
 
         return True
 
+    @staticmethod
+    def rules_consistent(a_tf, pairing=False):
+        """
+        Checks whether the rules of 180 and 360 degrees (and, if pairing, the rule of pairing
+        where it applies, see TFSolver) can all hold in a_tf, whose angles need not all be known.
+
+        PRE
+        a_tf is an instance of TriangulatedFigure class containing at least one triangle.
+
+        POST
+        True is returned if some values of the unknown angles satisfy the rules, False otherwise.
+        """
+
+        if a_tf.is_empty():
+            raise EmptyException('A triangulated figure is empty! See precondition in TFValidator.rules_consistent().')
+
+        return TFSolver.solve(a_tf, pairing).is_consistent()
+
     @staticmethod
     def all_rules(a_tf):
         return TFValidator.rule_180(a_tf) and TFValidator.rule_360(a_tf) and TFValidator.rule_pairing(a_tf)
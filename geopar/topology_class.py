@@ -0,0 +1,54 @@
+__author__ = 'satbek'
+
+
+class FigureTopology:
+    """
+    Intent: The interior and boundary points of a TriangulatedFigure, worked out once.
+
+    A point is interior when the triangles containing it close up around it,
+    i.e., its clockwise fan is a cycle of more than 2 triangles. Every other point is a boundary point.
+
+    The angles of a figure change during preprocessing, but its topology does not,
+    so a FigureTopology stays valid until a triangle is added to the figure.
+
+    Class Invariants:
+    1. self.interior_points and self.boundary_points partition the points of the figure
+    2. every point in self.interior_points has a closed fan of more than 2 triangles
+    """
+
+    def __init__(self, a_tf):
+        """
+        PRE: a_tf is a TriangulatedFigure
+        POST: self.interior_points|self.boundary_points are the interior|boundary points of a_tf
+        """
+
+        self.interior_points = []
+        self.boundary_points = []
+
+        for point in a_tf.get_points():
+            if FigureTopology._fan_is_closed(point, a_tf.triangles_with_point(point)):
+                self.interior_points.append(point)
+            else:
+                self.boundary_points.append(point)
+
+        self._interior_set = frozenset(self.interior_points)
+
+    @staticmethod
+    def _fan_is_closed(a_point, a_fan):
+        # PRE: a_fan is the clockwise fan of a_point
+        # Returns: whether or not a_fan has more than 2 triangles and wraps around a_point
+
+        if len(a_fan) <= 2:
+            return False
+        return a_fan[-1].point_preceding(a_point) == a_fan[0].point_following(a_point)
+
+    def get_interior_points(self):
+        return self.interior_points
+
+    def get_boundary_points(self):
+        return self.boundary_points
+
+    def is_interior(self, a_point):
+        # Returns: whether or not a_point is an interior point
+
+        return a_point in self._interior_set
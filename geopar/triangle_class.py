@@ -1,3 +1,5 @@
+import weakref
+
 from geopar.angle_class import Angle
 
 __author__ = 'satbek'  # modified by Eric Braude
@@ -16,10 +18,16 @@ class Triangle:
     3. self.points is in clockwise order geometrically
     """
 
+    # the attributes below are the only ones, so that millions of triangles stay small
+    __slots__ = ('points', 'angles', '_index', '_following', '_preceding', '_known', '_observers')
+
+    # number of set bits of a 3-bit known-mask
+    _NUMBER_OF_KNOWN = (0, 1, 1, 2, 1, 2, 2, 3)
+
     def __init__(self, three_points, three_angles):
         """
         PRE1: three_points consists of three distinct non-negative integers
-        PRE2: three_angles consists of three Angle|int|float instances
+        PRE2: three_angles consists of three Angle|CompactAngle|int|float instances
 
         Postconditions:
         1. self.points|self.angles correspond to three_points|three_angles
@@ -31,18 +39,41 @@ class Triangle:
         for angle in three_angles:
             if isinstance(angle, (int, float)):
                 temp_3_angles.append(Angle([angle]))
-            if isinstance(angle, Angle):
+            else:
                 temp_3_angles.append(angle)
 
         self.points, self.angles = three_points, temp_3_angles
 
+        # point -> its index in self.points, and the points following and preceding it clockwise;
+        # self.points never changes, so these answer the per-point queries in O(1)
+        p0, p1, p2 = three_points
+        self._index = {p0: 0, p1: 1, p2: 2}
+        self._following = {p0: p1, p1: p2, p2: p0}
+        self._preceding = {p0: p2, p1: p0, p2: p1}
+
+        # bit i is set iff self.angles[i].is_known(); kept up to date by set_angle_by_index()
+        self._known = sum(1 << i for i, angle in enumerate(temp_3_angles) if angle.is_known())
+
+        # references to the callables notified as f(self, index, old_angle, new_angle) whenever an angle
+        #   of self is set (see add_observer()); a reference returns None once its observer is gone
+        self._observers = []
+
+    def add_observer(self, an_observer):
+        # Postcondition: an_observer(self, index, old_angle, new_angle) is called
+        #   every time self.angles[index] is set, for as long as an_observer is alive.
+        #   A bound method (e.g., of a TriangulatedFigure) is held weakly, so that a triangle shared by
+        #   discarded figures neither keeps them alive nor keeps notifying them
+
+        if hasattr(an_observer, '__self__'):
+            self._observers.append(weakref.WeakMethod(an_observer))
+        else:
+            self._observers.append(lambda: an_observer)
+
     def angle_of_point(self, a_point):
         # Precondition: a_point is in self.points
         # Returns: the element of self.angles corresponding to a_point
 
-        if a_point not in self.points:
-            raise Exception('There is no such point for this Triangle.')
-        return self.angles[self.points.index(a_point)]
+        return self.angles[self.index_of_point(a_point)]
 
     def complete_unknown_angle(self):
         """
@@ -62,7 +93,7 @@ class Triangle:
 
         for i in range(3):
             if not self.angles[i].is_known():
-                self.angles[i] = third
+                self.set_angle_by_index(i, third)
 
     def get_angles(self):
 
@@ -71,10 +102,7 @@ class Triangle:
     def get_angle_points_by_point(self, a_point):
         # Returns: the clockwise elts. of self.points for the angle at a_point
 
-        index_of_a_point = self.index_of_point(a_point)
-        shift = (index_of_a_point + 2) % 3
-        points = self.points[shift:] + self.points[:shift]
-        return points
+        return [self.point_preceding(a_point), a_point, self._following[a_point]]
 
     def get_points(self):
 
@@ -83,17 +111,18 @@ class Triangle:
     def has_point(self, a_point):
         # Returns: whether or not a_point is in self.points
 
-        return a_point in self.points
+        return a_point in self._index
 
     def has_all_points(self, three_points):
         # Returns: whether or not self.points is the same set as three_points
 
-        return set(self.points) == set(three_points)
+        return len(three_points) == 3 and all(p in self._index for p in three_points) and \
+            len(set(three_points)) == 3
 
     def has_unknown_angle(self):
         # Returns: whether or not is_known() is True for any element of self.angles
 
-        return self.number_of_known() != 3
+        return self._known != 7
 
     def __hash__(self):
         # Returns hash of self based on contents of self.angles
@@ -109,36 +138,34 @@ class Triangle:
         Precondition: a_point is in self.points
         Returns index of a_point in self.points
         """
-        if a_point not in self.points:
+
+        index = self._index.get(a_point)
+        if index is None:
             raise Exception('There is no such point for this Triangle.')
-        return self.get_points().index(a_point)
+        return index
 
     def number_of_known(self):
         # Returns: the number of angles in self satisfying is_known()
 
-        count = 0
-        for angle in self.angles:
-            if angle.is_known():
-                count += 1
-        return count
+        return Triangle._NUMBER_OF_KNOWN[self._known]
 
     def point_following(self, a_point):
         # Precondition: a_point is in self.points
         # Returns: the element of self.points that follows a_point clockwise
 
-        if a_point not in self.points:
+        point = self._following.get(a_point)
+        if point is None:
             raise Exception('There is no such point for this Triangle.')
-        index_of_a_point = self.points.index(a_point)
-        return self.points[(index_of_a_point + 1) % 3]
+        return point
 
     def point_preceding(self, a_point):
         # Precondition: a_point is in self.points
         # Returns: the element of self.points that precedes a_point clockwise
 
-        if a_point not in self.points:
+        point = self._preceding.get(a_point)
+        if point is None:
             raise Exception('There is no such point for this Triangle.')
-        index_of_a_point = self.points.index(a_point)
-        return self.points[(index_of_a_point - 1) % 3]
+        return point
 
     def set_angle_by_index(self, an_index, an_angle):
         # Precondition: an_index is either 0, 1, or 2
@@ -146,16 +173,31 @@ class Triangle:
 
         if an_index not in [0, 1, 2]:
             raise Exception('Bad index.')
+        if isinstance(an_angle, (int, float)):
+            an_angle = Angle([an_angle])
+
+        old_angle = self.angles[an_index]
         self.angles[an_index] = an_angle
+        if an_angle.is_known():
+            self._known |= 1 << an_index
+        else:
+            self._known &= ~(1 << an_index)
+        dead = False
+        for reference in self._observers:
+            observer = reference()
+            if observer is None:
+                dead = True
+            else:
+                observer(self, an_index, old_angle, an_angle)
+        if dead:
+            self._observers = [reference for reference in self._observers if reference() is not None]
 
     def set_angle_by_point(self, a_point, an_angle):
         # Precondition: a_point is in self.points
         # Postcondition: an_angle is the element of self.angles corr. to a_point
         # Known issue: change to return the angle?
 
-        if a_point not in self.points:
-            raise Exception('There is no such point for this Triangle.')
-        self.angles[self.index_of_point(a_point)] = an_angle
+        self.set_angle_by_index(self.index_of_point(a_point), an_angle)
 
     def __str__(self):
         # Returns: string representation of self.
@@ -1,4 +1,11 @@
+from fractions import Fraction
+from hashlib import sha256
+from math import gcd
+
 from geopar.angle_class import Angle
+from geopar.triangle_class import Triangle
+from geopar.topology_class import FigureTopology
+from geopar.edge_index import EdgeIndex
 
 __author__ = 'mostly satbek'
 
@@ -14,17 +21,71 @@ class TriangulatedFigure:
     def __init__(self, triangles=None):
         # the Triangle objects that make up self
 
+        self._triangles = []
+
+        # point -> Triangles of self containing that point, in order of addition
+        self._triangles_at = {}
+
+        # frozenset of the points of a triangle -> that Triangle of self
+        self._triangle_by_points = {}
+
+        # clockwise angle points (p1, p2, p3) -> (Triangle of self, index of p2 in it)
+        self._slot_by_angle_points = {}
+
+        # point -> cached result of triangles_with_point(); entries are dropped by add()
+        self._fans = {}
+
+        # EdgeIndex of the triangles of self; add() indexes each new triangle
+        self._edges = EdgeIndex()
+
+        # FigureTopology of self, computed on request; reset by add()
+        self._topology = None
+
+        # XOR of _slot_hash() over every angle slot of self; kept up to date by add() and
+        # by the Triangle observer _angle_changed()
+        self._fingerprint = 0
+
         if triangles:
-            self._triangles = triangles
-        else:
-            self._triangles = []
+            for triangle in triangles:
+                self.add(triangle)
+
+    def get_id(self, strong=False):
+        """
+        Returns the 'id' of self: EITHER an int fingerprint (strong is False)
+        OR a SHA-256 hex digest (strong is True) of the configuration of self.
+
+        Two triangulated figures with equivalent configurations have the same id,
+        whatever the order of their triangles or the rotation of their points.
+
+        The int fingerprint is maintained incrementally (O(1) per angle set), so it is free to call.
+        The strong id is computed in O(n log n); it is collision-resistant and
+        stable across runs, so it can be stored and compared between processes.
+        """
+
+        if not strong:
+            return self._fingerprint
 
-    def get_id(self):
-        # 'id' of a triangulated figure is an integer number (result of built-in hash() function)
-        # that is unique to every triangulated figure with different configurations.
-        # That is, two triangulated figures with equivalent configurations have the same states.
+        lines = []
+        for triangle in self.get_triangles():
+            lines.append(';'.join(
+                '{}:{}'.format(point, ' '.join(map(str, triangle.angle_of_point(point).get_coefficients())))
+                for point in sorted(triangle.get_points())))
+        lines.sort()
+        return sha256('\n'.join(lines).encode('utf-8')).hexdigest()
 
-        return hash(str(sorted(list(map(hash, self._triangles)))))
+    @staticmethod
+    def _slot_hash(a_triangle, an_index, an_angle):
+        # Returns: the Zobrist-style hash of an_angle sitting at a_triangle.points[an_index]
+
+        return hash((tuple(sorted(a_triangle.get_points())),
+                     a_triangle.get_points()[an_index],
+                     hash(an_angle)))
+
+    def _angle_changed(self, a_triangle, an_index, old_angle, new_angle):
+        # Triangle observer. Postcondition: self._fingerprint reflects new_angle instead of old_angle
+
+        self._fingerprint ^= self._slot_hash(a_triangle, an_index, old_angle)
+        self._fingerprint ^= self._slot_hash(a_triangle, an_index, new_angle)
 
     def add(self, a_triangle):
         # !!!
@@ -34,8 +95,57 @@ class TriangulatedFigure:
         #   a_triangle ... is not in self.triangles AND
         #   ... shares two vertices with a Triangle in old(self.triangles)
         # Postcondition: a_triangle is in self.triangles
+        #   AND the fans of the points of a_triangle are recomputed on next request
 
         self._triangles.append(a_triangle)
+        self._edges.add(a_triangle)
+        for point in a_triangle.get_points():
+            self._triangles_at.setdefault(point, []).append(a_triangle)
+            self._fans.pop(point, None)
+        self._topology = None
+
+        points = a_triangle.get_points()
+        self._triangle_by_points.setdefault(frozenset(points), a_triangle)
+        for index in range(3):
+            self._slot_by_angle_points.setdefault((points[index - 1], points[index], points[(index + 1) % 3]),
+                                                  (a_triangle, index))
+
+        for index, angle in enumerate(a_triangle.get_angles()):
+            self._fingerprint ^= self._slot_hash(a_triangle, index, angle)
+        a_triangle.add_observer(self._angle_changed)
+
+    def to_compact(self):
+        """
+        Returns a compact, picklable form of self made of tuples of ints only:
+        one (p1, p2, p3, a1, a2, a3) per triangle, where an angle is () if unknown and
+        (denominator, numerator_1, ..., numerator_m) otherwise.
+        """
+
+        def compact_angle(an_angle):
+            coefficients = an_angle.get_coefficients()
+            denominator = 1
+            for c in coefficients:
+                denominator = denominator // gcd(denominator, c.denominator) * c.denominator
+            if not coefficients:
+                return ()
+            return (denominator,) + tuple(c.numerator * (denominator // c.denominator) for c in coefficients)
+
+        return tuple(tuple(triangle.get_points()) + tuple(map(compact_angle, triangle.get_angles()))
+                     for triangle in self._triangles)
+
+    @classmethod
+    def from_compact(cls, compact):
+        """
+        Returns the TriangulatedFigure described by compact, the result of to_compact().
+        """
+
+        def angle_of(compact_angle):
+            if not compact_angle:
+                return Angle([])
+            denominator = compact_angle[0]
+            return Angle([Fraction(n, denominator) for n in compact_angle[1:]])
+
+        return cls([Triangle(list(t[:3]), [angle_of(a) for a in t[3:]]) for t in compact])
 
     def set_angle_by_angle_points(self, p1, p2, p3, angle_):
         """
@@ -62,12 +172,12 @@ class TriangulatedFigure:
         PRE3: angle_ is (Angle or int or float) instance
         PRE4: angle_ has the same dimensionality as any of known angles in self
 
-        POST: !!!
+        POST: the angle at p2 of the triangle with points p1, p2, p3 is angle_ (O(1), see get_slot_by_angle_points())
         """
 
-        for triangle in self._triangles:
-            if triangle.has_all_points([p1, p2, p3]):
-                triangle.set_angle_by_point(p2, angle_)
+        slot = self.get_slot_by_angle_points(p1, p2, p3)
+        if slot is not None:
+            slot[0].set_angle_by_index(slot[1], angle_)
 
     def get_angle_by_angle_points(self, p1, p2, p3):
         """
@@ -77,9 +187,26 @@ class TriangulatedFigure:
         PRE2: Points are in clockwise order
         """
 
-        for triangle in self._triangles:
-            if triangle.has_all_points([p1, p2, p3]):
-                return triangle.angle_of_point(p2)
+        slot = self.get_slot_by_angle_points(p1, p2, p3)
+        if slot is not None:
+            return slot[0].get_angles()[slot[1]]
+
+    def get_slot_by_angle_points(self, p1, p2, p3):
+        """
+        Returns (the triangle of self with points p1, p2, p3, the index of p2 in it),
+        or None if self has no such triangle.
+
+        Both indices are hashed and kept by add(): clockwise angle points are found in one lookup,
+        points in any other order by their set. So the cost is O(1) whatever the size of self.
+        """
+
+        slot = self._slot_by_angle_points.get((p1, p2, p3))
+        if slot is None:
+            triangle = self._triangle_by_points.get(frozenset((p1, p2, p3)))
+            if triangle is None or len({p1, p2, p3}) != 3:
+                return None
+            slot = (triangle, triangle.index_of_point(p2))
+        return slot
 
     def get_triangles(self):
         """
@@ -93,10 +220,7 @@ class TriangulatedFigure:
         Returns a set of all points that make up self.
         """
 
-        all_points = list()
-        for triangle in self._triangles:
-            all_points.extend(triangle.get_points())
-        return list(set(all_points))
+        return list(self._triangles_at)
 
     def __str__(self):
         """
@@ -104,7 +228,7 @@ class TriangulatedFigure:
         """
 
         return_str = ""
-        for current_triangle in self._triangles:
+        for current_triangle in self.get_triangles():
             return_str += str(current_triangle)
             return_str += "\n"
         return return_str
@@ -130,76 +254,103 @@ class TriangulatedFigure:
         """
         Returns the (contiguous) list of self.triangles containing a_point in clockwise order.
 
+        The fan of every point is computed once and cached until add() changes it,
+        so that repeated calls cost O(degree of a_point).
+
         PRE: At least one triangle in self.triangles contains a_point
         """
 
+        fan = self._fans.get(a_point)
+        if fan is None:
+            fan = self._order_fan(a_point)
+            self._fans[a_point] = fan
+        return list(fan)
+
+    def _order_fan(self, a_point):
+        """
+        Returns the triangles of self containing a_point in clockwise order.
+
+        Consecutive triangles t1, t2 of the result satisfy
+        t1.point_preceding(a_point) == t2.point_following(a_point), i.e. t2 is across the edge
+        of t1 into a_point, so the fan is walked edge by edge through self._edges.
+        Triangles that cannot be chained (malformed input) are appended at the end.
+        """
+
         # [Collected]: triangles_with_a_point =
         # the triangles in self.triangles containing a_point
-
-        triangles_with_a_point = []
-        for triangle in self._triangles:
-            if triangle.has_point(a_point):
-                triangles_with_a_point.append(triangle)
-
-        # (In Order): triangles_in_order is a non-empty sub-list of
-        # triangles_with_a_point, which is in clockwise order
-        # AND triangles_remaining = triangles_with_a_point\triangles_in_order
-
-        triangles_in_order = [triangles_with_a_point[0]]
-        triangles_remaining = triangles_with_a_point[1:]
-
-        while len(triangles_in_order) < len(triangles_with_a_point):
-            for triangle_ in triangles_remaining:
-                point_following = triangles_in_order[0].point_following(a_point)
-                if triangle_.point_preceding(a_point) == point_following:
-                    triangles_in_order.insert(0, triangle_)
-                    triangles_remaining.remove(triangle_)
-                    break
-                point_preceding = triangles_in_order[-1].point_preceding(a_point)
-                if triangle_.point_following(a_point) == point_preceding:
-                    triangles_in_order.append(triangle_)
-                    triangles_remaining.remove(triangle_)
-                    break
+        triangles_with_a_point = self._triangles_at[a_point]
+
+        # (In Order): triangles_in_order is a clockwise chain through
+        # triangles_with_a_point[0], walked forward and then backward
+        first = triangles_with_a_point[0]
+        triangles_in_order = [first]
+        seen = {id(first)}
+
+        triangle_ = self._edges.triangle_traversing(a_point, first.point_preceding(a_point))
+        while triangle_ is not None and id(triangle_) not in seen:
+            triangles_in_order.append(triangle_)
+            seen.add(id(triangle_))
+            triangle_ = self._edges.triangle_traversing(a_point, triangle_.point_preceding(a_point))
+
+        backward = []
+        triangle_ = self._edges.triangle_traversing(first.point_following(a_point), a_point)
+        while triangle_ is not None and id(triangle_) not in seen:
+            backward.append(triangle_)
+            seen.add(id(triangle_))
+            triangle_ = self._edges.triangle_traversing(triangle_.point_following(a_point), a_point)
+        backward.reverse()
+        triangles_in_order = backward + triangles_in_order
 
         # (Complement): len(triangles_in_order) = len(triangles_with_a_point)
+        for triangle_ in triangles_with_a_point:
+            if id(triangle_) not in seen:
+                triangles_in_order.append(triangle_)
         return triangles_in_order
 
-    def get_interior_points(self):
+    def get_edge_index(self):
+        """
+        Returns the EdgeIndex of self: which triangles share which edges, in which direction.
+        It is kept up to date by add(), so this costs nothing.
         """
-        Returns the list of interior points in self.
 
-        OBJECTIVES:
-         (Found 1a): found the points that have more than 2 triangles attached to them
-                     AND
-         (Found 1b): saved them in point_nums, alongside with number of triangles that they are in
-         (Found 2): found interior points
-         (Complement): returned interior_points
+        return self._edges
 
+    def check_invariants(self):
+        """
+        Returns the list of problems with class invariants 1 and 2 (and the clockwise order of
+        the triangles), found in time linear in the number of triangles; [] if there are none.
+        """
+
+        edges = self.get_edge_index()
+        problems = ['triangles {} and {} both traverse the edge {} -> {}'.format(
+            edges.triangles[t1].get_points(), edges.triangles[t2].get_points(), *edge)
+            for t1, t2, edge in edges.get_conflicts()]
+        problems += ['triangle {} shares no edge with another triangle'.format(edges.triangles[t].get_points())
+                     for t in edges.get_isolated()]
+        return problems
 
+    def get_topology(self):
+        """
+        Returns the FigureTopology of self, which is computed once and kept until add() is called.
         """
 
-        # (Found 1a)
-        all_points = self.get_points()
-        point_nums = []
-        for point in all_points:
-            n = len(self.triangles_with_point(point))
-            if n > 2:
-                # (Found 1b)
-                point_nums.append((point, n))
+        if self._topology is None:
+            self._topology = FigureTopology(self)
+        return self._topology
 
-        # (Found 2)
-        interior_points = []
-        for point_num in point_nums:
-            points = []
-            for triangle in self.get_triangles():
-                if triangle.has_point(point_num[0]):
-                    points.extend(triangle.get_points())
+    def get_interior_points(self):
+        """
+        Returns the list of interior points in self.
+        """
 
-            if len(set(points)) == point_num[1] + 1:
-                interior_points.append(point_num[0])
+        return list(self.get_topology().get_interior_points())
+
+    def get_boundary_points(self):
+        """
+        Returns the list of boundary (i.e., non-interior) points in self.
+        """
 
-        # (Complement): all interior points found
-        return interior_points
+        return list(self.get_topology().get_boundary_points())
 
     def number_of_unknown_angles_at(self, a_point):
         """
@@ -261,12 +412,16 @@ class TriangulatedFigure:
 
         PRE1: a_point is an interior point of a triangulated figure a_tf
         PRE2: there is exactly one unknown angle at a_point
-        POST: unknown angle (see PRE2) is computed
+        POST1: unknown angle (see PRE2) is computed
+        POST2: EITHER the angle points of the computed angle are returned
+               OR None is returned if PRE2 did not hold
         """
 
         # (Counted) unknowns_count contains the number of unknown angles at a_point
         # unknowns_count is used to keep PRE1 true
         unknowns_count = self.number_of_unknown_angles_at(a_point)
+        if unknowns_count != 1:
+            return None
 
         # (Summed up) angles_sum is a sum of known angles at a_point
         angles_sum = self.sum_of_known_angles_at(a_point)
@@ -274,7 +429,7 @@ class TriangulatedFigure:
         # (Found and set) unknown_angle is the value of the unknown_angle
         unknown_angle = 360 - angles_sum
 
-        if unknowns_count == 1:
-            # (Recorded) angle_points is a list of angle_points of unknown_angle at a_point
-            angle_points = self.angle_points_of_unknown_angles_at(a_point)[-1]
-            self.set_angle_by_angle_points(*angle_points, unknown_angle)
\ No newline at end of file
+        # (Recorded) angle_points is a list of angle_points of unknown_angle at a_point
+        angle_points = self.angle_points_of_unknown_angles_at(a_point)[-1]
+        self.set_angle_by_angle_points(*angle_points, unknown_angle)
+        return angle_points
@@ -11,3 +11,38 @@ def to_fraction(a_value):
     """
 
     return Fraction(Decimal(str(a_value)))
+
+
+class EmptyException(Exception):
+    """
+    Raised when an operation requires a non-empty triangulated figure.
+    """
+    pass
+
+
+class ParseError(ValueError):
+    """
+    Raised when an input file is malformed; self.line_number is the (1-based) line at fault.
+    """
+
+    def __init__(self, line_number, message):
+        super().__init__('line {}: {}'.format(line_number, message))
+        self.line_number = line_number
+
+
+class TraceError(ValueError):
+    """
+    Raised when a proof trace does not check; self.step is the (1-based) deduction step at fault.
+    """
+
+    def __init__(self, step, message):
+        super().__init__('step {}: {}'.format(step, message))
+        self.step = step
+
+
+class InexactError(ArithmeticError):
+    """
+    Raised by the numeric fast path (ScaledAngle) when a result cannot be represented exactly;
+    the computation is then redone with exact Angles.
+    """
+    pass
@@ -0,0 +1,122 @@
+from fractions import Fraction
+
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+
+__author__ = 'satbek'
+
+
+class VariableBasis(object):
+    """
+    Intent: The smallest set of variables that the angles of a triangulated figure need.
+
+    An angle is a linear combination of the variables (GREEK_LETTERS) plus a constant.
+    Variables that no angle uses, or that always appear in the same combination
+    (e.g., only as α + β + γ), are wasted width in every Angle operation. The variable parts
+    of the known angles span a space of some dimension r; its reduced row echelon basis B
+    has an identity at its pivot columns, so the coordinates of a variable part v in B are
+    just the entries of v at the pivot columns.
+
+    project() keeps those r coordinates and the constant; expand() maps them back through B.
+    Both are linear and one-to-one on the span, so the 180, 360 and pairing rules (sums,
+    differences, halves and equality of angles) give the same results on projected angles.
+
+    Class Invariants:
+    1. self.dimension is the number of coefficients of the angles of the figure (variables + constant)
+    2. self.basis is the list of the rows of B (of length self.dimension - 1), self.pivots their pivot columns
+    3. self.reduced_dimension == len(self.basis) + 1
+    """
+
+    def __init__(self, a_tf):
+        """
+        PRE: the known angles of a_tf have the same dimension
+        POST: self is the basis of the variable parts of the known angles of a_tf
+        """
+
+        rows, self.dimension = [], None
+        for triangle in a_tf.get_triangles():
+            for angle in triangle.get_angles():
+                if not angle.is_known():
+                    continue
+                if self.dimension is None:
+                    self.dimension = angle.get_dimension()
+                elif angle.get_dimension() != self.dimension:
+                    raise ValueError('Angles of different dimensions: {} and {}.'.format(
+                        self.dimension, angle.get_dimension()))
+                rows.append(list(angle.get_coefficients()[:-1]))
+
+        if self.dimension is None:
+            self.dimension = 1
+        self.basis, self.pivots = VariableBasis.row_reduce(rows, self.dimension - 1)
+        self.reduced_dimension = len(self.basis) + 1
+
+    @staticmethod
+    def row_reduce(rows, width):
+        """
+        PRE: rows is a list of lists of width Fractions
+        Returns: (the nonzero rows of the reduced row echelon form of rows, their pivot columns)
+        """
+
+        # distinct rows only: repeated angles add nothing to the span
+        rows = [list(row) for row in dict.fromkeys(tuple(row) for row in rows) if any(row)]
+        basis, pivots = [], []
+        for column in range(width):
+            pivot = next((row for row in rows if row[column] != 0), None)
+            if pivot is None:
+                continue
+            rows.remove(pivot)
+            pivot = [c / pivot[column] for c in pivot]
+            for row in rows + basis:
+                factor = row[column]
+                if factor != 0:
+                    for i in range(column, width):
+                        row[i] -= factor * pivot[i]
+            rows = [row for row in rows if any(row)]
+            basis.append(pivot)
+            pivots.append(column)
+        return basis, pivots
+
+    def is_reducing(self):
+        # Returns: whether or not projected angles are narrower than the original ones
+
+        return self.reduced_dimension < self.dimension
+
+    def project(self, an_angle):
+        # PRE: an_angle is unknown or in the span of the known angles of the figure
+        # Returns: the coordinates of the variable part of an_angle in self.basis, followed by its constant
+
+        if not an_angle.is_known():
+            return an_angle
+        coefficients = an_angle.get_coefficients()
+        return Angle._from_fractions(tuple(coefficients[p] for p in self.pivots) + (coefficients[-1],))
+
+    def expand(self, a_projected_angle):
+        # Returns: the angle of the figure whose projection is a_projected_angle
+
+        if not a_projected_angle.is_known():
+            return a_projected_angle
+        coordinates = a_projected_angle.get_coefficients()
+        variables = [Fraction(0)] * (self.dimension - 1)
+        for c, row in zip(coordinates, self.basis):
+            if c != 0:
+                for i, x in enumerate(row):
+                    variables[i] += c * x
+        return Angle._from_fractions(tuple(variables) + (coordinates[-1],))
+
+    def project_figure(self, a_tf):
+        # Returns: a new TriangulatedFigure with the points of a_tf and its angles projected
+
+        return TriangulatedFigure([Triangle(list(t.get_points()), [self.project(a) for a in t.get_angles()])
+                                   for t in a_tf.get_triangles()])
+
+    def expand_into(self, a_projected_tf, a_tf):
+        """
+        PRE: a_projected_tf is self.project_figure(a_tf), with more angles known
+        POST: the angles known in a_projected_tf but not in a_tf are expanded and set in a_tf
+        """
+
+        for triangle, projected in zip(a_tf.get_triangles(), a_projected_tf.get_triangles()):
+            for index, angle in enumerate(projected.get_angles()):
+                if angle.is_known() and not triangle.get_angles()[index].is_known():
+                    triangle.set_angle_by_index(index, self.expand(angle))
@@ -2,6 +2,8 @@ import unittest
 from geopar.angle_class import Angle
 from geopar.utilities import GREEK_LETTERS
 from fractions import Fraction
+from collections import Counter
+import copy
 
 __author__ = 'satbek'
 
@@ -129,6 +131,25 @@ class TestAngle(unittest.TestCase):
         # Angle == float
         self.assertTrue(c == 90.0)
 
+    def test_eq_unknown(self):
+        self.assertTrue(Angle([]) == Angle.from_str('x'))
+        self.assertFalse(Angle([]) == Angle([90]))
+        self.assertFalse(Angle([90]) == Angle([]))
+
+    def test_immutable(self):
+        b = Angle([1, 2, 3, 30])
+        with self.assertRaises(AttributeError):
+            b.coefficients = [0]
+        with self.assertRaises(AttributeError):
+            b.foo = 1
+        self.assertIs(copy.deepcopy(b), b)
+
+    def test_hash(self):
+        self.assertEqual(hash(Angle([1, 2, 3, 30])), hash(Angle.from_str('1 2 3 30')))
+        self.assertEqual(hash(Angle([.5, 30])), hash(Angle.from_str('1/2 30')))
+        self.assertEqual(Counter([Angle([1, 0]), Angle([0, 60]), Angle([1, 0])]),
+                         Counter([Angle([0, 60]), Angle.from_str('1 0'), Angle.from_str('1 0')]))
+
     def test_ne(self):
         a = Angle([])
         b = Angle([1, 2, 3, 30])
@@ -0,0 +1,123 @@
+import unittest
+import io
+import os
+import tracemalloc
+from fractions import Fraction
+from geopar.array_figure_class import ArrayTriangulatedFigure, TriangleView
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+from geopar.tfparser import TFParser
+from geopar.utilities import ParseError
+from geopar.proof_trace import ProofTrace
+from geopar.run import prove
+from benchmarks.generators import fan, morley_net, grid
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+class TestArrayTriangulatedFigure(unittest.TestCase):
+
+    def setUp(self):
+        # the figure tf1 of test_triangulated_figure.py, with two unknown angles
+        self.triangles = [Triangle([1, 2, 5], [20, 10, 150]), Triangle([5, 2, 6], [80, 10, 90]),
+                          Triangle([6, 2, 3], [140, 10, 30]), Triangle([4, 6, 3], [80, 70, 30]),
+                          Triangle([1, 4, 3], [20, 130, 30]), Triangle([1, 5, 4], [20, 70, 90]),
+                          Triangle([4, 5, 6], [60, Angle.from_str('x'), 60])]
+        self.tf = ArrayTriangulatedFigure(self.triangles)
+
+    def test_views(self):
+        triangles = self.tf.get_triangles()
+        self.assertTrue(all(isinstance(t, TriangleView) for t in triangles))
+        self.assertIs(triangles[3], self.tf.get_triangles()[3])
+        self.assertEqual(triangles[3].get_points(), [4, 6, 3])
+        self.assertEqual(triangles[3].point_following(3), 4)
+        self.assertEqual(triangles[3].point_preceding(3), 6)
+        self.assertEqual(triangles[3].get_angle_points_by_point(6), [4, 6, 3])
+        self.assertEqual(triangles[6].number_of_known(), 2)
+        with self.assertRaises(Exception):
+            triangles[3].angle_of_point(1)
+
+        triangles[6].complete_unknown_angle()
+        self.assertEqual(self.tf.get_angle_by_angle_points(4, 5, 6), 60)
+        self.assertFalse(self.triangles[6].angle_of_point(5).is_known())
+        self.assertTrue(self.tf.all_angles_are_known())
+
+    def test_as_triangulated_figure(self):
+        reference = TriangulatedFigure(self.triangles)
+        self.assertEqual(self.tf.get_points(), reference.get_points())
+        self.assertEqual(self.tf.get_interior_points(), reference.get_interior_points())
+        for point in self.tf.get_points():
+            self.assertEqual([t.get_points() for t in self.tf.triangles_with_point(point)],
+                             [t.get_points() for t in reference.triangles_with_point(point)])
+        self.assertEqual(self.tf.get_id(), reference.get_id())
+        self.assertEqual(self.tf.get_id(strong=True), reference.get_id(strong=True))
+
+        self.assertEqual(self.tf.complete_unknown_angle_at(5), [4, 5, 6])
+        reference.complete_unknown_angle_at(5)
+        self.assertEqual(self.tf.get_id(), reference.get_id())
+        self.assertEqual(self.tf.to_compact(), reference.to_compact())
+
+    def test_prove(self):
+        figures = [figure for _, figure in TFParser.parse_file(INPUT)]
+        figures += [fan(12, 0.3, 1), morley_net(3, 0.3, 2), grid(6, 6, 0.3, 3)]
+        for figure in figures:
+            compact = figure.to_compact()
+            for pairing in (False, True):
+                objects, arrays = TriangulatedFigure.from_compact(compact), ArrayTriangulatedFigure.from_compact(compact)
+                traces = io.StringIO(), io.StringIO()
+                self.assertEqual(prove(objects, pairing, ProofTrace(traces[0])),
+                                 prove(arrays, pairing, ProofTrace(traces[1])))
+                self.assertEqual(traces[0].getvalue(), traces[1].getvalue())
+                self.assertEqual(objects.to_compact(), arrays.to_compact())
+
+    def test_parser(self):
+        for (_, objects), (_, arrays) in zip(TFParser.iter_file(INPUT),
+                                             TFParser.iter_file(INPUT, ArrayTriangulatedFigure)):
+            self.assertIsInstance(arrays, ArrayTriangulatedFigure)
+            self.assertEqual(objects.get_id(strong=True), arrays.get_id(strong=True))
+
+    def test_wide(self):
+        huge = Angle([Fraction(1, 3 ** 50), 2 ** 70, 60])
+        self.tf = ArrayTriangulatedFigure([Triangle([1, 2, 3], [huge, Angle([0, 0, 60]), Angle.from_str('x')])])
+        self.tf.get_triangles()[0].complete_unknown_angle()
+        self.assertEqual(self.tf.get_angle_by_angle_points(3, 1, 2), huge)
+        self.assertEqual(self.tf.get_angle_by_angle_points(2, 3, 1), 120 - huge)
+        self.assertEqual(self.tf.to_compact(), TriangulatedFigure.from_compact(self.tf.to_compact()).to_compact())
+
+        with self.assertRaises(ValueError):
+            self.tf.set_angle_by_angle_points(3, 1, 2, 60)
+
+    def test_points_range(self):
+        self.tf.add(Triangle([1, 2, 3000000000], [60, 60, 60]))
+        self.assertEqual(self.tf.get_triangles()[-1].get_points(), [1, 2, 3000000000])
+
+        # a triangle that cannot be stored leaves the arrays as they were
+        compact = self.tf.to_compact()
+        for triangle in [Triangle([1, 2, 2 ** 64], [60, 60, 60]),
+                         Triangle([1, 2, 7], [Angle([0, 60]), 60, 60])]:
+            with self.assertRaises(ValueError):
+                self.tf.add(triangle)
+            self.assertEqual(len(self.tf), 8)
+            self.assertEqual(self.tf.to_compact(), compact)
+
+        with self.assertRaises(ParseError):
+            list(TFParser.iter_configurations(io.StringIO('1 1\n1, 2, {}; 60, 60, 60\n'.format(2 ** 64)),
+                                              ArrayTriangulatedFigure))
+
+    def test_memory(self):
+        compact = grid(20, 20).to_compact()
+        sizes = []
+        for figure_class in (TriangulatedFigure, ArrayTriangulatedFigure):
+            tracemalloc.start()
+            figure = figure_class.from_compact(compact)
+            sizes.append(tracemalloc.get_traced_memory()[0])
+            tracemalloc.stop()
+            del figure
+        self.assertLess(10 * sizes[1], sizes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import io
+from benchmarks import generators
+from benchmarks.suite import run_suite
+from geopar.tfparser import TFParser
+from geopar.tfvalidator import TFValidator
+from geopar.run import prove, UNIQUE_CONSEQUENCE
+
+__author__ = 'satbek'
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_valid(self):
+        for figure, triangles, interior in [(generators.fan(7), 7, 1),
+                                            (generators.morley_net(3), 30, 9),
+                                            (generators.grid(3, 4), 24, 6)]:
+            self.assertEqual(len(figure.get_triangles()), triangles)
+            self.assertEqual(len(figure.get_interior_points()), interior)
+            self.assertTrue(figure.all_angles_are_known())
+            self.assertTrue(TFValidator.all_rules(figure))
+
+    def test_mask(self):
+        figure = generators.grid(5, 5, unknown=0.5, seed=3)
+        self.assertFalse(figure.all_angles_are_known())
+        self.assertEqual(generators.to_text([figure]), generators.to_text([generators.grid(5, 5, 0.5, 3)]))
+
+        figure = generators.fan(6, unknown=0.1, seed=1)
+        self.assertEqual(prove(figure), UNIQUE_CONSEQUENCE)
+
+    def test_to_text(self):
+        figures = [generators.morley_net(2, unknown=0.2), generators.fan(5, unknown=0.2)]
+        parsed = [figure for _, figure in TFParser.iter_configurations(io.StringIO(generators.to_text(figures)))]
+        self.assertEqual([f.get_id(strong=True) for f in figures], [f.get_id(strong=True) for f in parsed])
+
+
+class TestSuite(unittest.TestCase):
+
+    def test_run_suite(self):
+        report = run_suite(['fan'], ['parse', 'prove'], sizes=[4], repeat=2)
+        self.assertEqual([(r['figure'], r['size'], r['benchmark']) for r in report['results']],
+                         [('fan', 4, 'parse'), ('fan', 4, 'prove')])
+        for record in report['results']:
+            self.assertLessEqual(record['min'], record['mean'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+from benchmarks import generators
+from geopar.certificate_checker import CertificateChecker, check_files
+from geopar.proof_trace import ProofTrace
+from geopar.tfparser import TFParser
+from geopar.tfvalidator import TFValidator
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.utilities import TraceError
+from geopar.run import prove
+from geopar.__main__ import main
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+def traced(figures, pairing=True):
+    # Returns: the compact forms of figures before their proofs, and the proofs
+
+    compact = [figure.to_compact() for figure in figures]
+    stream = io.StringIO()
+    trace = ProofTrace(stream)
+    for figure in figures:
+        prove(figure, pairing, trace)
+    return compact, list(ProofTrace.iter_proofs(io.StringIO(stream.getvalue())))
+
+
+class TestCertificateChecker(unittest.TestCase):
+
+    def setUp(self):
+        self.compact, self.proofs = traced([figure for _, figure in TFParser.parse_file(INPUT)])
+
+    def test_check(self):
+        for compact, (_, steps, footer) in zip(self.compact, self.proofs):
+            checker = CertificateChecker(compact)
+            self.assertEqual(checker.check(steps), footer['steps'])
+            if footer['outcome'] in ('1B', '2'):
+                self.assertTrue(checker.rules_hold())
+
+    def test_interior(self):
+        checker = CertificateChecker(self.compact[0])
+        self.assertEqual([p for p in range(1, 7) if checker.is_interior(p)], [4, 5, 6])
+
+    def test_rules_hold(self):
+        # around the interior point 0, every triangle sums to 180 and the angles at 0 to 360,
+        # but the angles following 0 (10, 10, 20) do not pair up with those preceding it (50, 50, 40)
+        figure = TriangulatedFigure([Triangle([1, 2, 0], [10, 50, 120]),
+                                     Triangle([2, 3, 0], [10, 50, 120]),
+                                     Triangle([3, 1, 0], [20, 40, 120])])
+        self.assertTrue(TFValidator.rule_180(figure) and TFValidator.rule_360(figure))
+        self.assertFalse(TFValidator.rule_pairing(figure))
+        self.assertFalse(CertificateChecker(figure.to_compact()).rules_hold())
+
+        figure = TriangulatedFigure([Triangle([1, 2, 0], [10, 50, 120]),
+                                     Triangle([2, 3, 0], [50, 10, 120]),
+                                     Triangle([3, 1, 0], [30, 30, 120])])
+        self.assertTrue(TFValidator.all_rules(figure))
+        self.assertTrue(CertificateChecker(figure.to_compact()).rules_hold())
+
+    def test_generated(self):
+        compact, proofs = traced([generators.grid(6, 6, unknown=0.3, seed=2),
+                                  generators.morley_net(4, unknown=0.3, seed=2)])
+        for figure, (_, steps, footer) in zip(compact, proofs):
+            self.assertEqual(CertificateChecker(figure).check(steps), footer['steps'])
+
+    def test_tampered(self):
+        _, steps, _ = self.proofs[0]
+        for tamper in [lambda s: s[1]['angle'].__setitem__(-1, '121'),
+                       lambda s: s[0]['premises'].pop(),
+                       lambda s: s[3]['results'].pop(),
+                       lambda s: s[4].__setitem__('rule', '360'),
+                       lambda s: s[0].__setitem__('results', [[5, 3, 1]]),
+                       lambda s: s.append(s[0])]:
+            tampered = json.loads(json.dumps(steps))
+            tamper(tampered)
+            with self.assertRaises(TraceError):
+                CertificateChecker(self.compact[0]).check(tampered)
+
+    def test_check_files(self):
+        directory = tempfile.TemporaryDirectory()
+        trace = os.path.join(directory.name, 'trace.jsonl')
+        main([INPUT, '--pairing', '--trace', trace, '-o', os.path.join(directory.name, 'results.jsonl')])
+        checked = check_files(INPUT, trace)
+        self.assertEqual(len(checked), len(self.compact))
+
+        with open(trace) as a_file:
+            lines = a_file.readlines()
+        with open(trace, 'w') as a_file:
+            a_file.writelines(lines[:-1])
+        with self.assertRaises(TraceError):
+            check_files(INPUT, trace)
+        directory.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from fractions import Fraction
+from geopar.compact_angle_class import CompactAngle
+from geopar.angle_class import Angle
+from geopar.triangle_class import Triangle
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.deduction_engine import DeductionEngine
+from geopar.tfvalidator import TFValidator
+
+__author__ = 'satbek'
+
+
+class TestCompactAngle(unittest.TestCase):
+    def setUp(self):
+        self.a = CompactAngle.from_str('-1/3 -1/3 -1/3 120')
+        self.b = CompactAngle([0, 1, 0, 0])
+        self.c = CompactAngle([0.5, 0.5, -0.5, 60])
+
+    def test_init(self):
+        self.assertEqual(self.a.get_coefficients(),
+                         [Fraction(-1, 3), Fraction(-1, 3), Fraction(-1, 3), Fraction(120)])
+        self.assertEqual(self.c.get_coefficients(),
+                         [Fraction(1, 2), Fraction(1, 2), Fraction(-1, 2), Fraction(60)])
+        self.assertFalse(CompactAngle.from_str('x').is_known())
+        self.assertEqual(4, self.a.get_dimension())
+
+    def test_arithmetic(self):
+        self.assertEqual(self.a + self.b, Angle([Fraction(-1, 3), Fraction(2, 3), Fraction(-1, 3), 120]))
+        self.assertEqual(self.a + self.c, Angle([Fraction(1, 6), Fraction(1, 6), Fraction(-5, 6), 180]))
+        self.assertEqual(self.a - self.a, CompactAngle([0, 0, 0, 0]))
+        self.assertEqual(180 - self.b, CompactAngle([0, -1, 0, 180]))
+        self.assertEqual(self.b + 90, CompactAngle([0, 1, 0, 90]))
+        self.assertEqual(self.a * 3, CompactAngle([-1, -1, -1, 360]))
+        self.assertEqual(self.c / -2, CompactAngle([-0.25, -0.25, 0.25, -30]))
+        self.assertEqual(sum([self.a, self.a, self.a]), CompactAngle([-1, -1, -1, 360]))
+
+    def test_eq_hash(self):
+        self.assertEqual(CompactAngle([90]), 90)
+        self.assertEqual(CompactAngle([90]), 90.0)
+        self.assertNotEqual(CompactAngle([90]), 90.1)
+        self.assertEqual(self.a, Angle.from_str('-1/3 -1/3 -1/3 120'))
+        self.assertEqual(Angle.from_str('-1/3 -1/3 -1/3 120'), self.a)
+        self.assertEqual(hash(self.a), hash(CompactAngle.from_angle(self.a.to_angle())))
+        self.assertNotEqual(self.a, self.b)
+
+    def test_str(self):
+        self.assertEqual(str(self.b), 'β')
+        self.assertEqual(str(CompactAngle.from_str('x')), 'x')
+
+    def test_deduction(self):
+        def morley(angle_class):
+            x = angle_class.from_str('x')
+            return TriangulatedFigure([
+                Triangle([1, 3, 5], [angle_class([-1, -1, 60]), angle_class([0, 1, 0]), x]),
+                Triangle([5, 3, 6], [x, angle_class([0, 1, 0]), x]),
+                Triangle([6, 3, 2], [x, angle_class([0, 1, 0]), angle_class([1, 0, 0])]),
+                Triangle([4, 6, 2], [x, x, angle_class([1, 0, 0])]),
+                Triangle([1, 4, 2], [angle_class([-1, -1, 60]), x, angle_class([1, 0, 0])]),
+                Triangle([1, 5, 4], [angle_class([-1, -1, 60]), x, x]),
+                Triangle([4, 5, 6], [angle_class([0, 0, 60]), angle_class([0, 0, 60]), angle_class([0, 0, 60])])])
+
+        tf_angle, tf_compact = morley(Angle), morley(CompactAngle)
+        DeductionEngine(tf_angle, pairing=True).run()
+        DeductionEngine(tf_compact, pairing=True).run()
+        self.assertTrue(tf_compact.all_angles_are_known())
+        self.assertTrue(TFValidator.all_rules(tf_compact))
+        self.assertEqual(tf_angle.get_id(), tf_compact.get_id())
@@ -0,0 +1,65 @@
+import unittest
+from geopar.deduction_engine import DeductionEngine
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+from geopar.tfvalidator import TFValidator
+
+__author__ = 'satbek'
+
+# URL1:
+# https://docs.google.com/presentation/d/1nddxo9JPaoxz-Colod8qd6Yuj_k7LXhBfO3JlVSYXrE/edit?usp=sharing
+
+
+class TestDeductionEngine(unittest.TestCase):
+
+    def setUp(self):
+        # TriangulatedFigure tf1 consists of seven Triangles t1-t7
+        # Appearance: URL1 at the top
+        self.t1 = Triangle([1, 2, 5], [20, 10, 150])
+        self.t2 = Triangle([5, 2, 6], [80, 10, 90])
+        self.t3 = Triangle([6, 2, 3], [140, 10, 30])
+        self.t4 = Triangle([4, 6, 3], [80, 70, 30])
+        self.t5 = Triangle([1, 4, 3], [20, 130, 30])
+        self.t6 = Triangle([1, 5, 4], [20, 70, 90])
+        self.t7 = Triangle([4, 5, 6], [60, 60, 60])
+        self.tf1 = TriangulatedFigure([self.t1, self.t2, self.t3, self.t4, self.t5, self.t6, self.t7])
+
+        # Morley's configuration with the angles at the trisected vertices unknown
+        x = Angle.from_str('x')
+        self.tf_morley = TriangulatedFigure([
+            Triangle([1, 3, 5], [Angle([-1, -1, 60]), Angle([0, 1, 0]), x]),
+            Triangle([5, 3, 6], [x, Angle([0, 1, 0]), x]),
+            Triangle([6, 3, 2], [x, Angle([0, 1, 0]), Angle([1, 0, 0])]),
+            Triangle([4, 6, 2], [x, x, Angle([1, 0, 0])]),
+            Triangle([1, 4, 2], [Angle([-1, -1, 60]), x, Angle([1, 0, 0])]),
+            Triangle([1, 5, 4], [Angle([-1, -1, 60]), x, x]),
+            Triangle([4, 5, 6], [Angle([0, 0, 60]), Angle([0, 0, 60]), Angle([0, 0, 60])])])
+
+    def test_run_180_360(self):
+        x = Angle.from_str('x')
+        self.tf1.set_angle_by_angle_points(6, 4, 5, x)  # by 360 at 4
+        self.tf1.set_angle_by_angle_points(1, 2, 5, x)  # by 180
+        self.tf1.set_angle_by_angle_points(5, 6, 4, x)  # by 180 after 360 at 4
+
+        engine = DeductionEngine(self.tf1)
+        self.assertEqual(engine.run(), 3)
+        self.assertTrue(self.tf1.all_angles_are_known())
+        self.assertEqual(self.tf1.get_angle_by_angle_points(6, 4, 5), 60)
+        self.assertEqual(self.tf1.get_angle_by_angle_points(1, 2, 5), 10)
+        self.assertEqual(self.tf1.get_angle_by_angle_points(5, 6, 4), 60)
+
+        # nothing is left to deduce
+        self.assertEqual(engine.run(), 0)
+
+    def test_run_pairing(self):
+        DeductionEngine(self.tf_morley).run()
+        self.assertFalse(self.tf_morley.all_angles_are_known())
+
+        engine = DeductionEngine(self.tf_morley, pairing=True)
+        engine.run()
+        self.assertTrue(self.tf_morley.all_angles_are_known())
+        self.assertTrue(TFValidator.all_rules(self.tf_morley))
+        self.assertEqual(self.tf_morley.get_angle_by_angle_points(5, 4, 1), Angle([1, 0, 60]))
+        self.assertEqual(engine.get_number_deduced(), sum(engine.deduced_per_round))
+        self.assertGreater(engine.get_rounds(), 0)
@@ -0,0 +1,64 @@
+import unittest
+import os
+from geopar.edge_index import EdgeIndex
+from geopar.triangle_class import Triangle
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.array_figure_class import ArrayTriangulatedFigure
+from geopar.tfparser import TFParser
+from benchmarks.generators import grid
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+class TestEdgeIndex(unittest.TestCase):
+
+    def setUp(self):
+        # TriangulatedFigure tf1 of test_triangulated_figure.py
+        self.triangles = [Triangle([1, 2, 5], [20, 10, 150]), Triangle([5, 2, 6], [80, 10, 90]),
+                          Triangle([6, 2, 3], [140, 10, 30]), Triangle([4, 6, 3], [80, 70, 30]),
+                          Triangle([1, 4, 3], [20, 130, 30]), Triangle([1, 5, 4], [20, 70, 90]),
+                          Triangle([4, 5, 6], [60, 60, 60])]
+        self.tf = TriangulatedFigure(self.triangles)
+        self.edges = self.tf.get_edge_index()
+
+    def test_sides(self):
+        self.assertEqual(self.edges.get_sides(5, 6), (self.triangles[1], self.triangles[6]))
+        self.assertEqual(self.edges.get_sides(6, 5), (self.triangles[6], self.triangles[1]))
+        self.assertEqual(self.edges.get_sides(2, 1), (self.triangles[0], None))
+        self.assertIsNone(self.edges.triangle_traversing(1, 6))
+
+    def test_dual_graph(self):
+        self.assertEqual(self.edges.dual_graph(), [[1, 5], [0, 2, 6], [1, 3], [6, 2, 4], [5, 3], [0, 6, 4], [5, 1, 3]])
+        self.assertEqual(sorted(self.edges.boundary_edges()), [(1, 2), (2, 3), (3, 1)])
+        self.assertEqual(self.edges.components(), [[0, 1, 5, 2, 6, 4, 3]])
+        self.assertTrue(self.edges.is_valid())
+        self.assertEqual(self.tf.check_invariants(), [])
+
+    def test_invalid(self):
+        self.tf.add(Triangle([7, 8, 9], [60, 60, 60]))
+        self.tf.add(Triangle([2, 6, 10], [60, 60, 60]))  # counterclockwise: traverses 2 -> 6 as [5, 2, 6] does
+        self.assertEqual(self.edges.get_conflicts(), [(1, 8, (2, 6))])
+        self.assertEqual(self.edges.get_isolated(), [7])
+        self.assertEqual(self.edges.components(), [[0, 1, 5, 2, 6, 4, 3], [7], [8]])
+        self.assertFalse(self.edges.is_valid())
+        self.assertEqual(self.tf.check_invariants(),
+                         ['triangles [5, 2, 6] and [2, 6, 10] both traverse the edge 2 -> 6',
+                          'triangle [7, 8, 9] shares no edge with another triangle'])
+
+    def test_fans(self):
+        # fans walked through the edge index agree with the array backend, which orders them by point lookups
+        for figure in [figure for _, figure in TFParser.parse_file(INPUT)] + [grid(5, 5)]:
+            arrays = ArrayTriangulatedFigure.from_compact(figure.to_compact())
+            self.assertEqual(figure.check_invariants(), [])
+            self.assertEqual(arrays.check_invariants(), [])
+            for point in figure.get_points():
+                self.assertEqual([t.get_points() for t in figure.triangles_with_point(point)],
+                                 [t.get_points() for t in arrays.triangles_with_point(point)])
+            self.assertEqual(len(EdgeIndex(figure.get_triangles()).boundary_edges()),
+                             len(figure.get_edge_index().boundary_edges()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import contextlib
+import io
+import os
+import pstats
+import tempfile
+from geopar.instrumentation import Instrumentation
+from geopar.tfparser import TFParser
+from geopar.tfpreprocessor import TFPreprocessor
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.deduction_engine import DeductionEngine
+from geopar.angle_class import Angle
+from geopar.run import prove
+from geopar.__main__ import main
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.figure = TFParser.parse_file(INPUT)[0][1]
+
+    def test_counts(self):
+        with Instrumentation() as stats:
+            TFPreprocessor.theorem_2(self.figure)
+            unknown = sum(not a.is_known() for t in self.figure.get_triangles() for a in t.get_angles())
+            prove(self.figure, pairing=True)
+
+        self.assertEqual(stats.calls['TFPreprocessor.theorem_2'], 1)
+        self.assertGreater(stats.calls['TriangulatedFigure.triangles_with_point'], 0)
+        self.assertGreater(stats.calls['Angle.__add__'], 0)
+        self.assertGreaterEqual(stats.seconds['TFPreprocessor.theorem_2'], 0)
+        self.assertEqual(len(stats.rounds), 2)
+        self.assertEqual(sum(map(sum, stats.rounds)), unknown)
+        self.assertIn('TFPreprocessor.theorem_2', stats.summary())
+        self.assertIn('TFPreprocessor.theorem_2', stats.to_dict()['functions'])
+
+    def test_restored(self):
+        originals = [TFPreprocessor.__dict__['theorem_2'], TriangulatedFigure.get_id, Angle.__add__,
+                     DeductionEngine.run]
+        with Instrumentation() as stats:
+            self.assertIsNot(Angle.__add__, originals[2])
+        self.assertEqual([TFPreprocessor.__dict__['theorem_2'], TriangulatedFigure.get_id, Angle.__add__,
+                          DeductionEngine.run], originals)
+
+        prove(self.figure)
+        self.assertEqual(sum(stats.calls.values()), 0)
+
+    def test_main(self):
+        directory = tempfile.TemporaryDirectory()
+        profile = os.path.join(directory.name, 'geopar.prof')
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(main([INPUT, '--stats', '--profile', profile,
+                                   '-o', os.path.join(directory.name, 'results.jsonl')]), 0)
+        self.assertIn('DeductionEngine._apply_180', stderr.getvalue())
+        self.assertGreater(pstats.Stats(profile).total_calls, 0)
+        directory.cleanup()
+
+    def test_main_failing(self):
+        # a run that fails still restores the instrumented functions and reports what it counted
+        original = Angle.__add__
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(FileNotFoundError):
+            main([INPUT + '.missing', '--stats', '-o', os.devnull])
+        self.assertIs(Angle.__add__, original)
+        self.assertIn('deduction runs: 0', stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import os
+from geopar.parallel_prover import ParallelProver
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.array_figure_class import ArrayTriangulatedFigure
+from geopar.tfparser import TFParser
+from geopar.run import prove
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+class TestParallelProver(unittest.TestCase):
+
+    def setUp(self):
+        self.figures = [figure for _, figure in TFParser.parse_file(INPUT)]
+
+    def test_compact(self):
+        for figure in self.figures:
+            compact = figure.to_compact()
+            self.assertEqual(TriangulatedFigure.from_compact(compact).get_id(), figure.get_id())
+            for triangle in compact:
+                for value in triangle:
+                    self.assertTrue(isinstance(value, (int, tuple)))
+
+    def test_prove_all(self):
+        expected = [prove(figure, pairing=True) for _, figure in TFParser.parse_file(INPUT)]
+        expected_ids = [figure.get_id() for _, figure in TFParser.parse_file(INPUT)]
+
+        with ParallelProver(workers=2, pairing=True, chunksize=3) as prover:
+            outcomes = prover.prove_all(self.figures)
+        self.assertEqual(outcomes, expected)
+
+        # the deduced angles are written back
+        solved = TFParser.parse_file(INPUT)
+        for _, figure in solved:
+            prove(figure, pairing=True)
+        self.assertEqual([figure.get_id() for figure in self.figures],
+                         [figure.get_id() for _, figure in solved])
+        self.assertNotEqual(expected_ids, [figure.get_id() for figure in self.figures])
+
+    def test_figure_class(self):
+        expected = ParallelProver(workers=1, pairing=True).prove_compact_figures([f.to_compact() for f in self.figures])
+
+        # the workers build ArrayTriangulatedFigures, with the same results
+        built = []
+        prover = ParallelProver(workers=1, pairing=True, figure_class=ArrayTriangulatedFigure)
+        from_compact = ArrayTriangulatedFigure.from_compact
+        ArrayTriangulatedFigure.from_compact = classmethod(lambda cls, c: built.append(c) or from_compact(c))
+        try:
+            self.assertEqual(prover.prove_compact_figures([f.to_compact() for f in self.figures]), expected)
+        finally:
+            ArrayTriangulatedFigure.from_compact = from_compact
+        self.assertEqual(len(built), len(self.figures))
+
+        with ParallelProver(workers=2, pairing=True, figure_class=ArrayTriangulatedFigure) as prover:
+            self.assertEqual(prover.prove_compact_figures([f.to_compact() for f in self.figures]), expected)
+
+    def test_single_worker(self):
+        outcomes = ParallelProver(workers=1).prove_all(self.figures[:2])
+        self.assertEqual(outcomes, ['1A', '1B'])
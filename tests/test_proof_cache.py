@@ -0,0 +1,162 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+from geopar.proof_cache import CanonicalForm, ProofCache
+from geopar.tfparser import TFParser
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+from geopar.run import prove
+from geopar.__main__ import prove_files
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+def relabelled(a_tf, a_mapping, reverse=False):
+    # Returns: a copy of a_tf with every point p renamed a_mapping[p], triangles rotated and reordered
+
+    triangles = []
+    for triangle in a_tf.get_triangles():
+        points = [a_mapping[p] for p in triangle.get_points()]
+        angles = list(triangle.get_angles())
+        triangles.append(Triangle(points[1:] + points[:1], angles[1:] + angles[:1]))
+    return TriangulatedFigure(triangles[::-1] if reverse else triangles)
+
+
+class TestCanonicalForm(unittest.TestCase):
+
+    def setUp(self):
+        self.figures = [figure for _, figure in TFParser.parse_file(INPUT)]
+
+    def test_relabelling(self):
+        for figure in self.figures:
+            points = figure.get_points()
+            mapping = {p: 1000 - 7 * i for i, p in enumerate(points)}
+            form = CanonicalForm(figure)
+            self.assertEqual(form.code, CanonicalForm(relabelled(figure, mapping, reverse=True)).code)
+            self.assertEqual(sorted(form.labels.values()), list(range(len(points))))
+
+    def test_distinguishes(self):
+        # the configurations at lines 13 and 78 of input.txt are the same figure, relabelled
+        codes = {CanonicalForm(figure).code for figure in self.figures}
+        self.assertEqual(len(codes), len(self.figures) - 1)
+
+        tf = self.figures[0]
+        changed = relabelled(tf, {p: p for p in tf.get_points()})
+        triangle = changed.get_triangles()[0]
+        for index, angle in enumerate(triangle.get_angles()):
+            if not angle.is_known():
+                triangle.set_angle_by_index(index, Angle.from_str(' '.join(['1'] * tf.get_triangles()[0].get_angles()
+                                                                           [0].get_dimension())))
+                break
+        self.assertNotEqual(CanonicalForm(tf).code, CanonicalForm(changed).code)
+
+    def test_components(self):
+        t1 = Triangle([1, 2, 3], [60, 60, 60])
+        t2 = Triangle([4, 5, 6], [90, 45, 45])
+        t3 = Triangle([7, 8, 9], [90, 45, 45])
+        t4 = Triangle([10, 11, 12], [60, 60, 60])
+        self.assertEqual(CanonicalForm(TriangulatedFigure([t1, t2])).code,
+                         CanonicalForm(TriangulatedFigure([t3, t4])).code)
+
+    def test_uniform(self):
+        # a 12 x 12 grid of squares, each cut along the same diagonal, every angle unknown
+        triangles = []
+        for r in range(12):
+            for c in range(12):
+                a, b = r * 13 + c, r * 13 + c + 1
+                triangles.append(Triangle([a, b, b + 13], [Angle([])] * 3))
+                triangles.append(Triangle([a, b + 13, a + 13], [Angle([])] * 3))
+        tf = TriangulatedFigure(triangles)
+        edges = {}
+        for triangle in triangles:
+            points = triangle.get_points()
+            for i in range(3):
+                edges[(points[i], points[(i + 1) % 3])] = (triangle, i)
+        keys = {id(t): [()] * 3 for t in triangles}
+
+        # only the starts at the two symmetric corners are walked, not all 864
+        self.assertLessEqual(len(CanonicalForm._refined_starts(triangles, edges, keys)), 2)
+        mapping = {p: 1000 - 7 * i for i, p in enumerate(tf.get_points())}
+        self.assertEqual(CanonicalForm(tf).code, CanonicalForm(relabelled(tf, mapping, reverse=True)).code)
+
+
+class TestProofCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'proofs.db')
+        self.figures = [figure for _, figure in TFParser.parse_file(INPUT)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_prove(self):
+        with ProofCache(self.path) as cache:
+            outcomes = [cache.prove(figure) for figure in self.figures]
+            self.assertEqual((cache.hits, cache.misses), (1, len(self.figures) - 1))
+
+        fresh = [figure for _, figure in TFParser.parse_file(INPUT)]
+        with ProofCache(self.path) as cache:
+            for i, figure in enumerate(fresh):
+                copy = relabelled(figure, {p: p + 100 for p in figure.get_points()}, reverse=True)
+                self.assertEqual(cache.prove(copy), outcomes[i])
+                self.assertEqual(prove(figure), outcomes[i])
+                for triangle in figure.get_triangles():
+                    for point in triangle.get_points():
+                        angle_points = [p + 100 for p in triangle.get_angle_points_by_point(point)]
+                        self.assertEqual(copy.get_angle_by_angle_points(*angle_points), triangle.angle_of_point(point))
+            self.assertEqual((cache.hits, cache.misses), (len(fresh), 0))
+
+    def test_pairing(self):
+        cache = ProofCache()
+        cache.prove(self.figures[0], pairing=False)
+        self.assertIsNone(cache.lookup(self.figures[0], pairing=True))
+
+    def test_eviction(self):
+        cache = ProofCache(max_entries=2)
+        cache.put('a', '2', [])
+        cache.put('b', '2', [])
+        cache.get('a')
+        cache.put('c', '2', [])
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_store_many(self):
+        cache = ProofCache(self.path, max_entries=3)
+        proofs = []
+        for figure in self.figures[:4]:
+            form = CanonicalForm(figure)
+            proofs.append((figure, prove(figure), form))
+        cache.store_many(proofs[:2])
+        cache.store_many(proofs[:2])
+        self.assertEqual(len(cache), 2)
+
+        # the batch is committed: another connection sees it
+        with ProofCache(self.path) as other:
+            self.assertEqual(len(other), 2)
+
+        cache.store_many(proofs[2:])
+        self.assertEqual(len(cache), 3)
+        cache.close()
+        with ProofCache(self.path) as cache:
+            self.assertEqual(len(cache), 3)
+
+    def test_prove_files(self):
+        cache = ProofCache()
+        first, second = io.StringIO(), io.StringIO()
+        prove_files([INPUT], False, first, cache=cache)
+        prove_files([INPUT], False, second, cache=cache)
+        self.assertEqual(cache.hits, len(self.figures))
+        self.assertEqual([json.loads(line) for line in first.getvalue().splitlines()],
+                         [json.loads(line) for line in second.getvalue().splitlines()])
+
+
+if __name__ == '__main__':
+    unittest.main()
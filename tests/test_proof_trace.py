@@ -0,0 +1,67 @@
+import unittest
+import io
+import json
+import os
+from geopar.proof_trace import ProofTrace
+from geopar.tfparser import TFParser
+from geopar.utilities import TraceError
+from geopar.run import prove
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+class TestProofTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.figures = [figure for _, figure in TFParser.parse_file(INPUT)]
+        self.stream = io.StringIO()
+        trace = ProofTrace(self.stream)
+        self.outcomes = [prove(figure, True, trace) for figure in self.figures]
+
+    def fresh(self):
+        return [figure for _, figure in TFParser.parse_file(INPUT)]
+
+    def test_replay(self):
+        proofs = list(ProofTrace.iter_proofs(io.StringIO(self.stream.getvalue())))
+        self.assertEqual([footer['outcome'] for _, _, footer in proofs], self.outcomes)
+
+        for figure, proved, (header, steps, footer) in zip(self.fresh(), self.figures, proofs):
+            self.assertEqual(ProofTrace.replay(figure, steps, header), footer['steps'])
+            self.assertEqual(figure.get_id(strong=True), proved.get_id(strong=True))
+
+    def test_rules(self):
+        steps = [step for _, steps, _ in ProofTrace.iter_proofs(io.StringIO(self.stream.getvalue()))
+                 for step in steps]
+        self.assertEqual({step['rule'] for step in steps}, {'180', '360', 'pairing'})
+
+    def test_tampered(self):
+        header, steps, _ = next(ProofTrace.iter_proofs(io.StringIO(self.stream.getvalue())))
+        tampered = json.loads(json.dumps(steps))
+        tampered[1]['angle'][-1] = '121'
+        with self.assertRaises(TraceError) as context:
+            ProofTrace.replay(self.fresh()[0], tampered, header)
+        self.assertEqual(context.exception.step, 2)
+
+        tampered = json.loads(json.dumps(steps))
+        tampered[0]['premises'].pop()
+        with self.assertRaises(TraceError):
+            ProofTrace.replay(self.fresh()[0], tampered, header)
+
+        with self.assertRaises(TraceError):
+            ProofTrace.replay(self.fresh()[0], steps + steps[:1], header)
+
+        with self.assertRaises(TraceError):
+            ProofTrace.replay(self.fresh()[1], steps, header)
+
+    def test_incomplete(self):
+        lines = self.stream.getvalue().splitlines(True)
+        proofs = list(ProofTrace.iter_proofs(lines[:3]))
+        self.assertEqual(len(proofs), 1)
+        self.assertIsNone(proofs[0][2])
+        self.assertEqual(len(proofs[0][1]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import io
+import os
+from fractions import Fraction
+from geopar.scaled_angle_class import ScaledAngle
+from geopar.angle_class import Angle
+from geopar.tfparser import TFParser
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.proof_trace import ProofTrace
+from geopar.utilities import InexactError
+from geopar.run import prove
+from benchmarks.generators import fan, morley_net, grid
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+class TestScaledAngle(unittest.TestCase):
+
+    def setUp(self):
+        self.a = ScaledAngle.from_angle(Angle([1, 2, 30]), 4)
+        self.b = ScaledAngle.from_angle(Angle([Fraction(1, 2), 0, 15]), 4)
+
+    def test_arithmetic(self):
+        self.assertEqual((self.a + self.b).to_angle(), Angle([Fraction(3, 2), 2, 45]))
+        self.assertEqual((self.a - self.b).to_angle(), Angle([Fraction(1, 2), 2, 15]))
+        self.assertEqual((180 - self.a).to_angle(), Angle([-1, -2, 150]))
+        self.assertEqual((self.a * 3).to_angle(), Angle([3, 6, 90]))
+        self.assertEqual((self.a / 2).to_angle(), Angle([Fraction(1, 2), 1, 15]))
+        self.assertEqual(self.b * 2, ScaledAngle.from_angle(Angle([1, 0, 30]), 4))
+        self.assertEqual(hash(self.a), hash(ScaledAngle.from_angle(Angle([1, 2, 30]), 4)))
+
+    def test_inexact(self):
+        with self.assertRaises(InexactError):
+            self.b / 4
+        with self.assertRaises(InexactError):
+            self.a + Fraction(1, 8)
+
+    def test_prove(self):
+        figures = [figure for _, figure in TFParser.parse_file(INPUT)]
+        figures += [fan(12, 0.3, 1), morley_net(3, 0.3, 2), grid(5, 5, 0.3, 3)]
+        for figure in figures:
+            compact = figure.to_compact()
+            for pairing in (False, True):
+                exact, scaled = TriangulatedFigure.from_compact(compact), TriangulatedFigure.from_compact(compact)
+                self.assertEqual(prove(exact, pairing), prove(scaled, pairing, fast=True))
+                self.assertEqual(exact.get_id(strong=True), scaled.get_id(strong=True))
+
+    def test_fallback(self):
+        # every division on the scaled integers fails, so every pairing step falls back to exact Angles
+        def inexact(self, an_int):
+            raise InexactError('forced')
+
+        divide, ScaledAngle.__truediv__ = ScaledAngle.__truediv__, inexact
+        try:
+            for _, figure in TFParser.parse_file(INPUT):
+                compact = figure.to_compact()
+                exact, scaled = TriangulatedFigure.from_compact(compact), TriangulatedFigure.from_compact(compact)
+                stream = io.StringIO()
+                self.assertEqual(prove(exact, True), prove(scaled, True, ProofTrace(stream), fast=True))
+                self.assertEqual(exact.get_id(strong=True), scaled.get_id(strong=True))
+
+                header, steps, footer = next(ProofTrace.iter_proofs(io.StringIO(stream.getvalue())))
+                self.assertEqual(ProofTrace.replay(TriangulatedFigure.from_compact(compact), steps, header), footer['steps'])
+        finally:
+            ScaledAngle.__truediv__ = divide
+
+
+if __name__ == '__main__':
+    unittest.main()
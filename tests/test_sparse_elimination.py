@@ -0,0 +1,61 @@
+import unittest
+import random
+from fractions import Fraction
+from geopar.sparse_elimination import SparseEliminator
+
+__author__ = 'satbek'
+
+
+class TestSparseEliminator(unittest.TestCase):
+
+    @staticmethod
+    def system(n, seed):
+        # Returns: (equations, solution) of a random sparse, banded, non-singular system of n variables
+        rng = random.Random(seed)
+        solution = [[Fraction(rng.randint(-90, 90), rng.randint(1, 6)), Fraction(rng.randint(0, 180))]
+                    for _ in range(n)]
+        equations = []
+        for i in range(n):
+            coefficients = {i: Fraction(rng.choice([1, 2, 3]))}
+            for j in rng.sample(range(max(0, i - 4), min(n, i + 5)), 2):
+                if j != i:
+                    coefficients[j] = Fraction(rng.choice([-1, 1]), rng.choice([1, 2]))
+            # keep the matrix diagonally dominant, hence non-singular
+            coefficients[i] += sum(abs(c) for j, c in coefficients.items() if j != i)
+            rhs = [sum(c * solution[j][k] for j, c in coefficients.items()) for k in range(2)]
+            equations.append((coefficients, rhs))
+        return equations, solution
+
+    def test_minimum_degree_order(self):
+        equations, _ = self.system(40, 1)
+        order = SparseEliminator.minimum_degree_order(equations, 40)
+        self.assertEqual(sorted(order), list(range(40)))
+
+        # star: the centre has the highest degree and is not eliminated before the leaves shrink it
+        star = [({0: Fraction(1), v: Fraction(1)}, [Fraction(0)]) for v in range(1, 6)]
+        self.assertGreaterEqual(SparseEliminator.minimum_degree_order(star, 6).index(0), 4)
+
+    def test_eliminate_determined(self):
+        for seed in range(5):
+            equations, solution = self.system(60, seed)
+            pivot_rows, consistent = SparseEliminator.eliminate(equations, 60)
+            self.assertTrue(consistent)
+            self.assertEqual(len(pivot_rows), 60)
+            for v, (coefficients, rhs) in pivot_rows.items():
+                self.assertEqual(coefficients, {v: 1})
+                self.assertEqual(rhs, solution[v])
+
+    def test_eliminate_underdetermined_and_inconsistent(self):
+        # x0 + x1 = 10, x1 + x2 = 20: every variable depends on a free one
+        equations = [({0: Fraction(1), 1: Fraction(1)}, [Fraction(10)]),
+                     ({1: Fraction(1), 2: Fraction(1)}, [Fraction(20)])]
+        pivot_rows, consistent = SparseEliminator.eliminate(equations, 3)
+        self.assertTrue(consistent)
+        self.assertEqual(len(pivot_rows), 2)
+        for coefficients, _ in pivot_rows.values():
+            self.assertEqual(len(coefficients), 2)
+
+        # ... and x0 - x2 = 0 contradicts them
+        equations.append(({0: Fraction(1), 2: Fraction(-1)}, [Fraction(0)]))
+        _, consistent = SparseEliminator.eliminate(equations, 3)
+        self.assertFalse(consistent)
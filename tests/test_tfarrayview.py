@@ -0,0 +1,71 @@
+import unittest
+from geopar.tfarrayview import TFArrayView, np
+from geopar.tfvalidator import TFValidator
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+from geopar.utilities import EmptyException
+
+__author__ = 'satbek'
+
+# URL1:
+# https://docs.google.com/presentation/d/1nddxo9JPaoxz-Colod8qd6Yuj_k7LXhBfO3JlVSYXrE/edit?usp=sharing
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestTFArrayView(unittest.TestCase):
+
+    def setUp(self):
+        # TriangulatedFigure tf1 consists of seven Triangles t1-t7
+        # Appearance: URL1 at the top
+        self.tf1 = TriangulatedFigure([
+            Triangle([1, 2, 5], [20, 10, 150]),
+            Triangle([5, 2, 6], [80, 10, 90]),
+            Triangle([6, 2, 3], [140, 10, 30]),
+            Triangle([4, 6, 3], [80, 70, 30]),
+            Triangle([1, 4, 3], [20, 130, 30]),
+            Triangle([1, 5, 4], [20, 70, 90]),
+            Triangle([4, 5, 6], [60, 60, 60])])
+
+        # Morley's configuration, all angles known
+        self.tf_morley = TriangulatedFigure([
+            Triangle([1, 3, 5], [Angle([-1, -1, 60]), Angle([0, 1, 0]), Angle([1, 0, 120])]),
+            Triangle([5, 3, 6], [Angle([-1, -1, 120]), Angle([0, 1, 0]), Angle([1, 0, 60])]),
+            Triangle([6, 3, 2], [Angle([-1, -1, 180]), Angle([0, 1, 0]), Angle([1, 0, 0])]),
+            Triangle([4, 6, 2], [Angle([-1, -1, 120]), Angle([0, 1, 60]), Angle([1, 0, 0])]),
+            Triangle([1, 4, 2], [Angle([-1, -1, 60]), Angle([0, 1, 120]), Angle([1, 0, 0])]),
+            Triangle([1, 5, 4], [Angle([-1, -1, 60]), Angle([0, 1, 60]), Angle([1, 0, 60])]),
+            Triangle([4, 5, 6], [Angle([0, 0, 60]), Angle([0, 0, 60]), Angle([0, 0, 60])])])
+
+    def test_rules_agree_with_validator(self):
+        for tf in (self.tf1, self.tf_morley):
+            view = TFArrayView(tf)
+            self.assertTrue(view.rule_180())
+            self.assertTrue(view.rule_360())
+            self.assertEqual(view.rule_180(), TFValidator.rule_180(tf))
+            self.assertEqual(view.rule_360(), TFValidator.rule_360(tf))
+
+    def test_rules_violated(self):
+        self.tf1.set_angle_by_angle_points(6, 4, 5, 70)
+        view = TFArrayView(self.tf1)
+        self.assertFalse(view.rule_180())
+        self.assertFalse(view.rule_360())
+
+        self.tf_morley.set_angle_by_angle_points(4, 1, 5, Angle([-1, -1, 61]))
+        self.assertFalse(TFArrayView(self.tf_morley).rule_180())
+
+    def test_unknown_and_fractions(self):
+        self.tf_morley.set_angle_by_angle_points(4, 1, 5, Angle.from_str('x'))
+        view = TFArrayView(self.tf_morley)
+        self.assertFalse(view.rule_180())
+        self.assertTrue(view.rule_360())  # point 1 is on the boundary
+
+        tf = TriangulatedFigure([Triangle([1, 2, 3], [Angle.from_str('1/3 60'), Angle.from_str('-1/3 60'),
+                                                      Angle.from_str('0 60')])])
+        view = TFArrayView(tf)
+        self.assertEqual(view.denominator, 3)
+        self.assertTrue(view.rule_180())
+
+    def test_empty(self):
+        with self.assertRaises(EmptyException):
+            TFArrayView(TriangulatedFigure())
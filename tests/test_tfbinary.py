@@ -0,0 +1,108 @@
+import unittest
+import os
+import tempfile
+from fractions import Fraction
+from geopar import tfbinary, parallel_prover
+from geopar.tfbinary import FigureLibrary
+from geopar.array_figure_class import ArrayTriangulatedFigure
+from geopar.tfparser import TFParser
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+from geopar.parallel_prover import ParallelProver
+from geopar.run import prove
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+class TestFigureLibrary(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'figures.bin')
+        self.figures = [figure for _, figure in TFParser.parse_file(INPUT)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        self.assertEqual(FigureLibrary.write(self.path, iter(self.figures)), len(self.figures))
+        with FigureLibrary(self.path) as library:
+            self.assertEqual(len(library), len(self.figures))
+            for figure, figure_read in zip(self.figures, library):
+                self.assertEqual(figure.get_id(strong=True), figure_read.get_id(strong=True))
+                self.assertEqual(str(figure), str(figure_read))
+
+    def test_record(self):
+        tf = TriangulatedFigure([Triangle([10, 20, 30], [Angle.from_str('-1/3 120'), Angle.from_str('x'),
+                                                         Angle.from_str('1/2 15')])])
+        FigureLibrary.write(self.path, [tf])
+        with FigureLibrary(self.path) as library:
+            record = library[0]
+            self.assertEqual(record.number_of_triangles, 1)
+            self.assertEqual(list(record.vertices), [10, 20, 30])
+            self.assertEqual(list(record.known), [1, 0, 1])
+            self.assertEqual(record.angle(0).get_coefficients(), (Fraction(-1, 3), Fraction(120)))
+            self.assertFalse(record.angle(1).is_known())
+            del record
+
+    def test_not_a_library(self):
+        with open(self.path, 'wb') as a_file:
+            a_file.write(b'\x00' * 64)
+        with self.assertRaises(ValueError):
+            FigureLibrary(self.path)
+
+    def test_big_endian(self):
+        # a big-endian machine writes and reads the same little-endian file, swapping bytes both ways
+        FigureLibrary.write(self.path, self.figures)
+        with open(self.path, 'rb') as a_file:
+            little_endian = a_file.read()
+
+        tfbinary._SWAP = True
+        try:
+            self.assertEqual(FigureLibrary.write(self.path, self.figures), len(self.figures))
+            with open(self.path, 'rb') as a_file:
+                self.assertNotEqual(a_file.read(), little_endian)
+            with FigureLibrary(self.path) as library:
+                self.assertEqual([figure.get_id(strong=True) for figure in library],
+                                 [figure.get_id(strong=True) for figure in self.figures])
+        finally:
+            tfbinary._SWAP = False
+
+    def test_worker_libraries(self):
+        FigureLibrary.write(self.path, self.figures)
+        with ParallelProver(workers=1) as prover:
+            prover.prove_library(self.path, [0])
+        library = parallel_prover._libraries[self.path]
+        parallel_prover._close_libraries()
+        self.assertEqual(parallel_prover._libraries, {})
+        self.assertTrue(library._file.closed)
+
+    def test_overflow(self):
+        tf = TriangulatedFigure([Triangle([1, 2, 3], [Angle([2 ** 70]), Angle([0]), Angle([0])])])
+        with self.assertRaises(OverflowError):
+            FigureLibrary.write(self.path, [tf])
+
+    def test_orientation(self):
+        # three triangles around 0, the third flipped: it traverses the edge 3 -> 0 like the second
+        tf = TriangulatedFigure([Triangle([0, 1, 2], [60, 60, 60]), Triangle([0, 2, 3], [60, 60, 60]),
+                                 Triangle([0, 4, 3], [60, 60, 60])])
+        with self.assertRaises(ValueError) as context:
+            FigureLibrary.write(self.path, self.figures + [tf])
+        self.assertIn('triangles 1 and 2 both traverse the edge 3 -> 0', str(context.exception))
+
+    def test_prove_library(self):
+        FigureLibrary.write(self.path, self.figures)
+        expected = [prove(figure, pairing=True) for figure in self.figures]
+        with ParallelProver(workers=2, pairing=True) as prover:
+            results = prover.prove_library(self.path)
+        self.assertEqual([outcome for outcome, _ in results], expected)
+        self.assertEqual([TriangulatedFigure.from_compact(compact).get_id() for _, compact in results],
+                         [figure.get_id() for figure in self.figures])
+
+        with ParallelProver(workers=2, pairing=True, figure_class=ArrayTriangulatedFigure) as prover:
+            self.assertEqual(prover.prove_library(self.path), results)
+        with FigureLibrary(self.path) as library:
+            self.assertIsInstance(library.figure(0, ArrayTriangulatedFigure), ArrayTriangulatedFigure)
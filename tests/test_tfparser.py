@@ -0,0 +1,106 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+from geopar.tfparser import TFParser
+from geopar.angle_class import Angle
+from geopar.utilities import ParseError
+from geopar.__main__ import main
+
+__author__ = 'satbek'
+
+INPUT = '''3 3
+1, 2, 4; x, 0 1 0, x
+4, 2, 3; x, 0 1 0, 1 0 0
+1, 4, 3; x, x, 1 0 0
+CLASSIC PYRAMID
+https://drive.google.com/open?id=1FBQ49obyUkgOncR4zO6KU7kQ88qRqlQWlRiMV95feHQ
+
+=====
+
+1 2
+1, 2, 3; 1 60, -1 60, 0 60
+ONE TRIANGLE
+'''
+
+
+class TestTFParser(unittest.TestCase):
+
+    def test_iter_configurations(self):
+        configurations = list(TFParser.iter_configurations(io.StringIO(INPUT)))
+        self.assertEqual([line for line, _ in configurations], [1, 10])
+
+        pyramid = configurations[0][1]
+        self.assertEqual(len(pyramid.get_triangles()), 3)
+        self.assertEqual(pyramid.get_angle_by_angle_points(4, 3, 1), Angle.from_str('1 0 0'))
+        self.assertFalse(pyramid.get_angle_by_angle_points(2, 4, 1).is_known())
+        self.assertEqual(len(configurations[1][1].get_triangles()), 1)
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, 'input.txt')
+            output_path = os.path.join(directory, 'results.jsonl')
+            with open(input_path, 'w') as a_file:
+                a_file.write(INPUT)
+
+            self.assertEqual(main([input_path, '--pairing', '-o', output_path]), 0)
+            with open(output_path) as a_file:
+                records = [json.loads(line) for line in a_file]
+
+        self.assertEqual([record['outcome'] for record in records], ['2', '1B'])
+        self.assertEqual([record['line'] for record in records], [1, 10])
+
+    def test_interning(self):
+        configurations = list(TFParser.iter_configurations(io.StringIO(INPUT)))
+        pyramid = configurations[0][1]
+        self.assertIs(pyramid.get_angle_by_angle_points(1, 2, 4), pyramid.get_angle_by_angle_points(4, 2, 3))
+
+    def test_errors(self):
+        def error_line(text):
+            with self.assertRaises(ParseError) as context:
+                list(TFParser.iter_configurations(io.StringIO(text)))
+            return context.exception.line_number
+
+        self.assertEqual(error_line('1 2\n1, 2, 3; 1 60, -1 60\n'), 2)  # 2 angles
+        self.assertEqual(error_line('1 2\n1, 2; 1 60, -1 60, 0 60\n'), 2)  # 2 points
+        self.assertEqual(error_line('1 2\n1, 2, 2; 1 60, -1 60, 0 60\n'), 2)  # repeated point
+        self.assertEqual(error_line('1 2\n1, 2, 3; 1 60, -1 60, 0 60 0\n'), 2)  # dimension
+        self.assertEqual(error_line('1 2\n1, 2, 3; 1 60, -1 6O, 0 60\n'), 2)  # bad number
+        self.assertEqual(error_line('1 2\n1, 2, 3 1 60, -1 60, 0 60\n'), 2)  # no ;
+        self.assertEqual(error_line('title\n2 2\n1, 2, 3; 1 60, -1 60, 0 60\n'), 4)  # end of file
+        self.assertEqual(error_line('2 2\n1, 2, 3; x, x, x\n3, 1, 2; x, x, x\n'), 3)  # duplicate
+        self.assertEqual(error_line('0 2\n'), 1)
+        self.assertEqual(error_line('3 1\n1, 2, 4; x, x, x\n4, 3, 2; x, x, x\n1, 4, 3; x, x, x\n'), 3)  # anticlockwise
+
+    def test_orientation(self):
+        # the CLASSIC PYRAMID with its last triangle in anticlockwise order
+        with self.assertRaises(ParseError) as context:
+            list(TFParser.iter_configurations(io.StringIO(INPUT.replace('1, 4, 3;', '1, 3, 4;'))))
+        self.assertEqual(context.exception.line_number, 4)
+        self.assertIn('lines 2 and 4 both traverse the edge 4 -> 1', str(context.exception))
+        self.assertIn('lines 3 and 4 both traverse the edge 3 -> 4', str(context.exception))
+
+        # a fan of 6 triangles around 0 with its third triangle flipped
+        fan = [(0, 1, 2), (0, 2, 3), (0, 4, 3), (0, 4, 5), (0, 5, 6), (0, 6, 1)]
+        text = '6 1\n' + ''.join('{}, {}, {}; x, x, x\n'.format(*points) for points in fan)
+        with self.assertRaises(ParseError) as context:
+            list(TFParser.iter_configurations(io.StringIO(text)))
+        self.assertEqual(context.exception.line_number, 4)
+        self.assertIn('lines 3 and 4 both traverse the edge 3 -> 0; lines 4 and 5 both traverse the edge 0 -> 4',
+                      str(context.exception))
+
+    def test_main_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, 'input.txt')
+            output_path = os.path.join(directory, 'results.jsonl')
+            with open(input_path, 'w') as a_file:
+                a_file.write(INPUT + '1 2\n1, 2, 3; 1 60\n')
+
+            main([input_path, '-o', output_path])
+            with open(output_path) as a_file:
+                records = [json.loads(line) for line in a_file]
+
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[2]['line'], 14)
+        self.assertIn('error', records[2])
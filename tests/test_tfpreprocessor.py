@@ -63,6 +63,18 @@ class TestTFPreprocessor(unittest.TestCase):
         self.ttt7 = Triangle([6, 4, 5], [Angle([0, 0, 60]), Angle([0, 0, 60]), Angle([0, 0, 60])])
         self.tf3 = TriangulatedFigure([self.ttt1, self.ttt2, self.ttt3, self.ttt4, self.ttt5, self.ttt6, self.ttt7])
 
+    def test_theorem_1(self):
+        self.tf1.set_angle_by_angle_points(6, 4, 5, Angle.from_str('x'))
+        self.tf1.set_angle_by_angle_points(3, 1, 4, Angle.from_str('x'))
+        TFPreprocessor.theorem_1(self.tf1)
+        self.assertEqual(self.tf1.get_angle_by_angle_points(6, 4, 5), 60)
+        self.assertEqual(self.tf1.get_angle_by_angle_points(3, 1, 4), 20)
+
+        # ttt4 is the only triangle of tf3 with 2 known angles
+        TFPreprocessor.theorem_1(self.tf3)
+        self.assertEqual(self.ttt4.angle_of_point(4), Angle([0, 1, 120]))
+        self.assertTrue(self.ttt1.has_unknown_angle())
+
     def test_theorem_2(self):
         validator = TFValidator()
         if validator.rule_180(self.tf2):
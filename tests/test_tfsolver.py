@@ -0,0 +1,105 @@
+import unittest
+from geopar.tfsolver import TFSolver
+from geopar.deduction_engine import DeductionEngine
+from geopar.tfvalidator import TFValidator
+from geopar.tfpreprocessor import TFPreprocessor
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+
+__author__ = 'satbek'
+
+# URL1:
+# https://docs.google.com/presentation/d/1nddxo9JPaoxz-Colod8qd6Yuj_k7LXhBfO3JlVSYXrE/edit?usp=sharing
+
+
+class TestTFSolver(unittest.TestCase):
+
+    def setUp(self):
+        # TriangulatedFigure tf1 consists of seven Triangles t1-t7
+        # Appearance: URL1 at the top
+        self.tf1 = TriangulatedFigure([
+            Triangle([1, 2, 5], [20, 10, 150]),
+            Triangle([5, 2, 6], [80, 10, 90]),
+            Triangle([6, 2, 3], [140, 10, 30]),
+            Triangle([4, 6, 3], [80, 70, 30]),
+            Triangle([1, 4, 3], [20, 130, 30]),
+            Triangle([1, 5, 4], [20, 70, 90]),
+            Triangle([4, 5, 6], [60, 60, 60])])
+
+        self.tf_morley = self.morley()
+
+    @staticmethod
+    def morley():
+        # Morley's configuration with the angles at the trisected vertices unknown
+        x = Angle.from_str('x')
+        return TriangulatedFigure([
+            Triangle([1, 3, 5], [Angle([-1, -1, 60]), Angle([0, 1, 0]), x]),
+            Triangle([5, 3, 6], [x, Angle([0, 1, 0]), x]),
+            Triangle([6, 3, 2], [x, Angle([0, 1, 0]), Angle([1, 0, 0])]),
+            Triangle([4, 6, 2], [x, x, Angle([1, 0, 0])]),
+            Triangle([1, 4, 2], [Angle([-1, -1, 60]), x, Angle([1, 0, 0])]),
+            Triangle([1, 5, 4], [Angle([-1, -1, 60]), x, x]),
+            Triangle([4, 5, 6], [Angle([0, 0, 60]), Angle([0, 0, 60]), Angle([0, 0, 60])])])
+
+    def test_determined(self):
+        x = Angle.from_str('x')
+        self.tf1.set_angle_by_angle_points(6, 4, 5, x)
+        self.tf1.set_angle_by_angle_points(4, 5, 6, x)
+        self.tf1.set_angle_by_angle_points(5, 6, 4, x)  # not reachable by local rules in one step
+        report = TFSolver.solve(self.tf1)
+        self.assertEqual(report.status, TFSolver.DETERMINED)
+        self.assertEqual(report.values[(6, 4, 5)], 60)
+        self.assertEqual(report.apply(), 3)
+        self.assertTrue(TFValidator.all_rules(self.tf1))
+
+    def test_pairing(self):
+        report = TFSolver.solve(self.tf_morley)
+        self.assertEqual(report.status, TFSolver.UNDERDETERMINED)
+        self.assertIn(TFSolver.UNDERDETERMINED, report.statuses.values())
+
+        report = TFSolver.solve(self.tf_morley, pairing=True)
+        self.assertEqual(report.status, TFSolver.DETERMINED)
+        report.apply()
+
+        tf_deduced = self.morley()
+        DeductionEngine(tf_deduced, pairing=True).run()
+        self.assertEqual(self.tf_morley.get_id(), tf_deduced.get_id())
+
+    def test_pairing_not_applicable(self):
+        # P = (0.2, 0.1) inside A = (0, 0), B = (1, 0), C = (0.5, 0.866), angles rounded to integers:
+        # a valid figure whose following angles (27, 53, 9) and preceding angles (7, 51, 33) do not pair up,
+        # nor have the same sum
+        def figure():
+            return TriangulatedFigure([Triangle([4, 1, 2], [146, 27, 7]),
+                                       Triangle([4, 2, 3], [76, 53, 51]),
+                                       Triangle([4, 3, 1], [138, 9, 33])])
+
+        tf = figure()
+        self.assertTrue(TFValidator.rule_180(tf) and TFValidator.rule_360(tf))
+        self.assertTrue(TFValidator.rules_consistent(tf))
+        self.assertTrue(TFValidator.rules_consistent(tf, pairing=True))
+
+        tf.set_angle_by_angle_points(2, 4, 1, Angle.from_str('x'))
+        tf.set_angle_by_angle_points(4, 1, 2, Angle.from_str('x'))
+        self.assertEqual(TFPreprocessor.theorem_linear(tf, pairing=True), 2)
+        self.assertEqual(tf.get_id(), figure().get_id())
+
+    def test_inconsistent(self):
+        self.tf1.set_angle_by_angle_points(6, 4, 5, Angle.from_str('x'))
+        self.tf1.set_angle_by_angle_points(1, 2, 5, 11)
+        report = TFSolver.solve(self.tf1)
+        self.assertEqual(report.status, TFSolver.INCONSISTENT)
+        self.assertFalse(report.is_consistent())
+        self.assertEqual(report.statuses[(6, 4, 5)], TFSolver.INCONSISTENT)
+
+    def test_preprocessor_and_validator(self):
+        self.assertTrue(TFValidator.rules_consistent(self.tf_morley, pairing=True))
+        self.assertEqual(TFPreprocessor.theorem_linear(self.tf_morley, pairing=True), 9)
+        self.assertTrue(self.tf_morley.all_angles_are_known())
+        self.assertTrue(TFValidator.all_rules(self.tf_morley))
+
+        self.tf1.set_angle_by_angle_points(6, 4, 5, Angle.from_str('x'))
+        self.tf1.set_angle_by_angle_points(1, 2, 5, 11)
+        self.assertFalse(TFValidator.rules_consistent(self.tf1))
+        self.assertEqual(TFPreprocessor.theorem_linear(self.tf1), -1)
@@ -85,6 +85,17 @@ class TestTriangle(unittest.TestCase):
         self.assertEqual(3, self.triangle1.number_of_known())
         self.assertEqual(2, self.triangle2.number_of_known())
 
+        # the known-mask follows every set
+        triangle = Triangle([1, 2, 3], [Angle.from_str('x'), Angle.from_str('x'), 10])
+        self.assertEqual(1, triangle.number_of_known())
+        triangle.set_angle_by_point(2, 100)
+        self.assertEqual(2, triangle.number_of_known())
+        triangle.set_angle_by_index(2, Angle.from_str('x'))
+        self.assertEqual(1, triangle.number_of_known())
+        triangle.set_angle_by_index(0, 70)
+        triangle.set_angle_by_index(2, 10)
+        self.assertFalse(triangle.has_unknown_angle())
+
     def test_has_point(self):
         self.assertTrue(self.triangle0.has_point(1))
         self.assertTrue(self.triangle0.has_point(3))
@@ -94,6 +105,21 @@ class TestTriangle(unittest.TestCase):
     def test_has_all_points(self):
         self.assertTrue(self.triangle0.has_all_points([1, 2, 3]))
         self.assertTrue(self.triangle1.has_all_points([1, 2, 77]))
+        self.assertFalse(self.triangle0.has_all_points([1, 2, 2]))
+        self.assertFalse(self.triangle0.has_all_points([1, 2, 4]))
+
+    def test_following_preceding(self):
+        self.assertEqual([self.triangle1.point_following(p) for p in (2, 1, 77)], [1, 77, 2])
+        self.assertEqual([self.triangle1.point_preceding(p) for p in (2, 1, 77)], [77, 2, 1])
+        self.assertEqual(self.triangle1.index_of_point(77), 2)
+        with self.assertRaises(Exception):
+            self.triangle1.point_following(3)
+        with self.assertRaises(Exception):
+            self.triangle1.point_preceding(3)
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            self.triangle0.colour = 'red'
 
     def test_has_unknown(self):
         self.assertFalse(self.triangle0.has_unknown_angle())
@@ -1,4 +1,6 @@
 import unittest
+import gc
+import weakref
 from geopar.triangle_class import Triangle
 from geopar.triangulated_figure_class import TriangulatedFigure
 from geopar.angle_class import Angle
@@ -77,10 +79,49 @@ class TestTriangulatedFigure(unittest.TestCase):
         self.assertEqual(self.tf1.get_angle_by_angle_points(5, 1, 2), 20)
         self.assertEqual(self.tf1.get_angle_by_angle_points(1, 2, 5), 10)
 
+    def test_get_slot_by_angle_points(self):
+        self.assertEqual(self.tf1.get_slot_by_angle_points(4, 6, 3), (self.t4, 1))
+        self.assertEqual(self.tf1.get_slot_by_angle_points(3, 6, 4), (self.t4, 1))
+        self.assertIsNone(self.tf1.get_slot_by_angle_points(1, 2, 6))
+        self.assertIsNone(self.tf1.get_slot_by_angle_points(1, 2, 2))
+
+        self.tf1.set_angle_by_angle_points(3, 6, 4, 75)
+        self.assertEqual(self.t4.angle_of_point(6), 75)
+        self.assertEqual(self.tf1.get_angle_by_angle_points(4, 6, 3), 75)
+
     def test_get_state(self):
-        print(self.tf1.get_id())
-        print(self.tf11.get_id())
-        self.assertTrue(True)
+        self.assertIsInstance(self.tf1.get_id(), int)
+        self.assertRegex(self.tf1.get_id(strong=True), '^[0-9a-f]{64}$')
+        self.assertNotEqual(self.tf1.get_id(), self.tf_empty.get_id())
+        self.assertNotEqual(self.tf1.get_id(strong=True), self.tf_empty.get_id(strong=True))
+
+        # tf1 and tf11 describe the same figure
+        self.assertEqual(self.tf1.get_id(), self.tf11.get_id())
+        self.assertEqual(self.tf1.get_id(strong=True), self.tf11.get_id(strong=True))
+
+        # the fingerprint follows every change of an angle and its undoing
+        id_before, strong_id_before = self.tf1.get_id(), self.tf1.get_id(strong=True)
+        self.tf1.set_angle_by_angle_points(6, 4, 5, Angle.from_str('x'))
+        self.assertNotEqual(self.tf1.get_id(), id_before)
+        self.assertNotEqual(self.tf1.get_id(strong=True), strong_id_before)
+        self.t7.complete_unknown_angle()
+        self.assertEqual(self.tf1.get_id(), id_before)
+        self.assertEqual(self.tf1.get_id(strong=True), strong_id_before)
+
+    def test_shared_triangle(self):
+        # a triangle notifies the figures it is in, but does not keep them alive
+        figures = [TriangulatedFigure([self.t7]) for _ in range(5)]
+        ids = [figure.get_id() for figure in figures]
+        dead = weakref.ref(figures[0])
+        del figures
+        gc.collect()
+        self.assertIsNone(dead())
+
+        self.t7.set_angle_by_index(0, 61)
+        self.assertNotEqual(self.tf1.get_id(), self.tf11.get_id())
+        self.t7.set_angle_by_index(0, 60)
+        self.assertEqual(self.tf1.get_id(), self.tf11.get_id())
+        self.assertEqual(TriangulatedFigure([self.t7]).get_id(), ids[0])
 
     def test_get_points(self):
 
@@ -98,6 +139,24 @@ class TestTriangulatedFigure(unittest.TestCase):
         triangles_ = self.tf1.triangles_with_point(4)
         self.assertEqual(4, len(triangles_))  # 4 triangles around point 4
 
+        # consecutive triangles share the edge between them
+        for t_a, t_b in zip(triangles_, triangles_[1:] + triangles_[:1]):
+            self.assertEqual(t_a.point_preceding(4), t_b.point_following(4))
+
+        # boundary point: the fan is an open chain
+        triangles_ = self.tf11.triangles_with_point(1)
+        self.assertEqual(3, len(triangles_))
+        for t_a, t_b in zip(triangles_, triangles_[1:]):
+            self.assertEqual(t_a.point_preceding(1), t_b.point_following(1))
+
+    def test_triangles_with_point_after_add(self):
+        tf = TriangulatedFigure([Triangle([1, 2, 5], [20, 10, 150])])
+        self.assertEqual(1, len(tf.triangles_with_point(5)))
+        tf.add(Triangle([5, 2, 6], [80, 10, 90]))
+        triangles_ = tf.triangles_with_point(5)
+        self.assertEqual(2, len(triangles_))
+        self.assertEqual(triangles_[0].point_preceding(5), triangles_[1].point_following(5))
+
     def test_is_empty(self):
         self.assertTrue(self.tf_empty.is_empty())
         self.assertFalse(self.tf1.is_empty())
@@ -140,3 +199,18 @@ class TestTriangulatedFigure(unittest.TestCase):
         self.tf1.set_angle_by_angle_points(1, 4, 3, Angle.from_str('x'))
         self.tf1.complete_unknown_angle_at(4)
         self.assertEqual(self.tf1.get_angle_by_angle_points(1, 4, 3), 130)
+
+    def test_get_interior_points(self):
+        self.assertEqual(sorted(self.tf1.get_interior_points()), [4, 5, 6])
+        self.assertEqual(sorted(self.tf1.get_boundary_points()), [1, 2, 3])
+        self.assertEqual(sorted(self.tf11.get_interior_points()), [4, 5, 6])
+        self.assertIs(self.tf1.get_topology(), self.tf1.get_topology())
+
+    def test_topology_reset_by_add(self):
+        tf = TriangulatedFigure([Triangle([1, 2, 4], [60, 60, 60]),
+                                 Triangle([4, 2, 3], [60, 60, 60])])
+        topology = tf.get_topology()
+        self.assertEqual(tf.get_interior_points(), [])
+        tf.add(Triangle([1, 4, 3], [60, 60, 60]))
+        self.assertIsNot(topology, tf.get_topology())
+        self.assertEqual(tf.get_interior_points(), [4])
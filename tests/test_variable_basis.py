@@ -0,0 +1,85 @@
+import unittest
+import os
+from fractions import Fraction
+from geopar.variable_basis import VariableBasis
+from geopar.tfparser import TFParser
+from geopar.triangulated_figure_class import TriangulatedFigure
+from geopar.triangle_class import Triangle
+from geopar.angle_class import Angle
+from geopar.parallel_prover import ParallelProver
+from geopar.run import prove
+
+__author__ = 'satbek'
+
+INPUT = os.path.join(os.path.dirname(__file__), '..', 'inputs', 'input.txt')
+
+
+def widened(a_tf, a_mapping, a_width):
+    # Returns: a copy of a_tf whose i-th variable becomes the combination a_mapping[i] of a_width variables
+
+    def widen(an_angle):
+        if not an_angle.is_known():
+            return an_angle
+        coefficients = an_angle.get_coefficients()
+        variables = [Fraction(0)] * a_width
+        for c, combination in zip(coefficients, a_mapping):
+            for j, x in enumerate(combination):
+                variables[j] += c * x
+        return Angle(variables + [coefficients[-1]])
+
+    return TriangulatedFigure([Triangle(list(t.get_points()), [widen(a) for a in t.get_angles()])
+                               for t in a_tf.get_triangles()])
+
+
+class TestVariableBasis(unittest.TestCase):
+
+    def setUp(self):
+        self.configurations = TFParser.parse_file(INPUT)
+
+    def test_row_reduce(self):
+        rows = [[Fraction(1), Fraction(1), Fraction(1), Fraction(0)],
+                [Fraction(2), Fraction(2), Fraction(2), Fraction(0)],
+                [Fraction(0), Fraction(0), Fraction(1), Fraction(0)],
+                [Fraction(1), Fraction(1), Fraction(1), Fraction(0)]]
+        basis, pivots = VariableBasis.row_reduce(rows, 4)
+        self.assertEqual(pivots, [0, 2])
+        self.assertEqual(basis, [[1, 1, 0, 0], [0, 0, 1, 0]])
+
+    def test_full_rank(self):
+        figure = self.configurations[0][1]
+        basis = VariableBasis(figure)
+        self.assertEqual((basis.dimension, basis.reduced_dimension), (3, 3))
+        self.assertFalse(basis.is_reducing())
+
+    def test_reduces(self):
+        # MORLEY INCOMPLETE with α -> α + β + γ, β -> δ - ε and the variables η, θ unused
+        figure = widened(self.configurations[0][1], [[1, 1, 1, 0, 0, 0, 0], [0, 0, 0, 1, -1, 0, 0]], 7)
+        basis = VariableBasis(figure)
+        self.assertEqual((basis.dimension, basis.reduced_dimension), (8, 3))
+        for triangle in figure.get_triangles():
+            for angle in triangle.get_angles():
+                self.assertEqual(basis.expand(basis.project(angle)), angle)
+
+    def test_prove(self):
+        for mapping in ([[1, 1, 1, 0, 0, 0, 0], [0, 0, 0, 1, -1, 0, 0], [0, 0, 0, 0, 0, 2, 0]],
+                        [[1, 0, 0, 0, 0], [0, 1, 0, 0, 0], [1, 0, 0, 0, 0], [0, 0, 1, -1, 0]]):
+            for _, figure in self.configurations:
+                dimension = figure.get_triangles()[0].get_angles()[0].get_dimension()
+                if dimension != len(mapping) + 1:
+                    continue
+                plain = widened(figure, mapping, len(mapping[0]))
+                reduced = widened(figure, mapping, len(mapping[0]))
+                for pairing in (False, True):
+                    self.assertEqual(prove(plain, pairing), prove(reduced, pairing, reduce=True))
+                    self.assertEqual(plain.get_id(strong=True), reduced.get_id(strong=True))
+
+    def test_parallel(self):
+        figure = widened(self.configurations[0][1], [[1, 1, 1, 0], [0, 0, 0, 1]], 4)
+        expected = widened(self.configurations[0][1], [[1, 1, 1, 0], [0, 0, 0, 1]], 4)
+        with ParallelProver(workers=2, pairing=True, reduce=True) as prover:
+            self.assertEqual(prover.prove_all([figure]), [prove(expected, True)])
+        self.assertEqual(figure.get_id(strong=True), expected.get_id(strong=True))
+
+
+if __name__ == '__main__':
+    unittest.main()